@@ -0,0 +1 @@
+"""Standalone micro-benchmarks. Run from backend/ as `python -m benchmarks.<name>`."""
@@ -0,0 +1,91 @@
+"""
+Adversarial-input benchmark for the request hot paths.
+
+Times the former regexes against their linear replacements on inputs built
+to trigger rescans, then runs whole request checks (input validation,
+validate_refinement, recommend_audiences) at growing sizes up to
+MAX_INPUT_CHARS. Per-character cost should stay flat as inputs grow.
+
+    python -m benchmarks.adversarial
+"""
+
+import re
+import timeit
+
+from config.ai_settings import MAX_INPUT_CHARS
+from llm.validators import _sender_name_line, validate_refinement
+from services.ai_refinement import normalize_and_validate_raw_text
+from services.text_quality import is_gibberish
+from services.audience_rules import RuleSet, _keyword_occurs, get_rule_set, recommend_audiences
+
+_OLD_GIKAN = re.compile(r"gikan\s+kang[:\s]+([A-Z][A-Za-z\s\.]+?)(?:\n|$)", re.IGNORECASE)
+
+
+def _old_keyword_occurs(keyword: str, text_lower: str) -> bool:
+    suffix = r"(?:s|es)?" if re.fullmatch(r"[a-z]{3,}", keyword) else ""
+    return bool(re.search(rf"(?<!\w){re.escape(keyword)}{suffix}(?!\w)", text_lower))
+
+
+def _fill(unit: str, size: int, tail: str = "") -> str:
+    return (unit * (size // len(unit) + 1))[: size - len(tail)] + tail
+
+
+def _adversarial_inputs(size: int) -> dict[str, str]:
+    return {
+        # Every prefix starts a name that is rejected only at the very end of the line.
+        "gikan_flood": _fill("Gikan kang Juan ", size, "1"),
+        "single_char": _fill("a", size),
+        "near_repeats": _fill("aaaab", size),
+        # Keyword prefixes that almost match a plural form everywhere.
+        "plural_flood": _fill("seniorses_", size),
+        # Dense entities and bare numbers that start a date or time at every word.
+        "date_flood": _fill("hulyo 21-24, 2025 alas 8:00 sa buntag purok 3 ", size),
+        "digit_flood": _fill("1 2 ", size),
+        "mixed": _fill("HON. JUAN C. CRUZ Barangay Captain gikan kang: Pedro 2025 ", size),
+    }
+
+
+def _ms(fn, number: int = 5) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1000
+
+
+def _request(text: str, rules: RuleSet) -> None:
+    try:
+        normalize_and_validate_raw_text(text)
+    except ValueError:
+        pass
+    validate_refinement(text, text[::-1])
+    recommend_audiences(text, rules=rules)
+
+
+def main() -> None:
+    rules = get_rule_set()
+    size = MAX_INPUT_CHARS
+    inputs = _adversarial_inputs(size)
+    keywords = [keyword for rule in rules.rules for keyword, _, _ in rule.terms]
+
+    print(f"hot patterns at {size} chars (ms): former regex vs scanner")
+    flood = inputs["gikan_flood"]
+    print(f"  gikan name      {_ms(lambda: _OLD_GIKAN.search(flood), 1):10.2f} {_ms(lambda: _sender_name_line(flood)):10.2f}")
+    repeats = inputs["near_repeats"]
+    print(f"  gibberish check {'-':>10} {_ms(lambda: is_gibberish(repeats)):10.2f}")
+    plural = inputs["plural_flood"]
+    print(
+        f"  {len(keywords)} keywords    "
+        f"{_ms(lambda: [_old_keyword_occurs(k, plural) for k in keywords], 1):10.2f} "
+        f"{_ms(lambda: [_keyword_occurs(k, plural) for k in keywords], 1):10.2f}"
+    )
+
+    print("\nwhole request checks, microseconds per input character")
+    sizes = [size // 8, size // 4, size // 2, size]
+    print("input          " + "".join(f"{n:>10d}" for n in sizes))
+    for name in inputs:
+        row = []
+        for n in sizes:
+            text = _adversarial_inputs(n)[name]
+            row.append(_ms(lambda: _request(text, rules), 1) * 1000 / n)
+        print(f"{name:<15}" + "".join(f"{value:10.3f}" for value in row))
+
+
+if __name__ == "__main__":
+    main()
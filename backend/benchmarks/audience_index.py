@@ -0,0 +1,76 @@
+"""
+Benchmark audience keyword matching as the rules file grows.
+
+Compares the per-keyword loop (CompiledRule.matches on every rule) with the
+single KeywordIndex scan RuleSet.recommend uses, on the shipped rules padded
+with synthetic rules up to several thousand keywords. Both paths read the
+text after morphological normalization and must select the same rules.
+
+    python -m benchmarks.audience_index
+"""
+
+import random
+import string
+import timeit
+
+from services.audience_rules import RuleSet, load_rules
+
+SAMPLE = (
+    "Pahibalo sa tanang senior citizens ug PWD sa Purok 3: adunay libreng "
+    "check-up ug bakuna sa barangay health center karong Lunes, alas 8:00 sa "
+    "buntag. Dad-a ang inyong ID ug health card. Ang mga ginikanan sa mga "
+    "estudyante gidapit usab sa parents' meeting sa eskwelahan.\n\n"
+)
+
+
+def _synthetic_rules(keyword_count: int, rng: random.Random) -> list[dict]:
+    letters = string.ascii_lowercase
+    rules = []
+    while keyword_count > 0:
+        size = min(keyword_count, 20)
+        keywords = []
+        for _ in range(size):
+            words = rng.choice((1, 1, 1, 2))
+            keywords.append(
+                " ".join("".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(words))
+            )
+        rules.append({"keywords": keywords, "audiences": [f"Synthetic {len(rules)}"]})
+        keyword_count -= size
+    return rules
+
+
+def _loop(rule_set: RuleSet, text_lower: str) -> list[int]:
+    text_lower = rule_set.normalizer.normalize(text_lower)
+    return [i for i, rule in enumerate(rule_set.rules) if rule.matches(text_lower)]
+
+
+def _indexed(rule_set: RuleSet, text_lower: str) -> list[int]:
+    matched = rule_set.matched_terms(text_lower)
+    return [i for i in sorted(matched) if rule_set.rules[i].accepts(matched[i])]
+
+
+def _ms(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def main() -> None:
+    shipped = load_rules()
+    rng = random.Random(11)
+    base_keywords = sum(len(r.get("keywords") or []) for r in shipped)
+    print(f"shipped rules: {len(shipped)} rules, {base_keywords} keywords")
+
+    for chars in (len(SAMPLE), len(SAMPLE) * 10):
+        text_lower = (SAMPLE * (chars // len(SAMPLE))).lower()
+        print(f"\ntext: {len(text_lower)} chars")
+        print("keywords   loop(ms)  index(ms)  speedup")
+        for extra in (0, 750, 2000, 5000, 10000):
+            rule_set = RuleSet(shipped + _synthetic_rules(extra, rng))
+            assert _loop(rule_set, text_lower) == _indexed(rule_set, text_lower)
+            keywords = sum(len(rule.terms) for rule in rule_set.rules)
+            loop_ms = _ms(lambda: _loop(rule_set, text_lower), 20)
+            index_ms = _ms(lambda: _indexed(rule_set, text_lower), 20)
+            print(f"{keywords:8d}  {loop_ms:9.3f}  {index_ms:9.3f}  {loop_ms / index_ms:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Accuracy and latency of the input gibberish check.
+
+Real text: every line of sample_announcements.txt, which the trigram table
+is trained on, plus held-out posts that are not in the training corpus:
+short everyday posts, and short posts made mostly of numbers, dates and
+abbreviations. Junk: seeded random letter strings, keyboard mashes and
+repeated characters. Compares the former regex/vowel heuristic with the
+trigram scorer on all real text and on the held-out posts alone, and prints
+the score range of each class, which is what GIBBERISH_THRESHOLD is set from.
+
+    python -m benchmarks.gibberish
+"""
+
+import random
+import re
+import string
+import timeit
+from pathlib import Path
+
+from services.text_quality import GIBBERISH_THRESHOLD, is_gibberish, score_text
+
+SHORT_POSTS = [
+    "Miting ugma sa hapon",
+    "Walay tubig ugma buntag",
+    "Bakuna sa mga bata karong Lunes",
+    "Adunay libre check up sa sabado",
+    "Limpyo sa kanal karong Sabado",
+    "Pahibalo: walay klase ugma",
+    "Palihog apil sa miting",
+    "Brownout ugma alas 8",
+    "Ayuda para sa senior citizen",
+    "Tigom sa mga ginikanan",
+    "Sugod na ang enrollment",
+    "Adunay baha sa purok 3",
+    "Free haircut sa plaza",
+    "Zumba sa covered court",
+    "Libreng tuli sa health center",
+    "Ang dalan sirado ugma",
+    "Salamat sa tanan nga ni apil",
+    "Pagbantay sa inyong mga anak",
+    "Walay kuryente karong gabii",
+    "Ipadayon ang pag-amping",
+    "Meeting tomorrow at the barangay hall",
+    "Vaccination schedule for seniors",
+    "Road closed due to repairs",
+    "Water interruption on Saturday",
+    "Create announcement about clean-up drive",
+    "Please attend the general assembly",
+    "Senior citizen payout sa Biyernes",
+    "Distribution of relief goods",
+    "Registration para sa 4Ps",
+    "Curfew sa mga menor de edad",
+]
+
+# Held out like SHORT_POSTS; mostly numbers, dates and abbreviations.
+TERSE_POSTS = [
+    "Brgy. Poblacion, 2025-07-21, 8:00AM",
+    "Sched: MWF 8-5, BHS",
+    "NCIP/IP mtg @ brgy hall",
+    "BHW mtg sa Purok 5, 2PM",
+    "SK GA 7/12 3PM covered court",
+    "4Ps FDS 9AM DSWD",
+    "Brgy. Assembly 10/5 1PM",
+    "BDRRMC drill 08/14 9:00",
+    "Pwd ID release, MSWDO, 2-4PM",
+    "TUPAD payout 7/30 @ BH",
+    "OSCA ID renewal, Rm 2, 8-12",
+    "NO CLASSES K-12, 7/22",
+    "Blood letting 9AM-3PM RHU",
+    "CBMS survey Purok 1-7",
+    "VAWC desk open M-F 8-5",
+]
+
+KEYBOARD_ROWS = ["qwertyuiop", "asdfghjkl", "zxcvbnm"]
+
+
+def _legacy_is_junk(stripped: str) -> bool:
+    """The regex and vowel heuristic that the trigram scorer replaced."""
+    words = re.findall(r"[A-Za-zÀ-ÿ']+", stripped)
+    unique_words = {word.lower() for word in words}
+    vowel_counts = [len(re.findall(r"[aeiouAEIOU]", word)) for word in words]
+    has_prompt_hint = bool(re.search(
+        r"\b(create|make|write|generate|draft|himo|buhat|sulat|paghimo|announcement|anunsyo|pahibalo|advisory|notice)\b",
+        stripped, re.IGNORECASE))
+    has_signal = bool(re.search(
+        r"\b(meeting|miting|assembly|barangay|court|hall|schedule|schedule|date|oras|petsa|lugar)\b",
+        stripped, re.IGNORECASE))
+    if not words or (len(words) == 1 and not has_prompt_hint and not has_signal):
+        return True
+    if len(stripped) >= 12 and len(words) <= 2:
+        low_variety = len(unique_words) <= 1
+        if re.search(r"(.)\1{4,}", stripped) and low_variety:
+            return True
+        vowel_count = len(re.findall(r"[aeiouAEIOU]", stripped))
+        if vowel_count <= 2 and low_variety and not has_prompt_hint and not has_signal:
+            return True
+    if not has_prompt_hint and not has_signal:
+        has_real_word = any(c >= 2 for c in vowel_counts) or any(len(w) >= 5 for w in words)
+        average_vowels = sum(vowel_counts) / len(vowel_counts)
+        if not has_real_word or average_vowels < 1.2:
+            return True
+    return False
+
+
+def _real_texts() -> list[str]:
+    path = Path(__file__).resolve().parent.parent / "services" / "sample_announcements.txt"
+    lines = [ln.strip() for ln in path.read_text(encoding="utf-8").splitlines()]
+    return [ln for ln in lines if len(ln) >= 10 and ln != "---"] + SHORT_POSTS + TERSE_POSTS
+
+
+def _junk_texts(count: int = 300) -> list[str]:
+    rng = random.Random(35)
+    letters = string.ascii_lowercase
+    junk = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            words = ["".join(rng.choice(letters) for _ in range(rng.randint(2, 10))) for _ in range(rng.randint(1, 5))]
+        elif kind == 1:
+            words = ["".join(rng.choice(rng.choice(KEYBOARD_ROWS)) for _ in range(rng.randint(3, 9))) for _ in range(rng.randint(1, 4))]
+        elif kind == 2:
+            words = [rng.choice(letters) * rng.randint(10, 20)]
+        else:
+            chunk = "".join(rng.choice(letters) for _ in range(rng.randint(2, 4)))
+            words = [chunk * rng.randint(3, 6)] * rng.randint(1, 3)
+        text = " ".join(words)
+        junk.append(text if len(text) >= 10 else text + " " + text)
+    return junk
+
+
+def _report(name: str, real: list[str], junk: list[str], is_junk) -> None:
+    false_rejects = sum(1 for t in real if is_junk(t))
+    misses = sum(1 for t in junk if not is_junk(t))
+    accuracy = 1 - (false_rejects + misses) / (len(real) + len(junk))
+    per_call = min(timeit.repeat(lambda: [is_junk(t) for t in real + junk], number=5, repeat=3))
+    per_call_us = per_call / 5 / (len(real) + len(junk)) * 1e6
+    print(
+        f"{name:<10} accuracy {accuracy:6.1%}  real rejected {false_rejects:3d}/{len(real)}"
+        f"  junk admitted {misses:3d}/{len(junk)}  {per_call_us:6.1f} us/verdict"
+    )
+
+
+def main() -> None:
+    real = _real_texts()
+    junk = _junk_texts()
+
+    held_out = SHORT_POSTS + TERSE_POSTS
+
+    print("all real text (mostly training lines)")
+    _report("legacy", real, junk, _legacy_is_junk)
+    _report("trigram", real, junk, is_gibberish)
+    print("held-out posts only")
+    _report("legacy", held_out, junk, _legacy_is_junk)
+    _report("trigram", held_out, junk, is_gibberish)
+
+    real_scores = sorted(s for s in map(score_text, real) if s is not None)
+    junk_scores = sorted(s for s in map(score_text, junk) if s is not None)
+    print(f"\nthreshold {GIBBERISH_THRESHOLD}")
+    print(f"real  scores: min {real_scores[0]:.2f}  median {real_scores[len(real_scores) // 2]:.2f}")
+    print(f"junk  scores: max {junk_scores[-1]:.2f}  median {junk_scores[len(junk_scores) // 2]:.2f}")
+    for text in real:
+        if is_gibberish(text):
+            print(f"  rejected real: {text!r} ({score_text(text):.2f})")
+    for text in junk:
+        if not is_gibberish(text):
+            print(f"  admitted junk: {text!r} ({score_text(text):.2f})")
+
+
+if __name__ == "__main__":
+    main()
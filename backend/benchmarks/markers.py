@@ -0,0 +1,62 @@
+"""
+Benchmark marker scanning.
+
+Compares the old per-stage substring scans with one registry scan, and the
+substring path of MultiPatternMatcher with its Aho-Corasick path as the
+pattern count grows. The crossover is what SUBSTRING_SCAN_LIMIT is set from.
+
+    python -m benchmarks.markers
+"""
+
+import random
+import string
+import timeit
+
+from llm.automaton import SUBSTRING_SCAN_LIMIT, MultiPatternMatcher
+from llm.markers import MARKER_GROUPS, scan_markers
+
+SAMPLE = (
+    "Tinahod kong mga baryuhanon, pahibalo alang sa tanang residente nga adunay "
+    "barangay assembly sa covered court karong Sabado, alas 8:00 sa buntag. "
+    "Gipanghinaut ang inyong pagtambong.\n\nKaninyo matinahuron,\n\nHON. JUAN DELA CRUZ\n"
+    "Barangay Captain\n"
+)
+
+
+def _old_scattered_scans(text: str) -> None:
+    # Roughly what classification, prompt building and validation did separately.
+    lower = text.lower()
+    for _stage in range(4):
+        for markers in MARKER_GROUPS.values():
+            any(marker in lower for marker in markers)
+
+
+def _random_patterns(count: int, rng: random.Random) -> list[str]:
+    letters = string.ascii_lowercase
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 12))) for _ in range(count)]
+
+
+def _time(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def main() -> None:
+    text = SAMPLE * 20
+    print(f"text: {len(text)} chars, registry: {sum(map(len, MARKER_GROUPS.values()))} markers")
+    print(f"  scattered scans : {_time(lambda: _old_scattered_scans(text), 200):.3f} ms")
+    print(f"  scan_markers    : {_time(lambda: scan_markers(text.lower()), 200):.3f} ms")
+
+    rng = random.Random(7)
+    print(f"\npatterns  substring(ms)  automaton(ms)   (limit={SUBSTRING_SCAN_LIMIT})")
+    for count in (50, 100, 250, 500, 1000, 2000):
+        patterns = _random_patterns(count, rng)
+        substring = MultiPatternMatcher(patterns, use_automaton=False)
+        automaton = MultiPatternMatcher(patterns, use_automaton=True)
+        assert substring.find_all(text.lower()) == automaton.find_all(text.lower())
+        sub_ms = _time(lambda: substring.find_all(text.lower()), 20)
+        ac_ms = _time(lambda: automaton.find_all(text.lower()), 20)
+        print(f"{count:8d}  {sub_ms:13.3f}  {ac_ms:13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -56,6 +56,124 @@ def get_ai_max_retries() -> int:
         return 1
 
 
+# Refinement cache settings
+def get_paragraph_cache_max_entries() -> int:
+    """Get the maximum number of refined paragraphs kept in memory. Default 2048."""
+    try:
+        return int(os.getenv("PARAGRAPH_CACHE_MAX_ENTRIES", "2048"))
+    except ValueError:
+        return 2048
+
+
+def get_refinement_cache_max_entries() -> int:
+    """Get the maximum number of refined documents kept in memory. Default 256."""
+    try:
+        return int(os.getenv("REFINEMENT_CACHE_MAX_ENTRIES", "256"))
+    except ValueError:
+        return 256
+
+
+def get_prefetch_max_workers() -> int:
+    """Get the number of background prefetch workers. Default 1."""
+    try:
+        return max(1, int(os.getenv("PREFETCH_MAX_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def get_refine_job_max_workers() -> int:
+    """Get the number of workers upgrading fallback-first drafts. Default 2."""
+    try:
+        return max(1, int(os.getenv("REFINE_JOB_MAX_WORKERS", "2")))
+    except ValueError:
+        return 2
+
+
+# Input limits
+def get_max_input_chars() -> int:
+    """Get the maximum accepted length of announcement text fields. Default 10000."""
+    try:
+        return max(1, int(os.getenv("MAX_INPUT_CHARS", "10000")))
+    except ValueError:
+        return 10000
+
+
+# Routing settings
+def get_route_classifier_margin() -> float:
+    """Get how far from 0.5 the route classifier must be to override the keyword rules. Default 0.3."""
+    try:
+        return float(os.getenv("ROUTE_CLASSIFIER_MARGIN", "0.3"))
+    except ValueError:
+        return 0.3
+
+
+# Generation budget
+def get_max_output_tokens() -> int:
+    """Get the hard cap on completion tokens for one LLM call. Default 3072."""
+    try:
+        return max(64, int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "3072")))
+    except ValueError:
+        return 3072
+
+
+# Adaptive retry policy
+def get_retry_min_success_rate() -> float:
+    """Get the pass rate below which another model attempt is skipped. Default 0.15; 0 disables."""
+    try:
+        return float(os.getenv("RETRY_MIN_SUCCESS_RATE", "0.15"))
+    except ValueError:
+        return 0.15
+
+
+def get_retry_stats_path() -> Optional[str]:
+    """Get the SQLite file for retry outcomes. Default: data/retry_stats.sqlite3 beside the backend."""
+    return os.getenv("RETRY_STATS_PATH") or None
+
+
+# Deferred batch queue
+def get_batch_queue_path() -> Optional[str]:
+    """Get the SQLite file for deferred refine jobs. Default: data/batch_queue.sqlite3 beside the backend."""
+    return os.getenv("BATCH_QUEUE_PATH") or None
+
+
+def get_batch_drain_interval_seconds() -> float:
+    """Get the minimum pause between two deferred refine jobs. Default 5."""
+    try:
+        return max(0.0, float(os.getenv("BATCH_DRAIN_INTERVAL_SECONDS", "5")))
+    except ValueError:
+        return 5.0
+
+
+def get_batch_quiet_seconds() -> float:
+    """Get how long interactive /refine traffic must be idle before a deferred job starts. Default 10."""
+    try:
+        return max(0.0, float(os.getenv("BATCH_QUIET_SECONDS", "10")))
+    except ValueError:
+        return 10.0
+
+
+def get_audience_rules_poll_seconds() -> float:
+    """Get how often the audience rules file is checked for changes. Default 2; 0 checks on every request."""
+    try:
+        return max(0.0, float(os.getenv("AUDIENCE_RULES_POLL_SECONDS", "2")))
+    except ValueError:
+        return 2.0
+
+
+def get_audience_rules_firestore_doc() -> Optional[str]:
+    """Get the Firestore document (e.g. adminSettings/audienceRules) holding audience rules. Unset: local JSON only."""
+    value = (os.getenv("AUDIENCE_RULES_FIRESTORE_DOC") or "").strip().strip("/")
+    return value or None
+
+
+def get_audience_cache_max_entries() -> int:
+    """Get the maximum number of audience recommendations kept in memory. Default 1024; 0 disables."""
+    try:
+        return max(0, int(os.getenv("AUDIENCE_CACHE_MAX_ENTRIES", "1024")))
+    except ValueError:
+        return 1024
+
+
 # Typed constants for convenience
 LLM_BASE_URL: Optional[str] = get_llm_base_url()
 LLM_API_KEY: Optional[str] = get_llm_api_key()
@@ -63,3 +181,18 @@ LLM_MODEL_PRIMARY: Optional[str] = get_llm_model_primary()
 LLM_MODEL_FALLBACK: Optional[str] = get_llm_model_fallback()
 AI_TIMEOUT_SECONDS: float = get_ai_timeout_seconds()
 AI_MAX_RETRIES: int = get_ai_max_retries()
+PARAGRAPH_CACHE_MAX_ENTRIES: int = get_paragraph_cache_max_entries()
+REFINEMENT_CACHE_MAX_ENTRIES: int = get_refinement_cache_max_entries()
+PREFETCH_MAX_WORKERS: int = get_prefetch_max_workers()
+REFINE_JOB_MAX_WORKERS: int = get_refine_job_max_workers()
+MAX_INPUT_CHARS: int = get_max_input_chars()
+ROUTE_CLASSIFIER_MARGIN: float = get_route_classifier_margin()
+MAX_OUTPUT_TOKENS: int = get_max_output_tokens()
+RETRY_MIN_SUCCESS_RATE: float = get_retry_min_success_rate()
+RETRY_STATS_PATH: Optional[str] = get_retry_stats_path()
+BATCH_QUEUE_PATH: Optional[str] = get_batch_queue_path()
+BATCH_DRAIN_INTERVAL_SECONDS: float = get_batch_drain_interval_seconds()
+BATCH_QUIET_SECONDS: float = get_batch_quiet_seconds()
+AUDIENCE_RULES_POLL_SECONDS: float = get_audience_rules_poll_seconds()
+AUDIENCE_RULES_FIRESTORE_DOC: Optional[str] = get_audience_rules_firestore_doc()
+AUDIENCE_CACHE_MAX_ENTRIES: int = get_audience_cache_max_entries()
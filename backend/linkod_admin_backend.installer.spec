@@ -0,0 +1,96 @@
+# PyInstaller spec for the installer build of the LINKod Admin backend (launcher + FastAPI)
+# Run: pyinstaller --clean linkod_admin_backend.installer.spec (scripts/build_release.ps1 does this)
+# Output: dist/linkod_admin_backend/ (onedir) — packaged by installer/LINKod_Admin_Setup_Production.iss
+
+# -*- mode: python ; coding: utf-8 -*-
+
+import os
+
+block_cipher = None
+
+# Hidden imports for Uvicorn (discovered via trial or from trace); main is loaded as "main:app"
+hidden_imports = [
+    "main",
+    "uvicorn.logging",
+    "uvicorn.loops",
+    "uvicorn.loops.auto",
+    "uvicorn.protocols",
+    "uvicorn.protocols.http",
+    "uvicorn.protocols.http.auto",
+    "uvicorn.protocols.websockets",
+    "uvicorn.protocols.websockets.auto",
+    "uvicorn.lifespan",
+    "uvicorn.lifespan.on",
+]
+
+# Model and rule files the backend reads from config/ at runtime. Without them
+# the packaged backend quietly falls back (keyword-only routing, no gibberish check).
+datas = [
+    ("config/title_categories.json", "config"),
+    ("config/char_trigrams.bin", "config"),
+    ("config/route_classifier.npy", "config"),
+]
+for source, target in datas:
+    if not os.path.exists(source):
+        raise SystemExit(f"Missing bundled data file: {source}")
+
+# Local rules file (not tracked); build_release.ps1 copies its precompiled artifact next to it.
+if os.path.exists("config/audience_rules.json"):
+    datas.append(("config/audience_rules.json", "config"))
+
+# Include firebase_admin and google packages (certificates, gRPC, etc.)
+_binaries = []
+try:
+    from PyInstaller.utils.hooks import collect_all
+    firebase_datas, _binaries, firebase_hidden = collect_all("firebase_admin")
+    datas += firebase_datas
+    hidden_imports += firebase_hidden
+except Exception:
+    pass
+
+a = Analysis(
+    ["launcher.py"],
+    pathex=[],
+    binaries=_binaries,
+    datas=datas,
+    hiddenimports=hidden_imports,
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[],
+    win_no_prefer_redirects=False,
+    win_private_assemblies=False,
+    cipher=block_cipher,
+    noarchive=False,
+)
+
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name="linkod_admin_backend",
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    console=True,  # Keep console so launcher can attach and user can see errors if needed
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    name="linkod_admin_backend",
+)
@@ -0,0 +1,117 @@
+"""
+Single-pass analysis of announcement text.
+
+One AnalyzedText is computed per request and shared by classification,
+prompt building, validation, title suggestion and fallbacks, so the raw
+text is lowered, split, tokenized and scanned for markers and date/time/place
+entities only once.
+"""
+
+import re
+from typing import Iterable, Optional
+
+from llm.entities import extract_entities
+from llm.markers import PLACE_HINT_MARKERS, TRACKED_MARKERS, scan_markers
+
+_NAME_TOKEN = re.compile(r"^[A-Za-z][A-Za-z\.'-]*$")
+_WORD_TOKEN = re.compile(r"[a-z]+")
+
+
+def looks_like_name_line(line: str) -> bool:
+    """Heuristic check for plain signature names like 'Junty Bandayanon'."""
+    cleaned = line.strip()
+    if not cleaned:
+        return False
+
+    # Reject obvious sentence-like lines.
+    if any(mark in cleaned for mark in [",", "!", "?"]):
+        return False
+
+    parts = [p for p in cleaned.replace("-", " ").split() if p]
+    if len(parts) < 2 or len(parts) > 5:
+        return False
+
+    # Allow initials and name punctuation.
+    if not all(_NAME_TOKEN.match(p) for p in parts):
+        return False
+
+    # Most name lines are either title-case or all uppercase.
+    if cleaned.isupper():
+        return True
+
+    return all(p[:1].isupper() for p in parts if p[:1].isalpha())
+
+
+def _find_signature_line(nonblank_lines: list[str]) -> Optional[str]:
+    for line in reversed(nonblank_lines):
+        stripped = line.strip()
+        lower = stripped.lower()
+
+        if lower.startswith(("-", "gikan kang", "from:", "hon.")):
+            return stripped
+
+        if looks_like_name_line(stripped):
+            return stripped
+
+    return None
+
+
+def extract_signature_line(raw_text: str) -> Optional[str]:
+    """Extract a likely existing signature/attribution line from the source text."""
+    return _find_signature_line([ln.rstrip() for ln in raw_text.splitlines() if ln.strip()])
+
+
+class AnalyzedText:
+    """Everything the pipeline stages need to know about one text, computed once."""
+
+    __slots__ = (
+        "text",
+        "stripped",
+        "lower",
+        "lines",
+        "nonblank_lines",
+        "signature_line",
+        "tokens",
+        "token_set",
+        "marker_hits",
+        "entities",
+        "has_date_hint",
+        "has_time_hint",
+        "has_place_hint",
+        "route",
+    )
+
+    def __init__(self, text: str) -> None:
+        self.text = text or ""
+        self.stripped = self.text.strip()
+        self.lower = self.stripped.lower()
+        self.lines = self.text.splitlines()
+        self.nonblank_lines = [ln.rstrip() for ln in self.lines if ln.strip()]
+        self.signature_line = _find_signature_line(self.nonblank_lines)
+        self.tokens = _WORD_TOKEN.findall(self.lower)
+        self.token_set = frozenset(self.tokens)
+        self.marker_hits = scan_markers(self.lower)
+        self.entities = extract_entities(self.lower)
+        self.has_date_hint = bool(self.entities.dates or self.entities.years)
+        self.has_time_hint = bool(self.entities.times)
+        self.has_place_hint = bool(self.entities.places) or any(
+            m in self.marker_hits for m in PLACE_HINT_MARKERS
+        )
+        # Filled in by llm.routing.route_official on first use.
+        self.route = None
+
+    @property
+    def has_signature(self) -> bool:
+        return self.signature_line is not None
+
+    def has(self, marker: str) -> bool:
+        if marker in TRACKED_MARKERS:
+            return marker in self.marker_hits
+        return marker in self.lower
+
+    def has_any(self, markers: Iterable[str]) -> bool:
+        return any(self.has(marker) for marker in markers)
+
+
+def analyze_text(text: str) -> AnalyzedText:
+    return AnalyzedText(text)
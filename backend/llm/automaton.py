@@ -0,0 +1,152 @@
+"""
+Multi-pattern substring matching.
+
+MultiPatternMatcher compiles a fixed set of lowercase patterns once and finds
+every pattern occurring in a text in a single left-to-right pass using an
+Aho-Corasick automaton.
+
+For small pattern sets CPython's built-in substring search (C code) beats a
+pure-Python automaton walk, so find_all() switches to per-pattern `in` checks
+below SUBSTRING_SCAN_LIMIT patterns. Run `python -m benchmarks.markers` to
+see the crossover on this machine.
+
+trie_alternation builds the regex counterpart: one alternation of many words
+shaped as a prefix trie, for patterns that embed a word list.
+"""
+
+import re
+from collections import deque
+from typing import Iterable, Iterator
+
+# Below this many patterns, per-pattern C substring search is faster than the automaton walk.
+SUBSTRING_SCAN_LIMIT = 200
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _at_boundaries(text: str, start: int, end: int, pattern: str) -> bool:
+    # Same rule as regex \b on both sides of the match.
+    before = start > 0 and _is_word_char(text[start - 1])
+    after = end < len(text) and _is_word_char(text[end])
+    return before != _is_word_char(pattern[0]) and after != _is_word_char(pattern[-1])
+
+
+def trie_alternation(words: Iterable[str]) -> str:
+    """
+    Regex alternation of words as a prefix trie ("ju(?:l(?:io|y)?|n...)"), so
+    a position is rejected after one character instead of one try per word.
+    """
+    root: dict = {}
+    for word in words:
+        node = root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and "" not in node else f"(?:{'|'.join(branches)})"
+        return body + ("?" if "" in node else "")
+
+    return emit(root)
+
+
+class MultiPatternMatcher:
+    """Aho-Corasick automaton over a fixed list of patterns."""
+
+    __slots__ = ("patterns", "_goto", "_fail", "_out", "_use_automaton")
+
+    def __init__(self, patterns: Iterable[str], use_automaton: bool | None = None) -> None:
+        self.patterns: tuple[str, ...] = tuple(dict.fromkeys(p for p in patterns if p))
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[tuple[int, ...]] = [()]
+        self._fail: list[int] = [0]
+        self._build()
+        if use_automaton is None:
+            use_automaton = len(self.patterns) > SUBSTRING_SCAN_LIMIT
+        self._use_automaton = use_automaton
+
+    def _build(self) -> None:
+        goto, out = self._goto, self._out
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    out.append(())
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            out[state] = out[state] + (index,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                target = goto[link].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self._fail = fail
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield (end_index, pattern_index) for every occurrence; end_index is exclusive."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for position, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for index in out[state]:
+                    yield position + 1, index
+
+    def find_all(self, text: str) -> frozenset[str]:
+        """Every pattern that occurs in text, found in one pass."""
+        if not self._use_automaton:
+            return frozenset(p for p in self.patterns if p in text)
+
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        patterns = self.patterns
+        return frozenset(patterns[i] for i in found)
+
+    def find_words(self, text: str) -> frozenset[str]:
+        """Patterns that occur in text as whole words (regex word boundaries at both ends)."""
+        patterns = self.patterns
+        found: set[str] = set()
+        if self._use_automaton:
+            for end, index in self.iter_matches(text):
+                pattern = patterns[index]
+                if pattern not in found and _at_boundaries(text, end - len(pattern), end, pattern):
+                    found.add(pattern)
+            return frozenset(found)
+
+        for pattern in patterns:
+            start = text.find(pattern)
+            while start != -1:
+                if _at_boundaries(text, start, start + len(pattern), pattern):
+                    found.add(pattern)
+                    break
+                start = text.find(pattern, start + 1)
+        return frozenset(found)
@@ -0,0 +1,72 @@
+"""
+Output-token budgets and stop sequences per prompt kind.
+
+Every LLM call gets max_tokens sized from its input, so a completion that
+rambles on (echoing prompt sections, repeating the examples) is cut off
+instead of running until the timeout, and stop sequences end it as soon as it
+starts a prompt banner or divider. Finish reasons are counted per prompt kind
+in llm.metrics so truncation and stop rates are visible on /metrics.
+"""
+
+from dataclasses import dataclass
+
+from config.ai_settings import MAX_OUTPUT_TOKENS
+from llm import metrics
+from llm.types import GenerationResult
+
+# Rough characters per token for Cebuano/English text on Llama tokenizers.
+CHARS_PER_TOKEN = 3.0
+
+PROMPT_KINDS = ("official", "non_official", "paragraph", "generation")
+
+
+@dataclass(frozen=True)
+class BudgetRule:
+    """max_tokens = fixed + ratio * input tokens, clamped to [floor, MAX_OUTPUT_TOKENS]."""
+
+    fixed: int
+    ratio: float
+    floor: int
+    stop: tuple[str, ...]
+
+
+# Outputs restate the input in Cebuano, which runs longer than English, plus a
+# greeting/closing/signature frame for full announcements.
+_BUDGETS = {
+    "official": BudgetRule(fixed=160, ratio=1.8, floor=256, stop=("\n====", "\n---", '\n"""')),
+    "non_official": BudgetRule(fixed=64, ratio=1.8, floor=128, stop=("\n====", "\n---", '\n"""')),
+    "paragraph": BudgetRule(fixed=32, ratio=1.8, floor=96, stop=("\n====", "\n---", '\n"""')),
+    # Drafts are written from a one-line instruction, so the input says little about length.
+    "generation": BudgetRule(fixed=512, ratio=1.0, floor=512, stop=("\n====", "\n---", '\n"""', "```")),
+}
+
+
+@dataclass(frozen=True)
+class GenerationBudget:
+    max_tokens: int
+    stop: tuple[str, ...]
+
+
+def generation_budget(kind: str, input_text: str) -> GenerationBudget:
+    rule = _BUDGETS[kind]
+    input_tokens = len(input_text) / CHARS_PER_TOKEN
+    max_tokens = int(rule.fixed + rule.ratio * input_tokens)
+    return GenerationBudget(
+        max_tokens=min(MAX_OUTPUT_TOKENS, max(rule.floor, max_tokens)),
+        stop=rule.stop,
+    )
+
+
+def record_finish(kind: str, result: GenerationResult) -> None:
+    """Count one call's outcome: llm.<kind>.calls, .finish.<reason>, .truncated, .stop_sequence."""
+    metrics.increment(f"llm.{kind}.calls")
+    if not result.success:
+        metrics.increment(f"llm.{kind}.error")
+        return
+    metrics.increment(f"llm.{kind}.finish.{result.finish_reason or 'unknown'}")
+    if result.finish_reason == "length":
+        metrics.increment(f"llm.{kind}.truncated")
+    if result.stop_sequence:
+        metrics.increment(f"llm.{kind}.stop_sequence")
+    if result.completion_tokens:
+        metrics.increment(f"llm.{kind}.completion_tokens", result.completion_tokens)
@@ -0,0 +1,89 @@
+"""
+In-memory caches for refinement results.
+
+Entries are keyed by a content hash plus the signer context of the request,
+so the same paragraph refined for a different signer is never reused.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from config.ai_settings import PARAGRAPH_CACHE_MAX_ENTRIES, REFINEMENT_CACHE_MAX_ENTRIES
+
+
+class LRUCache:
+    """Small thread-safe LRU cache for refined text (and other immutable results)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def signer_context(
+    signature_name: Optional[str],
+    signature_title: Optional[str],
+    route: str = "",
+) -> str:
+    """Stable string describing who signs the output and which prompt route is used."""
+    return "\x1f".join(
+        [
+            route,
+            (signature_name or "").strip(),
+            (signature_title or "").strip(),
+        ]
+    )
+
+
+def content_key(text: str, context: str) -> str:
+    """Hash text together with its signer context."""
+    digest = hashlib.sha256()
+    digest.update(context.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(text.strip().encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Whole refined documents, filled by /refine and by background prefetch.
+refinement_cache = LRUCache(REFINEMENT_CACHE_MAX_ENTRIES)
+
+# Refined body paragraphs, reused across refine rounds of the same draft.
+paragraph_cache = LRUCache(PARAGRAPH_CACHE_MAX_ENTRIES)
@@ -74,6 +74,16 @@ def generate_text_with_model(
             error="LLM_API_KEY not configured",
         )
 
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": request.prompt}],
+        "temperature": request.temperature,
+    }
+    if request.max_tokens:
+        payload["max_tokens"] = request.max_tokens
+    if request.stop:
+        payload["stop"] = list(request.stop)
+
     start_time = time.time()
 
     try:
@@ -84,18 +94,18 @@ def generate_text_with_model(
                     "Authorization": f"Bearer {api_key}",
                     "Content-Type": "application/json",
                 },
-                json={
-                    "model": model,
-                    "messages": [{"role": "user", "content": request.prompt}],
-                    "temperature": request.temperature,
-                },
+                json=payload,
             )
 
             response.raise_for_status()
             data = response.json()
 
-            content = data["choices"][0]["message"]["content"]
+            choice = data["choices"][0]
+            content = choice["message"]["content"]
             latency_ms = int((time.time() - start_time) * 1000)
+            # vLLM-style servers report the matched stop string as stop_reason.
+            matched_stop = choice.get("stop_reason")
+            usage = data.get("usage") or {}
 
             return GenerationResult(
                 success=True,
@@ -103,6 +113,9 @@ def generate_text_with_model(
                 provider="hosted",
                 model=model,
                 latency_ms=latency_ms,
+                finish_reason=choice.get("finish_reason"),
+                stop_sequence=matched_stop if isinstance(matched_stop, str) else None,
+                completion_tokens=usage.get("completion_tokens"),
             )
 
     except httpx.HTTPStatusError as e:
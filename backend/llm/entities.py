@@ -0,0 +1,277 @@
+"""
+Date, time and place entities of announcement text.
+
+One compiled pattern finds every date ("Hulyo 21-24, 2025", "21 Hulyo",
+"July 21"), year and time ("alas 8:00 sa buntag", "alas siyete y medya",
+"3pm", "14:30") in a single left-to-right pass. Venues come from one
+word-boundary MultiPatternMatcher scan. Entities are normalized (month and
+hour numbers, canonical venue names), so validators compare source and output
+as sets no matter how the model spelled them.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from llm.automaton import MultiPatternMatcher, trie_alternation
+
+_MONTHS = {
+    1: ("enero", "january", "jan"),
+    2: ("pebrero", "febrero", "february", "feb"),
+    3: ("marso", "march", "mar"),
+    4: ("abril", "april", "apr"),
+    5: ("mayo", "may"),
+    6: ("hunyo", "junio", "june", "jun"),
+    7: ("hulyo", "julio", "july", "jul"),
+    8: ("agosto", "august", "aug"),
+    9: ("setyembre", "septyembre", "septiembre", "september", "sept", "sep"),
+    10: ("oktubre", "octubre", "october", "oct"),
+    11: ("nobyembre", "novyembre", "noviembre", "november", "nov"),
+    12: ("disyembre", "diciembre", "december", "dec"),
+}
+MONTH_NUMBERS = {name: number for number, names in _MONTHS.items() for name in names}
+MONTH_LABELS = {number: names[0].capitalize() for number, names in _MONTHS.items()}
+
+# Month names that are also ordinary words or names ("may" is Cebuano for
+# "there is", "Jan" is a name, "mo-march" is to march) only count with a day
+# number, and not when the number counts something ("may 3 ka baboy").
+_NEEDS_DAY = frozenset(
+    {"may", "jan", "feb", "mar", "march", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec"}
+)
+
+# Spanish-derived hour words used after "alas".
+_HOUR_WORDS = {
+    "una": 1,
+    "dos": 2,
+    "tres": 3,
+    "kwatro": 4,
+    "kuwatro": 4,
+    "singko": 5,
+    "sais": 6,
+    "siyete": 7,
+    "syete": 7,
+    "otso": 8,
+    "nuwebe": 9,
+    "nuebe": 9,
+    "diyes": 10,
+    "dyes": 10,
+    "onse": 11,
+    "dose": 12,
+}
+
+_PERIODS = {
+    "buntag": "am",
+    "kaadlawon": "am",
+    "morning": "am",
+    "udto": "pm",
+    "hapon": "pm",
+    "gabii": "pm",
+    "afternoon": "pm",
+    "evening": "pm",
+}
+# "alas 12 sa gabii" is midnight.
+_NIGHT_WORDS = frozenset({"gabii", "evening"})
+
+# Venue phrase -> canonical name. Aliases map English and Cebuano spellings of
+# the same place together.
+VENUES = {
+    "covered court": "covered court",
+    "basketball court": "basketball court",
+    "session hall": "session hall",
+    "barangay hall": "barangay hall",
+    "multi-purpose hall": "multi-purpose hall",
+    "multipurpose hall": "multi-purpose hall",
+    "health center": "health center",
+    "health centre": "health center",
+    "day care center": "day care center",
+    "daycare center": "day care center",
+    "gymnasium": "gym",
+    "gym": "gym",
+    "plaza": "plaza",
+    "chapel": "kapilya",
+    "kapilya": "kapilya",
+    "church": "simbahan",
+    "simbahan": "simbahan",
+    "elementary school": "elementary school",
+    "high school": "high school",
+    "eskwelahan": "eskwelahan",
+    "tunghaan": "eskwelahan",
+}
+_VENUE_MATCHER = MultiPatternMatcher(VENUES)
+
+
+_MONTH_ALT = trie_alternation(MONTH_NUMBERS)
+_LEADING_LETTERS = "".join(sorted({name[0] for name in MONTH_NUMBERS} | {"a", "p"}))
+_DAY = r"(?:[12][0-9]|3[01]|0?[1-9])(?:st|nd|rd|th)?"
+_RANGE_SEP = r"\s*(?:-|–|to|until|hangtod|hangtud|ngadto)\s*"
+# "hulyo 21 ug 24" names two days, not the days between them.
+_AND_SEP = r"\s*(?:ug|and|&)\s*"
+# Cebuano counting linker: "3 ka baboy" is three pigs.
+_COUNT_LINKER = re.compile(r"\s*ka\b")
+
+
+def _period_group(name: str) -> str:
+    return (
+        rf"(?:\s*(?P<{name}>[ap]\.?m\b\.?|sa\s+(?:buntag|kaadlawon|udto|hapon|gabii)\b"
+        r"|in\s+the\s+(?:morning|afternoon|evening)\b))?"
+    )
+
+
+_ENTITY = re.compile(
+    # Every branch starts with a digit, a month, "alas" or "purok"; the
+    # lookahead skips all other positions cheaply.
+    rf"(?=[0-9{_LEADING_LETTERS}])(?:"
+    # Month first: "hulyo 21-24, 2025", "hulyo 21", "hulyo"
+    rf"\b(?P<month>{_MONTH_ALT})\b\.?"
+    rf"(?:\s+(?P<day>{_DAY})\b(?:{_RANGE_SEP}(?P<day_end>{_DAY})\b|{_AND_SEP}(?P<day_also>{_DAY})\b)?)?"
+    r"(?:,?\s*(?P<year>20[0-9]{2})\b)?"
+    # Day first: "21 hulyo", "21 sa hulyo 2025"
+    rf"|\b(?P<dday>{_DAY})\s+(?:sa\s+|de\s+|of\s+)?(?P<dmonth>{_MONTH_ALT})\b\.?"
+    r"(?:,?\s*(?P<dyear>20[0-9]{2})\b)?"
+    # Times: "alas 8:00", "alas siyete y medya", "8:00", "3pm"
+    rf"|\balas\s+(?:(?P<alas_hour>[0-9]{{1,2}})(?::(?P<alas_minute>[0-5][0-9]))?"
+    rf"|(?P<alas_word>{'|'.join(_HOUR_WORDS)})(?P<half>\s+y\s+medy?a)?)\b{_period_group('period')}"
+    rf"|\b(?P<hour>[0-9]{{1,2}}):(?P<minute>[0-5][0-9])\b{_period_group('clock_period')}"
+    r"|\b(?P<bare_hour>1[0-2]|0?[1-9])\s*(?P<bare_period>[ap]\.?m)\b\.?"
+    # Years outside a date, and numbered puroks
+    r"|\b(?P<lone_year>20[0-9]{2})\b"
+    r"|\bpurok\s+(?P<purok>[0-9]{1,2})\b)"
+)
+
+
+@dataclass(frozen=True)
+class Entities:
+    """Normalized entities of one text."""
+
+    # (month, day); day is None when only the month is named.
+    dates: frozenset[tuple[int, Optional[int]]] = frozenset()
+    years: frozenset[str] = frozenset()
+    # (hour 1-12, minute, "am"/"pm" or None when no period was given)
+    times: frozenset[tuple[int, int, Optional[str]]] = frozenset()
+    places: frozenset[str] = frozenset()
+
+
+def _period(raw: Optional[str], hour: int) -> Optional[str]:
+    if not raw:
+        return None
+    if raw[0] in "ap" and raw.replace(".", "").strip() in ("am", "pm"):
+        return raw[0] + "m"
+    word = raw.split()[-1]
+    if hour == 12 and word in _NIGHT_WORDS:
+        return "am"
+    return _PERIODS.get(word)
+
+
+def _time(hour: int, minute: int, period: Optional[str]) -> Optional[tuple[int, int, Optional[str]]]:
+    if hour > 23 or minute > 59:
+        return None
+    if hour == 0:
+        return (12, minute, "am")
+    if hour > 12:
+        return (hour - 12, minute, "pm")
+    return (hour, minute, period)
+
+
+def _day(raw: str) -> int:
+    return int(raw.rstrip("stndrh"))
+
+
+def extract_entities(lower_text: str) -> Entities:
+    """Dates, years, times and places in already-lowercased text."""
+    dates: set[tuple[int, Optional[int]]] = set()
+    years: set[str] = set()
+    times: set[tuple[int, int, Optional[str]]] = set()
+    places: set[str] = {VENUES[hit] for hit in _VENUE_MATCHER.find_words(lower_text)}
+
+    for m in _ENTITY.finditer(lower_text):
+        groups = m.groupdict()
+        if groups["month"]:
+            month = MONTH_NUMBERS[groups["month"]]
+            if groups["day"] is None:
+                if groups["month"] not in _NEEDS_DAY:
+                    dates.add((month, None))
+            elif groups["month"] in _NEEDS_DAY and groups["year"] is None and _COUNT_LINKER.match(lower_text, m.end()):
+                # "may 3 ka baboy": a count, not a date.
+                continue
+            else:
+                first = _day(groups["day"])
+                last = _day(groups["day_end"]) if groups["day_end"] else first
+                dates.update((month, day) for day in range(first, max(first, last) + 1))
+                if groups["day_also"]:
+                    dates.add((month, _day(groups["day_also"])))
+            if groups["year"]:
+                years.add(groups["year"])
+        elif groups["dmonth"]:
+            dates.add((MONTH_NUMBERS[groups["dmonth"]], _day(groups["dday"])))
+            if groups["dyear"]:
+                years.add(groups["dyear"])
+        elif groups["alas_hour"] or groups["alas_word"]:
+            if groups["alas_word"]:
+                hour = _HOUR_WORDS[groups["alas_word"]]
+                minute = 30 if groups["half"] else 0
+            else:
+                hour = int(groups["alas_hour"])
+                minute = int(groups["alas_minute"] or 0)
+            entry = _time(hour, minute, _period(groups["period"], hour))
+            if entry:
+                times.add(entry)
+        elif groups["hour"]:
+            hour = int(groups["hour"])
+            entry = _time(hour, int(groups["minute"]), _period(groups["clock_period"], hour))
+            if entry:
+                times.add(entry)
+        elif groups["bare_hour"]:
+            hour = int(groups["bare_hour"])
+            entry = _time(hour, 0, _period(groups["bare_period"], hour))
+            if entry:
+                times.add(entry)
+        elif groups["lone_year"]:
+            years.add(groups["lone_year"])
+        elif groups["purok"]:
+            places.add(f"purok {int(groups['purok'])}")
+
+    return Entities(frozenset(dates), frozenset(years), frozenset(times), frozenset(places))
+
+
+def format_date(date: tuple[int, Optional[int]]) -> str:
+    month, day = date
+    return MONTH_LABELS[month] if day is None else f"{MONTH_LABELS[month]} {day}"
+
+
+def format_time(time: tuple[int, int, Optional[str]]) -> str:
+    hour, minute, period = time
+    return f"{hour}:{minute:02d}" + (f" {period}" if period else "")
+
+
+def missing_dates(source: Entities, output: Entities) -> list[tuple[int, Optional[int]]]:
+    """Source dates the output lost; a month-only date is kept by any date in that month."""
+    output_months = {month for month, _ in output.dates}
+    missing = [
+        date
+        for date in source.dates
+        if date not in output.dates and not (date[1] is None and date[0] in output_months)
+    ]
+    return sorted(missing, key=lambda d: (d[0], d[1] or 0))
+
+
+def missing_times(source: Entities, output: Entities) -> list[tuple[int, int, Optional[str]]]:
+    """
+    Source times the output lost. A time without a period is kept by the same
+    clock time with any period, but an explicit period must not flip
+    (alas 3 sa hapon -> alas 3 sa buntag).
+    """
+    output_clock = {(hour, minute) for hour, minute, _ in output.times}
+    missing = []
+    for time in source.times:
+        hour, minute, period = time
+        if period is None:
+            kept = (hour, minute) in output_clock
+        else:
+            kept = time in output.times or (hour, minute, None) in output.times
+        if not kept:
+            missing.append(time)
+    return sorted(missing, key=lambda t: (t[2] or "", t[0], t[1]))
+
+
+def missing_places(source: Entities, output: Entities) -> list[str]:
+    return sorted(source.places - output.places)
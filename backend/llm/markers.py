@@ -0,0 +1,156 @@
+"""
+Marker registry shared by the classifiers and validators.
+
+Every lowercase marker phrase the pipeline looks for is listed once here,
+grouped by meaning. The whole registry is compiled into one
+MultiPatternMatcher at import, so a text is scanned once and every consumer
+reads the resulting hit set instead of keeping its own marker list.
+"""
+
+from typing import Iterable
+
+from llm.automaton import MultiPatternMatcher
+
+MARKER_GROUPS: dict[str, tuple[str, ...]] = {
+    # Strong signals that the message is an official LGU/barangay notice.
+    "authority": (
+        "hon.",
+        "barangay captain",
+        "municipal mayor",
+        "kapitan",
+        "sangguniang barangay",
+        "office of the barangay captain",
+        "official advisory",
+    ),
+    # Broad public-address style often used in official notices.
+    "community": (
+        "tinahod kong mga baryuhanon",
+        "tinahod kong mga barangayanon",
+        "pahibalo alang sa tanang",
+        "sa tanang residente",
+        "public advisory",
+        "barangay advisory",
+    ),
+    # Civic notices that are typically official when framed in barangay context.
+    "official_event": (
+        "general assembly",
+        "barangay assembly",
+        "public meeting",
+        "community assembly",
+        "official meeting",
+    ),
+    "barangay_context": (
+        "barangay",
+        "covered court",
+        "barangay hall",
+        "session hall",
+        "residente",
+    ),
+    # Signals for non-official/community contributor style posts.
+    "non_official": (
+        "from:",
+        "sk kagawad",
+        "sk chairman",
+        "basketball club",
+    ),
+    # Section titles of our prompts; seeing them in output means the model echoed the prompt.
+    "prompt_echo": (
+        "how to use the examples",
+        "decision logic",
+        "output rules",
+        "required output format",
+    ),
+    # Official framing a non-official post must not gain during refinement.
+    "injected_official": (
+        "kaninyo matinahuron",
+        "hon.",
+        "barangay captain",
+        "tinahod kong mga baryuhanon",
+        "tinahod kong mga barangayanon",
+    ),
+    # Structural pieces of the standard barangay format.
+    "structure": (
+        "tinahod kong",
+        "gipanghinaut",
+        "kaninyo matinahuron",
+        "matinahuron",
+        "gikan kang",
+        "note:",
+    ),
+    # Frame markers a refined paragraph must never introduce on its own.
+    "paragraph_frame": (
+        "tinahod kong",
+        "gipanghinaut",
+        "kaninyo matinahuron",
+        "hon.",
+        "barangay captain",
+    ),
+    # Titles that make a signature block official.
+    "signer_title": (
+        "barangay captain",
+        "municipal mayor",
+        "kapitan",
+    ),
+    "place_hint": (
+        "covered court",
+        "barangay hall",
+        "session hall",
+        "lugar",
+        "venue",
+        "place",
+    ),
+}
+
+OFFICIAL_AUTHORITY_MARKERS = MARKER_GROUPS["authority"]
+COMMUNITY_MARKERS = MARKER_GROUPS["community"]
+OFFICIAL_EVENT_MARKERS = MARKER_GROUPS["official_event"]
+BARANGAY_CONTEXT_MARKERS = MARKER_GROUPS["barangay_context"]
+NON_OFFICIAL_MARKERS = MARKER_GROUPS["non_official"]
+PROMPT_ECHO_MARKERS = MARKER_GROUPS["prompt_echo"]
+INJECTED_OFFICIAL_MARKERS = MARKER_GROUPS["injected_official"]
+PARAGRAPH_FRAME_MARKERS = MARKER_GROUPS["paragraph_frame"]
+SIGNER_TITLE_MARKERS = MARKER_GROUPS["signer_title"]
+PLACE_HINT_MARKERS = MARKER_GROUPS["place_hint"]
+
+_MATCHER = MultiPatternMatcher(
+    marker for markers in MARKER_GROUPS.values() for marker in markers
+)
+TRACKED_MARKERS = frozenset(_MATCHER.patterns)
+
+
+def scan_markers(lower_text: str) -> frozenset[str]:
+    """All registry markers present in already-lowercased text, in one scan."""
+    return _MATCHER.find_all(lower_text)
+
+
+def any_hit(hits: frozenset[str], markers: Iterable[str]) -> bool:
+    return any(marker in hits for marker in markers)
+
+
+def classify_official(hits: frozenset[str]) -> bool:
+    """
+    Decide whether marker hits describe an official barangay announcement.
+
+    Used both for prompt routing and for the prompt's own rules, so the two
+    can no longer disagree.
+    """
+    has_non_official = any_hit(hits, NON_OFFICIAL_MARKERS)
+    has_authority = any_hit(hits, OFFICIAL_AUTHORITY_MARKERS)
+    has_community_tone = any_hit(hits, COMMUNITY_MARKERS)
+    has_official_event = any_hit(hits, OFFICIAL_EVENT_MARKERS)
+    has_barangay_context = any_hit(hits, BARANGAY_CONTEXT_MARKERS)
+
+    # If it has explicit non-official markers and no authority markers, classify non-official.
+    if has_non_official and not has_authority:
+        return False
+
+    if has_authority:
+        return True
+
+    if has_community_tone and not has_non_official:
+        return True
+
+    if has_official_event and has_barangay_context and not has_non_official:
+        return True
+
+    return False
@@ -0,0 +1,22 @@
+"""
+Process-wide counters for the refinement pipeline.
+
+Counters are in-memory only and reset on restart; they are exposed through
+the /metrics endpoint for quick inspection.
+"""
+
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_counters: Counter = Counter()
+
+
+def increment(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] += amount
+
+
+def snapshot() -> dict[str, int]:
+    with _lock:
+        return dict(sorted(_counters.items()))
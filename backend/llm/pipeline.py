@@ -1,158 +1,152 @@
 from llm.prompt_builder import (
     build_generation_prompt,
     build_non_official_refinement_prompt,
+    build_paragraph_refinement_prompt,
     build_refinement_prompt,
 )
 import re
+from llm.analysis import (
+    AnalyzedText,
+    analyze_text,
+    extract_signature_line,
+    looks_like_name_line,
+)
+from llm.retry_policy import record_attempt, route_class, should_attempt
+from llm.routing import route_official
+from llm.cache import content_key, paragraph_cache, refinement_cache, signer_context
+from llm.budget import generation_budget, record_finish
 from llm.client import generate_text_with_model
-from llm.types import GenerationRequest
+from llm import metrics
+from llm.types import GenerationRequest, RefinementResult
+from llm.validators import evaluate
 from config.ai_settings import LLM_MODEL_FALLBACK
 
 
-PROMPT_ECHO_MARKERS = [
-    "how to use the examples",
-    "decision logic",
-    "output rules",
-    "required output format",
-]
+# Official defaults: always fall back to Barangay Captain identity when source has no signature.
+OFFICIAL_DEFAULT_NAME = "HON. ALBERTO C. PACHECO"
+OFFICIAL_DEFAULT_TITLE = "Barangay Captain"
 
-GENERATION_PLACEHOLDERS = [
-    "[Petsa]",
-    "[Oras]",
-    "[Lugar/Covered Court]",
-]
 
+def _has_existing_signature(raw_text: str, analysis: AnalyzedText | None = None) -> bool:
+    if analysis is not None:
+        return analysis.has_signature
+    return extract_signature_line(raw_text) is not None
 
-def _looks_like_name_line(line: str) -> bool:
-    cleaned = line.strip()
-    if not cleaned:
-        return False
 
-    if any(mark in cleaned for mark in [",", "!", "?"]):
-        return False
+# ---------------------------
+# 0. PRE-CHECK (NO-LLM FAST PATH)
+# ---------------------------
+# Obvious misspellings fixed before the structure check (lowercase whole words).
+COMMON_TYPO_FIXES = {
+    "inyung": "inyong",
+    "kaninyu": "kaninyo",
+    "kooperasyun": "kooperasyon",
+    "koperasyon": "kooperasyon",
+    "gipanghinaot": "gipanghinaut",
+    "matinahoron": "matinahuron",
+    "matinahurun": "matinahuron",
+    "baryohanon": "baryuhanon",
+    "barangayanun": "barangayanon",
+    "salamt": "salamat",
+    "daghng": "daghang",
+    "magpahigayun": "magpahigayon",
+}
+
+_TYPO_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(word) for word in COMMON_TYPO_FIXES) + r")\b",
+    re.IGNORECASE,
+)
 
-    parts = [p for p in cleaned.replace("-", " ").split() if p]
-    if len(parts) < 2 or len(parts) > 5:
-        return False
+# Everyday Cebuano function words; a non-official post without them still needs translation.
+CEBUANO_FUNCTION_WORDS = {
+    "ang", "sa", "nga", "ug", "og", "mga", "kay", "ni", "si", "kini", "niini",
+    "atong", "atung", "ta", "kita", "ko", "ako", "mo", "alang", "adunay", "naa",
+    "mao", "para", "dili", "unya", "karong", "ugma",
+}
 
-    name_token = re.compile(r"^[A-Za-z][A-Za-z\.'-]*$")
-    if not all(name_token.match(p) for p in parts):
-        return False
 
-    if cleaned.isupper():
-        return True
+def _fix_typo(match: re.Match) -> str:
+    word = match.group(0)
+    fixed = COMMON_TYPO_FIXES[word.lower()]
+    if word.isupper():
+        return fixed.upper()
+    if word[:1].isupper():
+        return fixed[:1].upper() + fixed[1:]
+    return fixed
 
-    return all(p[:1].isupper() for p in parts if p[:1].isalpha())
 
+def light_normalize(raw_text: str) -> str:
+    """Whitespace cleanup and dictionary typo fixes; never rewrites wording."""
+    lines = [re.sub(r"[ \t]+", " ", ln).strip() for ln in raw_text.strip().splitlines()]
+    text = re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+    text = re.sub(r"(\d)%(?=[A-Za-z])", r"\1% ", text)
+    return _TYPO_PATTERN.sub(_fix_typo, text)
+
+
+def _is_mostly_cebuano(analysis: AnalyzedText) -> bool:
+    if not analysis.tokens:
+        return False
+    hits = sum(1 for token in analysis.tokens if token in CEBUANO_FUNCTION_WORDS)
+    return hits / len(analysis.tokens) >= 0.15
 
-def _extract_signature_line(raw_text: str) -> str | None:
-    lines = [ln.rstrip() for ln in raw_text.splitlines() if ln.strip()]
-    if not lines:
-        return None
 
-    for line in reversed(lines):
-        stripped = line.strip()
-        lower = stripped.lower()
+def precheck_already_formatted(
+    raw_text: str,
+    analysis: AnalyzedText | None = None,
+) -> str | None:
+    """
+    Return the lightly normalized input when it already has the final structure.
+
+    Official posts need the greeting, the Gipanghinaut closing and a signature;
+    non-official posts need an attribution line and Cebuano wording. In both
+    cases validate_output must accept the text as-is, so no model call is needed.
+    """
+    source = analysis or analyze_text(raw_text)
+    if is_generation_intent(raw_text, source):
+        return None
 
-        if lower.startswith(("-", "gikan kang", "from:", "hon.")):
-            return stripped
+    normalized = light_normalize(raw_text)
+    current = source if normalized == source.stripped else analyze_text(normalized)
 
-        if _looks_like_name_line(stripped):
-            return stripped
+    if not current.has_signature:
+        return None
 
-    return None
+    if is_official_announcement(normalized, current):
+        if not current.lower.startswith("tinahod kong") or not current.has("gipanghinaut"):
+            return None
+        if not current.has("kaninyo matinahuron") and not current.has("gikan kang"):
+            return None
+        is_official = True
+    else:
+        if not _is_mostly_cebuano(current):
+            return None
+        is_official = False
 
+    if not validate_output(normalized, is_official, raw_text, source):
+        return None
 
-def _has_existing_signature(raw_text: str) -> bool:
-    return _extract_signature_line(raw_text) is not None
+    return normalized
 
 
 # ---------------------------
 # 1. CLASSIFIER
 # ---------------------------
-def is_official_announcement(text: str) -> bool:
-    text = text.lower()
-
-    # Strong signals that the message is an official LGU/barangay notice.
-    official_markers = [
-        "hon.",
-        "barangay captain",
-        "municipal mayor",
-        "kapitan",
-        "sangguniang barangay",
-        "office of the barangay captain",
-        "official advisory",
-    ]
-
-    # Broad public-address style often used in official notices.
-    community_markers = [
-        "tinahod kong mga baryuhanon",
-        "tinahod kong mga barangayanon",
-        "pahibalo alang sa tanang",
-        "sa tanang residente",
-        "public advisory",
-        "barangay advisory",
-    ]
-
-    # Civic notices that are typically official when framed in barangay context.
-    official_event_markers = [
-        "general assembly",
-        "barangay assembly",
-        "public meeting",
-        "community assembly",
-        "official meeting",
-    ]
-
-    barangay_context_markers = [
-        "barangay",
-        "covered court",
-        "barangay hall",
-        "session hall",
-        "residente",
-    ]
-
-    # Signals for non-official/community contributor style posts.
-    non_official_markers = [
-        "from:",
-        "sk kagawad",
-        "sk chairman",
-        "basketball club",
-    ]
-
-    has_non_official = any(marker in text for marker in non_official_markers)
-    has_authority = any(marker in text for marker in official_markers)
-    has_community_tone = any(marker in text for marker in community_markers)
-    has_official_event = any(marker in text for marker in official_event_markers)
-    has_barangay_context = any(marker in text for marker in barangay_context_markers)
-
-    # If it has explicit non-official markers and no authority markers, classify non-official.
-    if has_non_official and not has_authority:
-        return False
+def is_official_announcement(text: str, analysis: AnalyzedText | None = None) -> bool:
+    analysis = analysis or analyze_text(text)
+    return route_official(analysis).is_official
 
-    if has_authority:
-        return True
-
-    if has_community_tone and not has_non_official:
-        return True
 
-    if has_official_event and has_barangay_context and not has_non_official:
-        return True
-
-    return False
-
-
-def is_generation_intent(text: str) -> bool:
+def is_generation_intent(text: str, analysis: AnalyzedText | None = None) -> bool:
     """Detect prompt-style requests like 'Create announcement for ...'."""
-    stripped = (text or "").strip()
-    lower = stripped.lower()
-    if not lower:
+    analysis = analysis or analyze_text(text)
+    stripped = analysis.stripped
+    if not analysis.lower:
         return False
 
-    # Normalize to token-friendly text so minor punctuation/spacing differences
+    # Tokens are letter runs, so minor punctuation/spacing differences
     # do not prevent intent detection.
-    normalized = re.sub(r"[^a-z\s]", " ", lower)
-    tokens = [token for token in normalized.split() if token]
-    token_set = set(tokens)
+    tokens = analysis.tokens
+    token_set = analysis.token_set
 
     instruction_verbs = [
         "create",
@@ -191,14 +185,28 @@ def is_generation_intent(text: str) -> bool:
 # ---------------------------
 # 2. LLM CALL (EDIT THIS PART)
 # ---------------------------
-def call_llm(prompt: str) -> str:
-    """Call only the 70B model for refinement/generation and return generated text or empty string."""
-    request = GenerationRequest(prompt=prompt, temperature=0.0)
+def call_llm(prompt: str, kind: str, input_text: str) -> str:
+    """
+    Call only the 70B model for refinement/generation and return generated text or empty string.
+
+    kind is the prompt kind from llm.budget.PROMPT_KINDS; with input_text it
+    sizes max_tokens and picks the stop sequences. A completion cut off by
+    max_tokens is incomplete, so it is returned as empty and retried like any
+    other failed attempt.
+    """
+    budget = generation_budget(kind, input_text)
+    request = GenerationRequest(
+        prompt=prompt,
+        temperature=0.0,
+        max_tokens=budget.max_tokens,
+        stop=list(budget.stop),
+    )
 
     # Force a single-model path: use 70B versatile only, no 8B fallback.
     model_70b = (LLM_MODEL_FALLBACK or "llama-3.3-70b-versatile").strip()
     result = generate_text_with_model(request, model_70b)
-    if result.success and result.text:
+    record_finish(kind, result)
+    if result.success and result.text and result.finish_reason != "length":
         return result.text.strip()
 
     return ""
@@ -207,100 +215,24 @@ def call_llm(prompt: str) -> str:
 # ---------------------------
 # 3. VALIDATOR
 # ---------------------------
-def validate_output(output: str, is_official: bool, source_text: str) -> bool:
-    output_lower = output.lower()
-    source_lower = source_text.lower()
-    source_has_signature = _has_existing_signature(source_text)
-
-    if "note:" in output_lower:
-        return False
-
-    if output.startswith("---"):
-        return False
-
-    if any(marker in output_lower for marker in PROMPT_ECHO_MARKERS):
-        return False
-
-    if len(output.strip()) == 0:
-        return False
-
-    if is_official:
-        required = ["tinahod kong", "gipanghinaut"]
-        if not source_has_signature:
-            required.append("kaninyo matinahuron")
-
-        for r in required:
-            if r not in output_lower:
-                return False
-
-        # Accept either standard closing or preserved sender attribution.
-        has_closing_or_signature = (
-            "kaninyo matinahuron" in output_lower
-            or "gikan kang" in output_lower
-            or bool(re.search(r"\bhon\.", output_lower))
-        )
-        if not has_closing_or_signature:
-            return False
-
-    else:
-        # Non-official messages must not be converted into official signature format
-        # unless those markers were already present in the input.
-        injected_official_markers = [
-            "kaninyo matinahuron",
-            "hon.",
-            "barangay captain",
-            "tinahod kong mga baryuhanon",
-            "tinahod kong mga barangayanon",
-        ]
-
-        for marker in injected_official_markers:
-            if marker in output_lower and marker not in source_lower:
-                return False
-
-    return True
-
-
-def validate_generation_output(output: str, source_text: str) -> bool:
-    output_lower = output.lower()
-    source_lower = source_text.lower()
-
-    if len(output.strip()) == 0:
-        return False
-
-    if output.startswith("---"):
-        return False
-
-    if any(marker in output_lower for marker in PROMPT_ECHO_MARKERS):
-        return False
-
-    # Must look like a proper barangay draft structure, not a loose sentence.
-    if "tinahod kong" not in output_lower:
-        return False
-    if "kaninyo matinahuron" not in output_lower:
-        return False
-
-    # Reject prompt echo responses.
-    if re.search(r"\b(create|make|write|generate|draft)\b", output_lower):
-        if "announcement" in output_lower or "announc" in output_lower:
-            return False
-
-    # Reject obvious placeholder corruption.
-    if "[" in output and "]" in output:
-        malformed = re.search(r"\[[^\]]{0,2}\]", output)
-        if malformed:
-            return False
-
-    # If source instruction does not include specific date/time/location,
-    # output should contain placeholders.
-    has_date_hint = bool(re.search(r"\b20\d{2}\b|\benero\b|\bfebrero\b|\bmarso\b|\babril\b|\bmayo\b|\bhunyo\b|\bhulyo\b|\bagosto\b|\bsetyembre\b|\boktubre\b|\bnovyembre\b|\bdisyembre\b", source_lower))
-    has_time_hint = bool(re.search(r"\balas\b|\b\d{1,2}:\d{2}\b|\bam\b|\bpm\b", source_lower))
-    has_place_hint = any(k in source_lower for k in ["covered court", "barangay hall", "session hall", "lugar", "venue", "place"])
-
-    if not (has_date_hint and has_time_hint and has_place_hint):
-        if not all(ph in output for ph in GENERATION_PLACEHOLDERS):
-            return False
-
-    return True
+def validate_output(
+    output: str,
+    is_official: bool,
+    source_text: str,
+    source_analysis: AnalyzedText | None = None,
+) -> bool:
+    source_analysis = source_analysis or analyze_text(source_text)
+    profile = "official" if is_official else "non_official"
+    return evaluate(profile, source_analysis, analyze_text(output), collect_all=False).ok
+
+
+def validate_generation_output(
+    output: str,
+    source_text: str,
+    source_analysis: AnalyzedText | None = None,
+) -> bool:
+    source_analysis = source_analysis or analyze_text(source_text)
+    return evaluate("generation", source_analysis, analyze_text(output), collect_all=False).ok
 
 
 def _extract_generation_topic(raw_text: str) -> str:
@@ -392,10 +324,11 @@ Kaninyo matinahuron,
 def force_non_official_fallback(
     raw_text: str,
     signature_name: str | None = None,
+    analysis: AnalyzedText | None = None,
 ) -> str:
     """Keep non-official posts simple; never inject official signature blocks."""
     cleaned = raw_text.strip()
-    has_signature = _has_existing_signature(cleaned)
+    has_signature = _has_existing_signature(cleaned, analysis)
     signer = (signature_name or "").strip() or "[Ngalan]"
 
     if has_signature or not signer:
@@ -404,6 +337,36 @@ def force_non_official_fallback(
     return f"{cleaned}\n\n-{signer}"
 
 
+def build_fallback_draft(
+    raw_text: str,
+    signature_name: str | None = None,
+    signature_title: str | None = None,
+    analysis: AnalyzedText | None = None,
+) -> str:
+    """Deterministic draft for the route refine_with_retry would take; no model call."""
+    analysis = analysis or analyze_text(raw_text)
+    if is_generation_intent(raw_text, analysis):
+        return _build_generation_fallback(
+            raw_text,
+            signature_name=signature_name,
+            signature_title=signature_title,
+        )
+
+    if is_official_announcement(raw_text, analysis):
+        return force_official_format_fallback(
+            raw_text,
+            signature_name=OFFICIAL_DEFAULT_NAME,
+            signature_title=OFFICIAL_DEFAULT_TITLE,
+            source_signature_line=analysis.signature_line,
+        )
+
+    return force_non_official_fallback(
+        raw_text,
+        signature_name=(signature_name or "").strip() or None,
+        analysis=analysis,
+    )
+
+
 # ---------------------------
 # 5. RETRY SYSTEM
 # ---------------------------
@@ -412,40 +375,72 @@ def refine_with_retry(
     max_retries: int = 3,
     signature_name: str | None = None,
     signature_title: str | None = None,
+    analysis: AnalyzedText | None = None,
 ) -> str:
-    if is_generation_intent(raw_text):
+    return refine_with_retry_result(
+        raw_text,
+        max_retries=max_retries,
+        signature_name=signature_name,
+        signature_title=signature_title,
+        analysis=analysis,
+    ).text
+
+
+def refine_with_retry_result(
+    raw_text: str,
+    max_retries: int = 3,
+    signature_name: str | None = None,
+    signature_title: str | None = None,
+    analysis: AnalyzedText | None = None,
+) -> RefinementResult:
+    analysis = analysis or analyze_text(raw_text)
+    if is_generation_intent(raw_text, analysis):
+        attempt_class = route_class("generation", len(analysis.stripped), analysis.has_signature)
         for attempt in range(max_retries):
+            if not should_attempt(attempt_class, attempt):
+                break
             prompt = build_generation_prompt(
                 raw_text,
                 signature_name=signature_name,
                 signature_title=signature_title,
             )
-            output = call_llm(prompt)
-            if validate_generation_output(output, raw_text):
-                return output
+            output = call_llm(prompt, "generation", raw_text)
+            passed = validate_generation_output(output, raw_text, analysis)
+            # No completion at all is a provider problem, not a validation outcome.
+            if output:
+                record_attempt(attempt_class, attempt, passed)
+            if passed:
+                return RefinementResult(text=output, source="llm")
 
         # Clean fallback for prompt-based generation when model output is low-quality.
-        return _build_generation_fallback(
-            raw_text,
-            signature_name=signature_name,
-            signature_title=signature_title,
+        return RefinementResult(
+            text=_build_generation_fallback(
+                raw_text,
+                signature_name=signature_name,
+                signature_title=signature_title,
+            ),
+            source="fallback",
         )
 
-    is_official = is_official_announcement(raw_text)
-    source_signature_line = _extract_signature_line(raw_text)
-    has_existing_signature = _has_existing_signature(raw_text)
+    is_official = is_official_announcement(raw_text, analysis)
+    source_signature_line = analysis.signature_line
+    has_existing_signature = analysis.has_signature
 
-    # Official defaults: always fall back to Barangay Captain identity when source has no signature.
-    official_default_name = "HON. ALBERTO C. PACHECO"
-    official_default_title = "Barangay Captain"
+    official_default_name = OFFICIAL_DEFAULT_NAME
+    official_default_title = OFFICIAL_DEFAULT_TITLE
     non_official_user_signature = (signature_name or "").strip() or None
 
+    route = "official" if is_official else "non_official"
+    attempt_class = route_class(route, len(analysis.stripped), has_existing_signature)
     for attempt in range(max_retries):
+        if not should_attempt(attempt_class, attempt):
+            break
         prompt = (
             build_refinement_prompt(
                 raw_text,
                 signature_name=None if has_existing_signature else official_default_name,
                 signature_title=None if has_existing_signature else official_default_title,
+                analysis=analysis,
             )
             if is_official
             else build_non_official_refinement_prompt(
@@ -453,36 +448,367 @@ def refine_with_retry(
                 signature_name=non_official_user_signature,
             )
         )
-        output = call_llm(prompt)
+        output = call_llm(prompt, route, raw_text)
 
-        if validate_output(output, is_official, raw_text):
-            return output
+        passed = validate_output(output, is_official, raw_text, analysis)
+        if output:
+            record_attempt(attempt_class, attempt, passed)
+        if passed:
+            return RefinementResult(text=output, source="llm")
 
     if is_official:
-        return force_official_format_fallback(
+        fallback = force_official_format_fallback(
             raw_text,
             signature_name=official_default_name,
             signature_title=official_default_title,
             source_signature_line=source_signature_line,
         )
+    else:
+        fallback = force_non_official_fallback(
+            raw_text,
+            signature_name=non_official_user_signature,
+            analysis=analysis,
+        )
 
-    return force_non_official_fallback(
-        raw_text,
-        signature_name=non_official_user_signature,
+    return RefinementResult(text=fallback, source="fallback")
+
+
+# ---------------------------
+# 6. INCREMENTAL RE-REFINEMENT
+# ---------------------------
+# Closing lines that are rebuilt on reassembly instead of being kept verbatim.
+REBUILT_CLOSING_LINES = {
+    "gipanghinaut ko ang inyong 100 nga kooperasyon",
+    "gipanghinaut ko ang inyung 100 nga kooperasyon",
+    "daghang salamat",
+}
+
+
+def _split_paragraphs(text: str) -> list[str]:
+    return [p.strip() for p in re.split(r"\n\s*\n", (text or "").strip()) if p.strip()]
+
+
+def _normalize_frame_line(line: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9\s]", " ", line.lower()).split())
+
+
+def _is_frame_line(line: str) -> bool:
+    """Greeting-free closing, attribution or signature line."""
+    stripped = line.strip()
+    if not stripped:
+        return True
+
+    normalized = _normalize_frame_line(stripped)
+    if normalized in REBUILT_CLOSING_LINES or normalized == "kaninyo matinahuron":
+        return True
+
+    if stripped.lower().startswith(("-", "gikan kang", "from:", "hon.")):
+        return True
+
+    if stripped.isupper() and not any(ch.isdigit() for ch in stripped) and len(stripped) <= 60:
+        return True
+
+    return looks_like_name_line(stripped)
+
+
+def _split_body(text: str) -> tuple[list[str], list[str]]:
+    """Split an announcement into body paragraphs and its trailing closing/signature lines."""
+    paragraphs = _split_paragraphs(text)
+
+    if paragraphs and "\n" not in paragraphs[0]:
+        first = paragraphs[0].lower()
+        if first.startswith("tinahod kong") and len(first) <= 40:
+            paragraphs = paragraphs[1:]
+
+    trailing: list[str] = []
+    while paragraphs:
+        lines = [ln.strip() for ln in paragraphs[-1].splitlines() if ln.strip()]
+        if all(_is_frame_line(ln) for ln in lines):
+            trailing = lines + trailing
+            paragraphs.pop()
+            continue
+
+        # Closing lines glued to the end of the last body paragraph.
+        keep = len(lines)
+        while keep > 0 and _is_frame_line(lines[keep - 1]):
+            keep -= 1
+        if keep < len(lines):
+            trailing = lines[keep:] + trailing
+            paragraphs[-1] = "\n".join(lines[:keep])
+        break
+
+    return paragraphs, trailing
+
+
+def _validate_paragraph_output(output: str, source_paragraph: str) -> bool:
+    return evaluate(
+        "paragraph",
+        analyze_text(source_paragraph),
+        analyze_text(output),
+        collect_all=False,
+    ).ok
+
+
+_KEY_TOKEN = re.compile(r"\d+|[^\W\d_]{4,}")
+
+
+def _paragraphs_correspond(source: str, refined: str) -> bool:
+    """
+    Whether refined is plausibly the refinement of source: the same numbers,
+    and at least a third of the source's longer words.
+    """
+    source_tokens = set(_KEY_TOKEN.findall(source.lower()))
+    refined_tokens = set(_KEY_TOKEN.findall(refined.lower()))
+    source_numbers = {t for t in source_tokens if t.isdigit()}
+    if source_numbers != {t for t in refined_tokens if t.isdigit()}:
+        return False
+    words = source_tokens - source_numbers
+    return len(words & refined_tokens) * 3 >= len(words)
+
+
+def _paragraph_pairs(raw_text: str, refined_text: str) -> list[tuple[str, str]]:
+    """
+    (raw, refined) body paragraphs of a refinement, [] unless they pair up.
+
+    Paragraphs are paired by position, which is only safe when every pair
+    still looks alike; a merged plus a split paragraph keep the count equal.
+    """
+    raw_body, _ = _split_body(raw_text)
+    refined_body, _ = _split_body(refined_text)
+    if not raw_body or len(raw_body) != len(refined_body):
+        return []
+    pairs = list(zip(raw_body, refined_body))
+    if not all(_paragraphs_correspond(source, refined) for source, refined in pairs):
+        return []
+    return pairs
+
+
+def _paragraph_context(
+    raw_text: str,
+    signature_name: str | None,
+    signature_title: str | None,
+    analysis: AnalyzedText,
+) -> str:
+    route = "official" if is_official_announcement(raw_text, analysis) else "non_official"
+    return signer_context(signature_name, signature_title, route=route)
+
+
+def _cache_model_paragraphs(
+    raw_text: str,
+    refined_text: str,
+    signature_name: str | None,
+    signature_title: str | None,
+    analysis: AnalyzedText,
+) -> None:
+    """Park the paragraphs of a model refinement for the next incremental round."""
+    context = _paragraph_context(raw_text, signature_name, signature_title, analysis)
+    for source, refined in _paragraph_pairs(raw_text, refined_text):
+        paragraph_cache.put(content_key(source, context), refined)
+
+
+def _assemble_refined(
+    body: list[str],
+    signature_lines: list[str],
+    is_official: bool,
+    signature_name: str | None,
+    signature_title: str | None,
+) -> str:
+    """Rebuild a full announcement around refined body paragraphs."""
+    parts: list[str] = []
+
+    if is_official:
+        if not body or not body[0].lower().startswith("tinahod kong"):
+            parts.append("Tinahod kong mga baryuhanon,")
+        parts.extend(body)
+
+        if any("gipanghinaut" in p.lower() for p in body):
+            parts.append("Daghang salamat.")
+        else:
+            parts.append("Gipanghinaut ko ang inyong 100% nga kooperasyon.\nDaghang salamat.")
+
+        if signature_lines:
+            if _normalize_frame_line(signature_lines[0]) == "kaninyo matinahuron":
+                parts.append(signature_lines[0])
+                signature_lines = signature_lines[1:]
+            if signature_lines:
+                parts.append("\n".join(signature_lines))
+        else:
+            parts.append("Kaninyo matinahuron,")
+            parts.append(f"{signature_name}\n{signature_title}")
+    else:
+        parts.extend(body)
+        if signature_lines:
+            parts.append("\n".join(signature_lines))
+        elif signature_name:
+            parts.append(f"-{signature_name}")
+
+    return "\n\n".join(parts)
+
+
+def refine_incremental(
+    raw_text: str,
+    previous_raw_text: str,
+    previous_refined_text: str,
+    signature_name: str | None = None,
+    signature_title: str | None = None,
+    analysis: AnalyzedText | None = None,
+) -> RefinementResult | None:
+    """
+    Re-refine only the paragraphs that changed since the previous round.
+
+    Unchanged paragraphs come from the paragraph cache, which holds model
+    output only, or else from the previous raw/refined pair. That pair is sent
+    by the client, so its paragraphs serve this call alone and a result that
+    uses any of them is marked not cacheable. Returns None when nothing can be
+    reused or the reassembled document fails validation, so the caller runs a
+    full refine.
+    """
+    analysis = analysis or analyze_text(raw_text)
+    if is_generation_intent(raw_text, analysis):
+        return None
+
+    is_official = is_official_announcement(raw_text, analysis)
+    context = _paragraph_context(raw_text, signature_name, signature_title, analysis)
+    previous = {
+        content_key(source, context): refined
+        for source, refined in _paragraph_pairs(previous_raw_text, previous_refined_text)
+    }
+
+    body, trailing = _split_body(raw_text)
+    if not body:
+        return None
+
+    keys = [content_key(p, context) for p in body]
+    cached = [paragraph_cache.get(key) for key in keys]
+    if all(hit is None and key not in previous for hit, key in zip(cached, keys)):
+        # Nothing reusable; one full call is cheaper than one call per paragraph.
+        return None
+
+    from_client = False
+    refined_body: list[str] = []
+    for paragraph, key, hit in zip(body, keys, cached):
+        if hit is not None:
+            refined_body.append(hit)
+            continue
+        if key in previous:
+            from_client = True
+            refined_body.append(previous[key])
+            continue
+
+        output = call_llm(
+            build_paragraph_refinement_prompt(paragraph, is_official),
+            "paragraph",
+            paragraph,
+        )
+        if not _validate_paragraph_output(output, paragraph):
+            return None
+
+        paragraph_cache.put(key, output)
+        refined_body.append(output)
+
+    signature_lines = [
+        ln for ln in trailing if _normalize_frame_line(ln) not in REBUILT_CLOSING_LINES
+    ]
+    if is_official:
+        final_name, final_title = OFFICIAL_DEFAULT_NAME, OFFICIAL_DEFAULT_TITLE
+    else:
+        final_name, final_title = (signature_name or "").strip() or None, None
+
+    refined = _assemble_refined(
+        refined_body,
+        signature_lines,
+        is_official,
+        signature_name=final_name,
+        signature_title=final_title,
     )
 
+    if not validate_output(refined, is_official, raw_text, analysis):
+        return None
+
+    return RefinementResult(text=refined.strip(), source="incremental", cacheable=not from_client)
+
 
 # ---------------------------
-# 6. FINAL FUNCTION
+# 7. FINAL FUNCTION
 # ---------------------------
+def refinement_cache_key(
+    raw_text: str,
+    signature_name: str | None = None,
+    signature_title: str | None = None,
+) -> str:
+    """Key of a whole refined document in the refinement cache."""
+    return content_key(raw_text, signer_context(signature_name, signature_title))
+
+
+def run_refinement(
+    raw_text: str,
+    signature_name: str | None = None,
+    signature_title: str | None = None,
+    previous_raw_text: str | None = None,
+    previous_refined_text: str | None = None,
+) -> RefinementResult:
+    """
+    Refine one announcement and report where the text came from.
+
+    Model-produced results are parked in the refinement cache; deterministic
+    fallbacks are not, so a later call can still get a model result. Neither
+    are incremental results built on the client's previous refined text,
+    which other callers of the same input must not be served.
+    """
+    cache_key = refinement_cache_key(raw_text, signature_name, signature_title)
+    cached = refinement_cache.get(cache_key)
+    if cached is not None:
+        metrics.increment("refine.source.cache")
+        return RefinementResult(text=cached, source="cache")
+
+    analysis = analyze_text(raw_text)
+    result = None
+    already_formatted = precheck_already_formatted(raw_text, analysis)
+    if already_formatted is not None:
+        result = RefinementResult(text=already_formatted, source="fast_path")
+
+    if result is None and previous_raw_text and previous_refined_text:
+        incremental = refine_incremental(
+            raw_text,
+            previous_raw_text,
+            previous_refined_text,
+            signature_name=signature_name,
+            signature_title=signature_title,
+            analysis=analysis,
+        )
+        if incremental and incremental.text:
+            result = incremental
+
+    if result is None:
+        result = refine_with_retry_result(
+            raw_text,
+            signature_name=signature_name,
+            signature_title=signature_title,
+            analysis=analysis,
+        )
+        result.text = result.text.strip()
+        if result.source == "llm":
+            # The next round of this draft reuses these paragraphs.
+            _cache_model_paragraphs(raw_text, result.text, signature_name, signature_title, analysis)
+
+    metrics.increment(f"refine.source.{result.source}")
+    if result.source != "fallback" and result.cacheable and result.text:
+        refinement_cache.put(cache_key, result.text)
+
+    return result
+
+
 def generate_announcement(
     raw_text: str,
     signature_name: str | None = None,
     signature_title: str | None = None,
+    previous_raw_text: str | None = None,
+    previous_refined_text: str | None = None,
 ) -> str:
-    result = refine_with_retry(
+    return run_refinement(
         raw_text,
         signature_name=signature_name,
         signature_title=signature_title,
-    )
-    return result.strip()
\ No newline at end of file
+        previous_raw_text=previous_raw_text,
+        previous_refined_text=previous_refined_text,
+    ).text
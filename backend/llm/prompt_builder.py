@@ -1,106 +1,21 @@
-import re
 from typing import Optional
 
-
-def _looks_like_name_line(line: str) -> bool:
-    """Heuristic check for plain signature names like 'Junty Bandayanon'."""
-    cleaned = line.strip()
-    if not cleaned:
-        return False
-
-    # Reject obvious sentence-like lines.
-    if any(mark in cleaned for mark in [",", "!", "?"]):
-        return False
-
-    parts = [p for p in cleaned.replace("-", " ").split() if p]
-    if len(parts) < 2 or len(parts) > 5:
-        return False
-
-    # Allow initials and name punctuation.
-    name_token = re.compile(r"^[A-Za-z][A-Za-z\.'-]*$")
-    if not all(name_token.match(p) for p in parts):
-        return False
-
-    # Most name lines are either title-case or all uppercase.
-    if cleaned.isupper():
-        return True
-
-    return all(p[:1].isupper() for p in parts if p[:1].isalpha())
-
-
-def _extract_signature_line(raw_text: str) -> Optional[str]:
-    """Extract a likely existing signature/attribution line from the source text."""
-    lines = [ln.rstrip() for ln in raw_text.splitlines() if ln.strip()]
-    if not lines:
-        return None
-
-    for line in reversed(lines):
-        stripped = line.strip()
-        lower = stripped.lower()
-
-        if lower.startswith(("-", "gikan kang", "from:", "hon.")):
-            return stripped
-
-        if _looks_like_name_line(stripped):
-            return stripped
-
-    return None
+from llm.analysis import AnalyzedText, analyze_text
+from llm.routing import route_official
 
 
 def _build_critical_instruction(
     raw_text: str,
     signature_name: Optional[str] = None,
     signature_title: Optional[str] = None,
+    analysis: Optional[AnalyzedText] = None,
 ) -> str:
-    text = raw_text.lower()
-
-    has_signature = _extract_signature_line(raw_text) is not None
-
-    # Detect OFFICIAL announcements (not just any message that mentions a meeting/event).
-    official_markers = [
-        "hon.",
-        "barangay captain",
-        "municipal mayor",
-        "kapitan",
-        "sangguniang barangay",
-        "office of the barangay captain",
-        "official advisory",
-        "tinahod kong mga baryuhanon",
-        "tinahod kong mga barangayanon",
-        "pahibalo alang sa tanang",
-    ]
-
-    official_event_markers = [
-        "general assembly",
-        "barangay assembly",
-        "public meeting",
-        "community assembly",
-        "official meeting",
-    ]
-
-    barangay_context_markers = [
-        "barangay",
-        "covered court",
-        "barangay hall",
-        "session hall",
-        "residente",
-    ]
-
-    non_official_markers = [
-        "from:",
-        "sk kagawad",
-        "sk chairman",
-        "basketball club",
-    ]
-
-    has_non_official = any(marker in text for marker in non_official_markers)
-    has_authority = any(marker in text for marker in official_markers)
-    has_official_event = any(marker in text for marker in official_event_markers)
-    has_barangay_context = any(marker in text for marker in barangay_context_markers)
-
-    is_official = has_authority or (
-        has_official_event and has_barangay_context and not has_non_official
-    )
+    analysis = analysis or analyze_text(raw_text)
+
+    has_signature = analysis.has_signature
+
+    # Same classifier as prompt routing, so the rules never contradict the chosen prompt.
+    is_official = route_official(analysis).is_official
 
     rules = []
 
@@ -455,6 +370,7 @@ def build_refinement_prompt(
     raw_text: str,
     signature_name: Optional[str] = None,
     signature_title: Optional[str] = None,
+    analysis: Optional[AnalyzedText] = None,
 ) -> str:
     stripped = raw_text.strip()
     final_signature_name = (signature_name or "").strip() or "HON. ALBERTO C. PACHECO"
@@ -463,6 +379,7 @@ def build_refinement_prompt(
         stripped,
         signature_name=final_signature_name,
         signature_title=final_signature_title,
+        analysis=analysis,
     )
 
     return BASE_PROMPT_TEMPLATE.format(
@@ -555,6 +472,48 @@ def build_non_official_refinement_prompt(
     )
 
 
+PARAGRAPH_PROMPT_TEMPLATE = """
+You are the official announcement editor of a Barangay in the Philippines.
+
+You are an EDITOR, not a WRITER.
+You are refining ONE PARAGRAPH taken from a longer announcement.
+The greeting, closing and signature are handled separately.
+
+CRITICAL RULES:
+- Use ONLY information from the paragraph.
+- Do NOT add new information.
+- Do NOT change dates, times, names, or locations.
+- Do NOT translate weekdays
+- Use natural common Cebuano words
+{style_rule}
+- Do NOT add a greeting, closing, or signature (no Tinahod..., Gipanghinaut...,
+  Kaninyo matinahuron, HON., Barangay Captain) unless already in the paragraph.
+- Keep lists as lists and keep the paragraph as ONE paragraph.
+
+OUTPUT FORMAT (STRICT - MUST FOLLOW):
+- Return ONLY the refined paragraph.
+- Do NOT add explanations, notes, or comments.
+- Do NOT include "---".
+
+PARAGRAPH:
+\"\"\"
+{paragraph}
+\"\"\"
+"""
+
+
+def build_paragraph_refinement_prompt(paragraph: str, is_official: bool) -> str:
+    style_rule = (
+        "- Keep the formal tone of an OFFICIAL barangay announcement."
+        if is_official
+        else "- This is NOT an official announcement; keep it a simple community post."
+    )
+    return PARAGRAPH_PROMPT_TEMPLATE.format(
+        paragraph=paragraph.strip(),
+        style_rule=style_rule,
+    )
+
+
 GENERATION_PROMPT_TEMPLATE = """
 You are an expert Barangay announcement writer in Cebuano (Bisaya).
 
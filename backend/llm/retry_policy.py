@@ -0,0 +1,150 @@
+"""
+Adaptive retry policy learned from past validation outcomes.
+
+Every model attempt is recorded as pass/fail under a route class (prompt
+route, input length bucket, and whether the input already has a signature)
+and its attempt number. Before each attempt the pipeline asks whether one more
+call is worth it. If the smoothed pass rate of that attempt number for that
+class is below RETRY_MIN_SUCCESS_RATE, it goes straight to the deterministic
+fallback instead of burning calls that almost always fail validation.
+
+Counts are persisted in a small SQLite file (RETRY_STATS_PATH), so the policy
+survives restarts. Older outcomes are halved once a cell passes
+_WINDOW attempts, so the policy follows prompt and model changes. A small
+share of calls still explores, so a class that starts passing again is
+noticed.
+"""
+
+import logging
+import random
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+from config.ai_settings import RETRY_MIN_SUCCESS_RATE, RETRY_STATS_PATH
+from llm import metrics
+
+logger = logging.getLogger(__name__)
+
+# Prior of 1 pass in 2 attempts; with _MIN_SAMPLES it takes eight straight
+# failures before a cell drops below the default 0.15.
+_PRIOR_PASSES = 1.0
+_PRIOR_ATTEMPTS = 2.0
+# Below this many recorded attempts a cell is never skipped.
+_MIN_SAMPLES = 8
+_WINDOW = 200
+_EXPLORE_RATE = 0.05
+
+
+def _default_stats_path() -> Path:
+    """Writable data path: dev = backend/data; PyInstaller = data/ next to the exe."""
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().parent / "data" / "retry_stats.sqlite3"
+    return Path(__file__).resolve().parent.parent / "data" / "retry_stats.sqlite3"
+
+
+def length_bucket(chars: int) -> str:
+    if chars < 300:
+        return "short"
+    if chars < 1200:
+        return "medium"
+    return "long"
+
+
+def route_class(route: str, chars: int, has_signature: bool) -> str:
+    """Key under which outcomes are pooled, e.g. "official:long:unsigned"."""
+    return f"{route}:{length_bucket(chars)}:{'signed' if has_signature else 'unsigned'}"
+
+
+class RetryStats:
+    """Pass/attempt counts per (route class, attempt number), mirrored to SQLite."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self._lock = threading.Lock()
+        self._cells: dict[tuple[str, int], list[float]] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._open(Path(path))
+
+    def _open(self, path: Path) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS retry_outcomes ("
+                " route_class TEXT NOT NULL,"
+                " attempt INTEGER NOT NULL,"
+                " attempts REAL NOT NULL,"
+                " passes REAL NOT NULL,"
+                " PRIMARY KEY (route_class, attempt))"
+            )
+            for key, attempt, attempts, passes in db.execute(
+                "SELECT route_class, attempt, attempts, passes FROM retry_outcomes"
+            ):
+                self._cells[(key, attempt)] = [attempts, passes]
+            self._db = db
+        except sqlite3.Error as exc:
+            logger.warning("Retry stats kept in memory only (%s): %s", path, exc)
+
+    def record(self, key: str, attempt: int, passed: bool) -> None:
+        with self._lock:
+            cell = self._cells.setdefault((key, attempt), [0.0, 0.0])
+            cell[0] += 1
+            cell[1] += 1 if passed else 0
+            if cell[0] > _WINDOW:
+                cell[0] /= 2
+                cell[1] /= 2
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT INTO retry_outcomes (route_class, attempt, attempts, passes)"
+                    " VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (route_class, attempt)"
+                    " DO UPDATE SET attempts = excluded.attempts, passes = excluded.passes",
+                    (key, attempt, cell[0], cell[1]),
+                )
+            except sqlite3.Error as exc:
+                logger.warning("Could not persist retry outcome: %s", exc)
+
+    def pass_rate(self, key: str, attempt: int) -> tuple[float, float]:
+        """Smoothed pass rate of one attempt number, and how many attempts it is based on."""
+        with self._lock:
+            attempts, passes = self._cells.get((key, attempt), (0.0, 0.0))
+        return (passes + _PRIOR_PASSES) / (attempts + _PRIOR_ATTEMPTS), attempts
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        with self._lock:
+            cells = sorted(self._cells.items())
+        result: dict[str, list[dict]] = {}
+        for (key, attempt), (attempts, passes) in cells:
+            result.setdefault(key, []).append(
+                {"attempt": attempt, "attempts": round(attempts, 1), "passes": round(passes, 1)}
+            )
+        return result
+
+
+retry_stats = RetryStats(Path(RETRY_STATS_PATH) if RETRY_STATS_PATH else _default_stats_path())
+
+
+def should_attempt(key: str, attempt: int, stats: Optional[RetryStats] = None) -> bool:
+    """
+    Whether attempt number `attempt` (0-based) is worth a model call.
+
+    The caller still bounds attempts with its own max_retries.
+    """
+    stats = stats or retry_stats
+    rate, samples = stats.pass_rate(key, attempt)
+    if samples < _MIN_SAMPLES or rate >= RETRY_MIN_SUCCESS_RATE:
+        return True
+    if random.random() < _EXPLORE_RATE:
+        metrics.increment("retry.explored")
+        return True
+    metrics.increment(f"retry.skipped.{key.split(':', 1)[0]}")
+    return False
+
+
+def record_attempt(key: str, attempt: int, passed: bool) -> None:
+    retry_stats.record(key, attempt, passed)
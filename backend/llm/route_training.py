@@ -0,0 +1,101 @@
+"""
+Offline training for the official vs non-official route classifier.
+
+Reads the labeled corpus (llm/route_corpus.jsonl, one {"text", "official"}
+object per line), reports a leave-one-out accuracy next to the keyword rules,
+and writes the weights loaded by llm.routing:
+
+    python -m llm.route_training
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from llm.analysis import analyze_text
+from llm.markers import classify_official
+from llm.routing import FEATURE_DIM, WEIGHTS_PATH, RouteClassifier, feature_indices, np
+
+CORPUS_PATH = Path(__file__).resolve().parent / "route_corpus.jsonl"
+
+
+def load_corpus(path: Optional[Path] = None) -> list[tuple[str, bool]]:
+    rows = []
+    with open(path or CORPUS_PATH, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                rows.append((row["text"], bool(row["official"])))
+    return rows
+
+
+def _design_matrix(texts: Sequence[str]) -> "np.ndarray":
+    matrix = np.zeros((len(texts), FEATURE_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        indices = feature_indices(analyze_text(text).tokens)
+        if len(indices):
+            np.add.at(matrix[row], indices, 1.0 / math.sqrt(len(indices)))
+    return matrix
+
+
+def train(
+    texts: Sequence[str],
+    labels: Sequence[bool],
+    epochs: int = 400,
+    learning_rate: float = 4.0,
+    l2: float = 1e-4,
+) -> RouteClassifier:
+    """Full-batch gradient descent with class-balanced weights."""
+    x = _design_matrix(texts)
+    y = np.asarray(labels, dtype=np.float32)
+    positives = max(float(y.sum()), 1.0)
+    negatives = max(float(len(y) - y.sum()), 1.0)
+    sample_weight = np.where(y == 1.0, len(y) / (2 * positives), len(y) / (2 * negatives))
+
+    weights = np.zeros(FEATURE_DIM, dtype=np.float32)
+    bias = 0.0
+    for _ in range(epochs):
+        p = 1.0 / (1.0 + np.exp(-(x @ weights + bias)))
+        error = (p - y) * sample_weight / len(y)
+        weights -= learning_rate * (x.T @ error + l2 * weights)
+        bias -= learning_rate * float(error.sum())
+    return RouteClassifier(weights.astype(np.float32), bias)
+
+
+def main() -> None:
+    if np is None:
+        raise SystemExit("NumPy is required to train the route classifier.")
+
+    rows = load_corpus()
+    texts = [text for text, _ in rows]
+    labels = [label for _, label in rows]
+
+    # Leave-one-out estimate against the keyword rules on the same corpus.
+    correct = keyword_correct = 0
+    for held_out in range(len(rows)):
+        keep = [i for i in range(len(rows)) if i != held_out]
+        model = train([texts[i] for i in keep], [labels[i] for i in keep], epochs=150)
+        tokens = analyze_text(texts[held_out]).tokens
+        correct += (model.probability(tokens) >= 0.5) == labels[held_out]
+        keyword_correct += classify_official(analyze_text(texts[held_out]).marker_hits) == labels[held_out]
+    print(f"leave-one-out accuracy: classifier {correct / len(rows):.1%}, keyword rules {keyword_correct / len(rows):.1%}")
+
+    model = train(texts, labels)
+    np.save(WEIGHTS_PATH, np.append(model.weights, np.float32(model.bias)).astype(np.float32))
+    print(f"Wrote {WEIGHTS_PATH} ({len(rows)} examples)")
+
+    tokens = analyze_text(texts[0]).tokens
+    started = time.perf_counter()
+    for _ in range(1000):
+        model.probability(tokens)
+    single_us = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    model.probabilities(texts)
+    batch_us = (time.perf_counter() - started) / len(texts) * 1e6
+    print(f"scoring: {single_us:.0f} us per text, {batch_us:.0f} us per text in a batch of {len(texts)} (tokenizing included)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Official vs non-official routing.
+
+The keyword rules in llm.markers stay in charge whenever a text carries a
+strong signal (authority or explicit non-official markers). For everything
+else a small logistic-regression model over hashed word unigrams, word
+bigrams and character trigrams gives a probability, and it decides the route
+when it is confident. Without NumPy or the weights file the keyword rules
+decide alone.
+
+Weights ship as config/route_classifier.npy (float32, bias last). Retrain
+them from the labeled corpus in llm/route_corpus.jsonl with:
+
+    python -m llm.route_training
+"""
+
+import logging
+import math
+import sys
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+from config.ai_settings import ROUTE_CLASSIFIER_MARGIN
+from llm import metrics
+from llm.analysis import AnalyzedText, analyze_text
+from llm.markers import NON_OFFICIAL_MARKERS, OFFICIAL_AUTHORITY_MARKERS, any_hit, classify_official
+
+try:
+    import numpy as np
+except ImportError:  # Optional: routing falls back to the keyword rules.
+    np = None
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DIM = 1 << 14
+_MIX = 40503  # odd multiplier spreading n-gram ids over the feature slots
+_SYMBOLS = bytes.maketrans(b" abcdefghijklmnopqrstuvwxyz", bytes(range(27)))
+
+_BASE = Path(__file__).resolve().parent.parent
+
+
+def _weights_path() -> Path:
+    """Config path: dev = backend root; PyInstaller = bundle root or next to exe."""
+    candidate = _BASE / "config" / "route_classifier.npy"
+    if candidate.exists() or not getattr(sys, "frozen", False):
+        return candidate
+    return Path(sys.executable).resolve().parent / "config" / "route_classifier.npy"
+
+
+WEIGHTS_PATH = _weights_path()
+
+
+def feature_indices(tokens: Sequence[str]) -> "np.ndarray":
+    """
+    Hashed feature slots for one tokenized, lowercased text; repeated n-grams
+    repeat their slot, so the weight lookup sums term counts.
+    """
+    if not tokens:
+        return np.zeros(0, dtype=np.int64)
+
+    mask = FEATURE_DIM - 1
+    words = np.fromiter(
+        (zlib.crc32(token.encode()) for token in tokens), dtype=np.int64, count=len(tokens)
+    )
+    bigrams = (words[:-1] * 31 + words[1:]) * _MIX + 1
+    codes = np.frombuffer(
+        f" {' '.join(tokens)} ".encode("ascii").translate(_SYMBOLS), dtype=np.uint8
+    ).astype(np.int64)
+    trigrams = (codes[:-2] * 729 + codes[1:-1] * 27 + codes[2:]) * _MIX + 2
+    return np.concatenate((words & mask, bigrams & mask, trigrams & mask))
+
+
+class RouteClassifier:
+    """Hashed n-gram logistic regression giving P(official)."""
+
+    __slots__ = ("weights", "bias")
+
+    def __init__(self, weights: "np.ndarray", bias: float) -> None:
+        self.weights = weights
+        self.bias = float(bias)
+
+    def probability(self, tokens: Sequence[str]) -> float:
+        indices = feature_indices(tokens)
+        if not len(indices):
+            return 1.0 / (1.0 + math.exp(-self.bias))
+        logit = self.bias + float(self.weights[indices].sum()) / math.sqrt(len(indices))
+        return 1.0 / (1.0 + math.exp(-logit))
+
+    def probabilities(self, texts: Sequence[str]) -> "np.ndarray":
+        """P(official) for many texts with one vectorized weight lookup."""
+        groups = [feature_indices(analyze_text(text).tokens) for text in texts]
+        sizes = np.array([len(g) for g in groups], dtype=np.int64)
+        logits = np.full(len(groups), self.bias, dtype=np.float64)
+        nonempty = sizes > 0
+        if nonempty.any():
+            flat = np.concatenate([g for g in groups if len(g)])
+            offsets = np.concatenate(([0], np.cumsum(sizes[nonempty])[:-1]))
+            sums = np.add.reduceat(self.weights[flat], offsets)
+            logits[nonempty] += sums / np.sqrt(sizes[nonempty])
+        return 1.0 / (1.0 + np.exp(-logits))
+
+
+def load_route_classifier(path: Optional[Path] = None) -> Optional[RouteClassifier]:
+    if np is None:
+        logger.warning("NumPy not installed; official routing uses the keyword rules only")
+        return None
+    path = path or WEIGHTS_PATH
+    if not Path(path).exists():
+        logger.warning("Route classifier %s not found; official routing uses the keyword rules only", path)
+        return None
+    try:
+        data = np.load(path)
+    except (OSError, ValueError) as exc:
+        logger.warning("Route classifier not loaded: %s", exc)
+        return None
+    if data.shape != (FEATURE_DIM + 1,):
+        logger.warning("Route classifier %s has unexpected shape %s", path, data.shape)
+        return None
+    return RouteClassifier(data[:-1].astype(np.float32), float(data[-1]))
+
+
+_classifier = load_route_classifier()
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """Which prompt family a text is routed to, and why."""
+
+    is_official: bool
+    probability: Optional[float]  # classifier P(official), None when unavailable
+    source: str  # "keyword" or "classifier"
+
+
+def route_official(analysis: AnalyzedText) -> RouteDecision:
+    """Route once per analyzed text; later calls reuse the stored decision."""
+    if analysis.route is not None:
+        return analysis.route
+
+    hits = analysis.marker_hits
+    keyword_decision = classify_official(hits)
+    probability = _classifier.probability(analysis.tokens) if _classifier is not None else None
+    strong_signal = any_hit(hits, OFFICIAL_AUTHORITY_MARKERS) or any_hit(hits, NON_OFFICIAL_MARKERS)
+
+    if (
+        probability is not None
+        and not strong_signal
+        and abs(probability - 0.5) >= ROUTE_CLASSIFIER_MARGIN
+    ):
+        decision = RouteDecision(probability >= 0.5, probability, "classifier")
+        if decision.is_official != keyword_decision:
+            metrics.increment("route.classifier_override")
+    else:
+        decision = RouteDecision(keyword_decision, probability, "keyword")
+
+    metrics.increment(f"route.source.{decision.source}")
+    analysis.route = decision
+    return decision
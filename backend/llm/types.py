@@ -4,7 +4,7 @@ Type definitions for the LLM gateway module.
 Provides dataclasses for generation requests, results, and validation results.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
@@ -14,6 +14,8 @@ class GenerationRequest:
 
     prompt: str
     temperature: float = 0.0
+    max_tokens: Optional[int] = None
+    stop: Optional[list[str]] = None
 
 
 @dataclass
@@ -26,6 +28,9 @@ class GenerationResult:
     model: Optional[str] = None
     error: Optional[str] = None
     latency_ms: Optional[int] = None
+    finish_reason: Optional[str] = None  # "stop", "length", ... as reported by the provider
+    stop_sequence: Optional[str] = None  # matched stop sequence, when the provider reports it
+    completion_tokens: Optional[int] = None
 
 
 @dataclass
@@ -34,3 +39,13 @@ class ValidationResult:
 
     ok: bool
     reason: Optional[str] = None
+    reasons: list[str] = field(default_factory=list)
+
+
+@dataclass
+class RefinementResult:
+    """Final refined text and how it was produced."""
+
+    text: str
+    source: str  # "llm", "incremental", "fast_path", "cache" or "fallback"
+    cacheable: bool = True  # False when built on text the client sent
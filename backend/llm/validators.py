@@ -1,254 +1,417 @@
 """
 Validators for LLM-generated refinement output.
 
-Provides heuristic validation to ensure refined announcements maintain quality
-and preserve critical information from the source text.
+Every check is a declarative Rule in RULES, tagged with the validation
+profiles it belongs to. The table is compiled once at import into one rule
+tuple per profile. A validation then analyzes the source and the output once
+(see llm.analysis) and runs the profile's rules over those shared analyses,
+collecting every failure reason.
 """
 
 import re
-from typing import Optional
-
+import string
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from llm.analysis import AnalyzedText, analyze_text
+from llm.entities import format_date, format_time, missing_dates, missing_places, missing_times
+from llm.markers import (
+    INJECTED_OFFICIAL_MARKERS,
+    PARAGRAPH_FRAME_MARKERS,
+    PROMPT_ECHO_MARKERS,
+    SIGNER_TITLE_MARKERS,
+    any_hit,
+)
 from llm.types import ValidationResult
 
-
-def validate_refinement(source_text: str, refined_text: str) -> ValidationResult:
+GENERATION_PLACEHOLDERS = [
+    "[Petsa]",
+    "[Oras]",
+    "[Lugar/Covered Court]",
+]
+
+# Profiles:
+#   official / non_official - full model refinement, by announcement type
+#   generation              - drafts generated from an instruction
+#   paragraph               - one body paragraph from incremental refinement
+#   refinement              - preservation checks of validate_refinement
+PROFILES = ("official", "non_official", "generation", "paragraph", "refinement")
+_REFINED_OUTPUT = ("official", "non_official", "generation", "paragraph")
+_PRESERVING = ("official", "non_official", "paragraph", "refinement")
+
+_HON_WORD = re.compile(r"\bhon\.")
+_MALFORMED_PLACEHOLDER = re.compile(r"\[[^\]]{0,2}\]")
+_INSTRUCTION_VERBS = frozenset({"create", "make", "write", "generate", "draft"})
+_HON_LINE = re.compile(r"^HON\.\s*", re.MULTILINE | re.IGNORECASE)
+_GIKAN_LINE = re.compile(r"^Gikan\s+kang[:\s]", re.MULTILINE | re.IGNORECASE)
+_GIKAN_ANYWHERE = re.compile(r"Gikan\s+kang", re.IGNORECASE)
+# Only the fixed "Gikan kang:" prefix is a regex; the name after it is read by
+# _sender_name_line, which touches every character once. The former
+# lazy-quantifier pattern rescanned to the end of the line for every prefix.
+_GIKAN_PREFIX = re.compile(r"gikan\s+kang[:\s]+", re.IGNORECASE)
+_ASCII_UPPER = frozenset(string.ascii_uppercase)
+_NAME_START = frozenset(string.ascii_letters)
+_NAME_CHARS = frozenset(string.ascii_letters + ".")
+_HON_NAME = re.compile(r"HON\.\s+([A-Z][A-Z\s\.]+[A-Z])")
+_PRESERVED_TITLES = (
+    (re.compile(r"Barangay\s+Captain", re.IGNORECASE), "'Barangay Captain' title not preserved"),
+    (re.compile(r"Municipal\s+Mayor", re.IGNORECASE), "'Municipal Mayor' title not preserved"),
+)
+
+
+def _has_uppercase_sender(text: str) -> bool:
+    """True if some "Gikan kang:" prefix is followed by a capitalized name."""
+    return any(
+        m.end() < len(text) and text[m.end()] in _ASCII_UPPER for m in _GIKAN_PREFIX.finditer(text)
+    )
+
+
+def _sender_name_line(text: str) -> Optional[str]:
     """
-    Validate that refined text meets quality and preservation requirements.
+    Name after the first "Gikan kang:" whose rest of line is only letters,
+    dots and whitespace, or None. Matches the former lazy-regex search.
+    """
+    bad_at = -1
+    for m in _GIKAN_PREFIX.finditer(text):
+        start = m.end()
+        if start >= len(text) or text[start] not in _NAME_START:
+            continue
+        # A rejecting character already seen further along this line rejects this name too.
+        if start <= bad_at:
+            continue
+        # Names are at least two characters; the second may be the line break itself.
+        if start + 1 >= len(text):
+            continue
+        second = text[start + 1]
+        if second not in _NAME_CHARS and not second.isspace():
+            continue
+        end = start + 2
+        while end < len(text) and text[end] != "\n":
+            ch = text[end]
+            if ch not in _NAME_CHARS and not ch.isspace():
+                bad_at = end
+                break
+            end += 1
+        else:
+            return text[start:end]
+    return None
 
-    Checks:
-    - Refined text is not empty
-    - Refined text is not too short (less than 35% of source length)
-    - Preserves numeric tokens (dates, times)
-    - Preserves sender/creator attribution
 
-    Args:
-        source_text: The original raw announcement text.
-        refined_text: The LLM-generated refined text.
+class ValidationContext:
+    """Source and output analyses shared by every rule of one validation."""
 
-    Returns:
-        ValidationResult indicating if refinement is acceptable.
+    __slots__ = ("source", "output")
+
+    def __init__(self, source: AnalyzedText, output: AnalyzedText) -> None:
+        self.source = source
+        self.output = output
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    One validation check.
+
+    check returns a failure reason, or None when the output passes. When a
+    rule marked stop fails, no further rules are evaluated.
     """
-    if not refined_text or not refined_text.strip():
-        return ValidationResult(ok=False, reason="Refined text is empty")
 
-    refined_clean = refined_text.strip()
-    source_clean = source_text.strip()
+    name: str
+    profiles: tuple[str, ...]
+    check: Callable[[ValidationContext], Optional[str]]
+    stop: bool = False
+
+
+# ---------------------------
+# Output shape
+# ---------------------------
+def _non_empty(ctx: ValidationContext) -> Optional[str]:
+    if not ctx.output.stripped:
+        return "Refined text is empty"
+    return None
 
-    # Check minimum length (35% of source)
-    min_length = len(source_clean) * 0.35
-    if len(refined_clean) < min_length:
-        return ValidationResult(
-            ok=False, reason="Refined text too short (less than 35% of source)"
-        )
 
-    # Check for preserved dates and times
-    date_issues = _check_dates_preserved(source_clean, refined_clean)
-    if date_issues:
-        return ValidationResult(ok=False, reason=f"Dates/times not preserved: {date_issues}")
+def _no_divider_prefix(ctx: ValidationContext) -> Optional[str]:
+    if ctx.output.text.startswith("---"):
+        return "Output starts with a divider"
+    return None
 
-    # Check for preserved sender attribution
-    attribution_issues = _check_attribution_preserved(source_clean, refined_clean)
-    if attribution_issues:
-        return ValidationResult(ok=False, reason=f"Attribution not preserved: {attribution_issues}")
 
-    # Check for signature hallucination (added signature when none existed)
-    hallucination_issues = _check_signature_hallucination(source_clean, refined_clean)
-    if hallucination_issues:
-        return ValidationResult(ok=False, reason=f"Hallucination detected: {hallucination_issues}")
+def _no_note(ctx: ValidationContext) -> Optional[str]:
+    if "note:" in ctx.output.marker_hits:
+        return "Output contains a model note"
+    return None
 
-    # Check for signature modification (signature was changed when it shouldn't be)
-    modification_issues = _check_signature_modification(source_clean, refined_clean)
-    if modification_issues:
-        return ValidationResult(ok=False, reason=f"Signature modified: {modification_issues}")
 
-    return ValidationResult(ok=True, reason=None)
+def _no_prompt_echo(ctx: ValidationContext) -> Optional[str]:
+    if any_hit(ctx.output.marker_hits, PROMPT_ECHO_MARKERS):
+        return "Output echoes the prompt"
+    return None
 
 
-def _check_dates_preserved(source: str, refined: str) -> Optional[str]:
-    """
-    Check that obvious date and time tokens from source are preserved in refined text.
+def _min_length(ctx: ValidationContext) -> Optional[str]:
+    if len(ctx.output.stripped) < len(ctx.source.stripped) * 0.35:
+        return "Refined text too short (less than 35% of source)"
+    return None
 
-    Looks for:
-    - Years like 2025, 2026
-    - Times like 8:00, 3, alas 3
-    - Month/day patterns
-    """
-    # Extract years (4-digit numbers that look like years)
-    year_pattern = r"\b(20[0-9]{2})\b"
-    years_in_source = set(re.findall(year_pattern, source))
-    years_in_refined = set(re.findall(year_pattern, refined))
 
-    missing_years = years_in_source - years_in_refined
-    if missing_years:
-        return f"Year(s) {', '.join(sorted(missing_years))} missing"
+# ---------------------------
+# Announcement structure
+# ---------------------------
+def _official_structure(ctx: ValidationContext) -> Optional[str]:
+    required = ["tinahod kong", "gipanghinaut"]
+    if not ctx.source.has_signature:
+        required.append("kaninyo matinahuron")
+
+    missing = [marker for marker in required if marker not in ctx.output.marker_hits]
+    if missing:
+        return f"Official structure missing: {', '.join(missing)}"
+    return None
+
 
-    # Extract time patterns (e.g., 8:00, 3:30, alas 3)
-    time_patterns = [
-        r"\b(?:alas\s+)?([1-9]|1[0-2])(?::([0-5]\d))?\s*(?:sa\s+(?:buntag|hapon)|ngadto|ngadtu)?\b",
+def _official_closing(ctx: ValidationContext) -> Optional[str]:
+    # Accept either standard closing or preserved sender attribution.
+    hits = ctx.output.marker_hits
+    if "kaninyo matinahuron" in hits or "gikan kang" in hits:
+        return None
+    if "hon." in hits and _HON_WORD.search(ctx.output.lower):
+        return None
+    return "Official closing or signature missing"
+
+
+def _no_injected_official(ctx: ValidationContext) -> Optional[str]:
+    # Non-official messages must not be converted into official signature format
+    # unless those markers were already present in the input.
+    injected = [
+        marker
+        for marker in INJECTED_OFFICIAL_MARKERS
+        if marker in ctx.output.marker_hits and marker not in ctx.source.marker_hits
     ]
+    if injected:
+        return f"Official markers added to non-official post: {', '.join(injected)}"
+    return None
+
+
+def _generation_structure(ctx: ValidationContext) -> Optional[str]:
+    # Must look like a proper barangay draft structure, not a loose sentence.
+    hits = ctx.output.marker_hits
+    if "tinahod kong" not in hits or "kaninyo matinahuron" not in hits:
+        return "Generated draft lacks barangay structure"
+    return None
+
 
-    for pattern in time_patterns:
-        times_in_source = set(re.findall(pattern, source, re.IGNORECASE))
-        times_in_refined = set(re.findall(pattern, refined, re.IGNORECASE))
-        # Check for partial matches (first group is the hour)
-        source_hours = set(m[0] if isinstance(m, tuple) else m for m in times_in_source)
-        refined_hours = set(m[0] if isinstance(m, tuple) else m for m in times_in_refined)
+def _no_instruction_echo(ctx: ValidationContext) -> Optional[str]:
+    if _INSTRUCTION_VERBS & ctx.output.token_set and "announc" in ctx.output.lower:
+        return "Generated draft echoes the instruction"
+    return None
 
-        missing_hours = source_hours - refined_hours
-        if missing_hours and len(source_hours) > 0:
-            # Only report if there were explicit hours in source
-            pass  # Be lenient with time preservation
 
+def _placeholders_well_formed(ctx: ValidationContext) -> Optional[str]:
+    text = ctx.output.text
+    if "[" in text and "]" in text and _MALFORMED_PLACEHOLDER.search(text):
+        return "Generated draft has malformed placeholders"
     return None
 
 
-def _check_attribution_preserved(source: str, refined: str) -> Optional[str]:
-    """
-    Check that sender/creator attribution is preserved.
+def _placeholders_present(ctx: ValidationContext) -> Optional[str]:
+    # If source instruction does not include specific date/time/location,
+    # output should contain placeholders.
+    source = ctx.source
+    if source.has_date_hint and source.has_time_hint and source.has_place_hint:
+        return None
+    if not all(ph in ctx.output.text for ph in GENERATION_PLACEHOLDERS):
+        return "Generated draft is missing date/time/place placeholders"
+    return None
 
-    Looks for:
-    - Lines beginning with HON.
-    - "Gikan kang:" patterns
-    - "Barangay Captain" titles
-    - All-caps names with periods (initials)
+
+def _no_paragraph_frame(ctx: ValidationContext) -> Optional[str]:
+    added = [
+        marker
+        for marker in PARAGRAPH_FRAME_MARKERS
+        if marker in ctx.output.marker_hits and marker not in ctx.source.marker_hits
+    ]
+    if added:
+        return f"Paragraph introduced frame markers: {', '.join(added)}"
+    return None
+
+
+# ---------------------------
+# Preservation
+# ---------------------------
+def _dates_preserved(ctx: ValidationContext) -> Optional[str]:
+    # Entities are normalized, so reformatting (7:30am -> alas 7:30 sa buntag,
+    # July 21 -> Hulyo 21) passes while a changed day, hour or year does not.
+    source = ctx.source.entities
+    output = ctx.output.entities
+    missing_years = source.years - output.years
+    if missing_years:
+        return f"Dates/times not preserved: Year(s) {', '.join(sorted(missing_years))} missing"
+    dates = missing_dates(source, output)
+    if dates:
+        return f"Dates/times not preserved: Date(s) {', '.join(map(format_date, dates))} missing"
+    times = missing_times(source, output)
+    if times:
+        return f"Dates/times not preserved: Time(s) {', '.join(map(format_time, times))} missing"
+    return None
+
+
+def _places_preserved(ctx: ValidationContext) -> Optional[str]:
+    places = missing_places(ctx.source.entities, ctx.output.entities)
+    if places:
+        return f"Places not preserved: {', '.join(places)} missing"
+    return None
+
+
+def _attribution_preserved(ctx: ValidationContext) -> Optional[str]:
+    source = ctx.source.stripped
+    refined = ctx.output.stripped
+
+    if _HON_LINE.search(source) and "hon." not in ctx.output.marker_hits:
+        return "Attribution not preserved: HON. prefix not preserved"
+
+    if _GIKAN_LINE.search(source) and not _GIKAN_ANYWHERE.search(refined):
+        return "Attribution not preserved: Sender attribution 'Gikan kang' not preserved"
+
+    for pattern, reason in _PRESERVED_TITLES:
+        if pattern.search(source) and not pattern.search(refined):
+            return f"Attribution not preserved: {reason}"
+
+    # All-caps names with initials (e.g., HON. ALBERTO C. PACHECO): at least one
+    # significant part of the name must survive.
+    for name in _HON_NAME.findall(source):
+        significant_parts = [p for p in name.replace(".", " ").split() if len(p) > 1]
+        if significant_parts and not any(part in refined for part in significant_parts):
+            return f"Attribution not preserved: Name '{name}' not preserved in refined text"
+
+    return None
+
+
+def _no_signature_hallucination(ctx: ValidationContext) -> Optional[str]:
     """
-    refined_lower = refined.lower()
-
-    # Check HON. pattern
-    if re.search(r"^HON\.\s*", source, re.MULTILINE | re.IGNORECASE):
-        if not re.search(r"HON\.\s*", refined, re.IGNORECASE):
-            return "HON. prefix not preserved"
-
-    # Check Gikan kang pattern
-    if re.search(r"^Gikan\s+kang[:\s]", source, re.MULTILINE | re.IGNORECASE):
-        if not re.search(r"Gikan\s+kang", refined, re.IGNORECASE):
-            return "Sender attribution 'Gikan kang' not preserved"
-
-    # Check Barangay Captain
-    if re.search(r"Barangay\s+Captain", source, re.IGNORECASE):
-        if not re.search(r"Barangay\s+Captain", refined, re.IGNORECASE):
-            return "'Barangay Captain' title not preserved"
-
-    # Check Municipal Mayor
-    if re.search(r"Municipal\s+Mayor", source, re.IGNORECASE):
-        if not re.search(r"Municipal\s+Mayor", refined, re.IGNORECASE):
-            return "'Municipal Mayor' title not preserved"
-
-    # Check for all-caps names with initials (e.g., HON. ALBERTO C. PACHECO)
-    # Look for patterns like HON. NAME X. NAME
-    name_pattern = r"HON\.\s+([A-Z][A-Z\s\.]+[A-Z])"
-    names_in_source = re.findall(name_pattern, source)
-    for name in names_in_source:
-        # Check if some part of the name is preserved
-        name_parts = name.replace(".", " ").split()
-        significant_parts = [p for p in name_parts if len(p) > 1]
-        if significant_parts:
-            # At least one significant name part should be preserved
-            found = any(part in refined for part in significant_parts)
-            if not found:
-                return f"Name '{name}' not preserved in refined text"
-
-    return None
-
-
-def _check_signature_hallucination(source: str, refined: str) -> Optional[str]:
+    Flag a fabricated signature block; harmless single closings such as
+    "daghang salamat" or "kinasingkasing" are not hallucinations.
     """
-    Check if the model hallucinated a COMPLETE SIGNATURE BLOCK that wasn't in the original.
+    source_hits = ctx.source.marker_hits
+    refined_hits = ctx.output.marker_hits
 
-    Focus on FABRICATED OFFICIAL SIGNATURES (multiple elements together):
-    - "Kaninyo matinahuron" + "HON." + "Barangay Captain" (all 3 = fake official signature)
-    - "Gikan kang:" + name that doesn't exist in input
+    has_hon = "hon." in refined_hits
+    has_title = any_hit(refined_hits, SIGNER_TITLE_MARKERS)
+    had_title_in_source = any_hit(source_hits, SIGNER_TITLE_MARKERS)
 
-    IGNORES harmless single elements:
-    - "daghang salamat" alone (common polite closing)
-    - "kinasingkasing" alone
-    - Natural reformatting (7:30am → alas 7:30 sa buntag)
-    """
-    source_lower = source.lower()
-    refined_lower = refined.lower()
+    # Fabricated official signature block (matinahuron + HON. + title).
+    if "matinahuron" in refined_hits and has_hon and has_title:
+        if not ("matinahuron" in source_hits or "hon." in source_hits or had_title_in_source):
+            return "Hallucination detected: Added complete official signature block not present in input"
 
-    # Count signature elements in output
-    has_matinahuron = "matinahuron" in refined_lower
-    has_hon = "hon." in refined_lower
-    has_gikan_kang = "gikan kang" in refined_lower
+    # Fabricated "Gikan kang: NAME" attribution.
+    if "gikan kang" in refined_hits and "gikan kang" not in source_hits:
+        if _has_uppercase_sender(ctx.output.stripped):
+            return "Hallucination detected: Added 'Gikan kang:' attribution with name not present in input"
 
-    titles = ["barangay captain", "municipal mayor", "kapitan"]
-    has_title = any(title in refined_lower for title in titles)
-    had_title_in_source = any(title in source_lower for title in titles)
+    # Added HON. prefix together with a title.
+    if has_hon and "hon." not in source_hits and has_title and not had_title_in_source:
+        return "Hallucination detected: Added HON. prefix with title not present in input"
 
-    # HALLUCINATION CASE 1: Fabricated official signature block
-    # (matinahuron + HON. + title) when input had none of these
-    if has_matinahuron and has_hon and has_title:
-        if not ("matinahuron" in source_lower or "hon." in source_lower or had_title_in_source):
-            return "Added complete official signature block not present in input"
+    return None
+
+
+def _signature_unchanged(ctx: ValidationContext) -> Optional[str]:
+    source_hits = ctx.source.marker_hits
+    refined_hits = ctx.output.marker_hits
 
-    # HALLUCINATION CASE 2: Fabricated "Gikan kang" with name when not in input
-    if has_gikan_kang and not ("gikan kang" in source_lower):
-        # Check if it added a specific name pattern (not just the phrase)
-        # Look for "Gikan kang: NAME" or "Gikan kang NAME"
-        gikan_pattern = r"gikan\s+kang[:\s]+([A-Z][A-Za-z\s\.]+)"
-        matches = re.findall(gikan_pattern, refined_lower)
-        if matches:
-            return "Added 'Gikan kang:' attribution with name not present in input"
+    had_hon = "hon." in source_hits
+    if had_hon and "hon." not in refined_hits:
+        return "Signature modified: Removed HON. prefix that was present in source"
+
+    source_title = next((t for t in SIGNER_TITLE_MARKERS if t in source_hits), None)
+    refined_title = next((t for t in SIGNER_TITLE_MARKERS if t in refined_hits), None)
+    if source_title and refined_title and source_title != refined_title:
+        return f"Signature modified: Changed title from '{source_title}' to '{refined_title}'"
 
-    # HALLUCINATION CASE 3: Added HON. prefix (strong signal of fake official)
-    # Only flag if input had no HON. and no title already
-    if has_hon and not ("hon." in source_lower):
-        if has_title and not had_title_in_source:
-            return "Added HON. prefix with title not present in input"
+    source_name = _sender_name_line(ctx.source.stripped)
+    refined_name = _sender_name_line(ctx.output.stripped)
+    if source_name is not None and refined_name is not None:
+        source_name = source_name.strip()
+        refined_name = refined_name.strip()
+        # Names should be very similar (allow minor formatting changes).
+        if re.sub(r"[^a-z]", "", source_name.lower()) != re.sub(r"[^a-z]", "", refined_name.lower()):
+            return f"Signature modified: Changed sender name from '{source_name}' to '{refined_name}'"
 
-    # NOT HALLUCINATION (acceptable normalization):
-    # - "daghang salamat" alone
-    # - Time reformatting (7:30am → alas 7:30 sa buntag)
-    # - Grammar fixes
-    # - Spelling corrections
+    if "matinahuron" not in source_hits and "matinahuron" in refined_hits and (had_hon or source_title):
+        return "Signature modified: Added 'Kaninyo matinahuron' to existing signature"
 
     return None
 
 
-def _check_signature_modification(source: str, refined: str) -> Optional[str]:
+RULES: tuple[Rule, ...] = (
+    Rule("non_empty", PROFILES, _non_empty, stop=True),
+    Rule("no_divider_prefix", _REFINED_OUTPUT, _no_divider_prefix),
+    Rule("no_note", ("official", "non_official", "paragraph"), _no_note),
+    Rule("no_prompt_echo", _REFINED_OUTPUT, _no_prompt_echo),
+    Rule("min_length", ("refinement",), _min_length),
+    Rule("official_structure", ("official",), _official_structure),
+    Rule("official_closing", ("official",), _official_closing),
+    Rule("no_injected_official", ("non_official",), _no_injected_official),
+    Rule("generation_structure", ("generation",), _generation_structure),
+    Rule("no_instruction_echo", ("generation",), _no_instruction_echo),
+    Rule("placeholders_well_formed", ("generation",), _placeholders_well_formed),
+    Rule("placeholders_present", ("generation",), _placeholders_present),
+    Rule("no_paragraph_frame", ("paragraph",), _no_paragraph_frame),
+    Rule("dates_preserved", _PRESERVING, _dates_preserved),
+    Rule("places_preserved", _PRESERVING, _places_preserved),
+    Rule("attribution_preserved", ("refinement",), _attribution_preserved),
+    Rule("no_signature_hallucination", ("refinement",), _no_signature_hallucination),
+    Rule("signature_unchanged", ("refinement",), _signature_unchanged),
+)
+
+_COMPILED: dict[str, tuple[Rule, ...]] = {
+    profile: tuple(rule for rule in RULES if profile in rule.profiles) for profile in PROFILES
+}
+
+
+def evaluate(
+    profile: str,
+    source: AnalyzedText,
+    output: AnalyzedText,
+    collect_all: bool = True,
+) -> ValidationResult:
     """
-    Check if an existing signature was improperly modified.
+    Run one profile's rules over analyzed source and output text.
 
-    If source has signature, ensure it is NOT modified:
-    - Name unchanged
-    - No HON. added if not present
-    - No extra titles added
+    With collect_all=False evaluation stops at the first failure, which is
+    all the pipeline needs to decide whether to retry.
     """
-    source_lower = source.lower()
-    refined_lower = refined.lower()
+    ctx = ValidationContext(source, output)
+    reasons: list[str] = []
+    for rule in _COMPILED[profile]:
+        reason = rule.check(ctx)
+        if reason is None:
+            continue
+        reasons.append(reason)
+        if rule.stop or not collect_all:
+            break
 
-    # Check 1: If source has HON., refined must also have it
-    had_hon = "hon." in source_lower
-    has_hon = "hon." in refined_lower
-    if had_hon and not has_hon:
-        return "Removed HON. prefix that was present in source"
+    if reasons:
+        return ValidationResult(ok=False, reason=reasons[0], reasons=reasons)
+    return ValidationResult(ok=True)
 
-    # Check 2: If source has title, refined must preserve same title
-    titles = ["barangay captain", "municipal mayor", "kapitan"]
-    source_title = next((t for t in titles if t in source_lower), None)
-    refined_title = next((t for t in titles if t in refined_lower), None)
 
-    if source_title and refined_title and source_title != refined_title:
-        return f"Changed title from '{source_title}' to '{refined_title}'"
-
-    # Check 3: Extract and compare sender name from "Gikan kang" pattern
-    gikan_source_match = re.search(r"gikan\s+kang[:\s]+([A-Z][A-Za-z\s\.]+?)(?:\n|$)", source, re.IGNORECASE)
-    gikan_refined_match = re.search(r"gikan\s+kang[:\s]+([A-Z][A-Za-z\s\.]+?)(?:\n|$)", refined, re.IGNORECASE)
+def validate_refinement(source_text: str, refined_text: str) -> ValidationResult:
+    """
+    Validate that refined text meets quality and preservation requirements.
 
-    if gikan_source_match and gikan_refined_match:
-        source_name = gikan_source_match.group(1).strip()
-        refined_name = gikan_refined_match.group(1).strip()
-        # Names should be very similar (allow minor formatting changes)
-        source_name_clean = re.sub(r'[^a-z]', '', source_name.lower())
-        refined_name_clean = re.sub(r'[^a-z]', '', refined_name.lower())
-        if source_name_clean != refined_name_clean:
-            return f"Changed sender name from '{source_name}' to '{refined_name}'"
+    Checks:
+    - Refined text is not empty
+    - Refined text is not too short (less than 35% of source length)
+    - Preserves years, dates, times and venues
+    - Preserves sender/creator attribution
+    - Does not fabricate or modify a signature block
 
-    # Check 4: If source had signature block, refined must not add new elements
-    had_matinahuron = "matinahuron" in source_lower
-    has_matinahuron = "matinahuron" in refined_lower
-    if not had_matinahuron and has_matinahuron and (had_hon or source_title):
-        return "Added 'Kaninyo matinahuron' to existing signature"
+    Args:
+        source_text: The original raw announcement text.
+        refined_text: The LLM-generated refined text.
 
-    return None
+    Returns:
+        ValidationResult with every failure reason; reason holds the first.
+    """
+    return evaluate("refinement", analyze_text(source_text), analyze_text(refined_text or ""))
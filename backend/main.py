@@ -14,14 +14,28 @@ No auto-publish; Flutter app calls these endpoints then publishes via Firestore
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional
+from datetime import datetime
+from typing import Literal, Optional
+import json
 import os
 import firebase_admin
 from firebase_admin import credentials, firestore, messaging
 
-from services.ai_refinement import refine_text, suggest_announcement_title
-from services.audience_rules import recommend_audiences, DEFAULT_AUDIENCE
+from config.ai_settings import AUDIENCE_RULES_FIRESTORE_DOC, MAX_INPUT_CHARS
+from services.ai_refinement import prefetch_refinement, refine_text, suggest_announcement_title
+from services.batch_queue import BatchJob, batch_queue_stats, get_batch_job, submit_batch_job
+from services.audience_bulk import score_shard
+from services.audience_firestore import watch_firestore_rules
+from services.audience_live import live_session_count, recommend_live
+from services.audience_rules import audience_result_cache, recommend_audiences, rule_source, DEFAULT_AUDIENCE
+from services.compose import compose_announcement
+from services.prefetch import prefetch_stats
+from services.refine_jobs import RefineJob, get_refine_job, start_refine_job
+from llm import metrics as pipeline_metrics
+from llm.retry_policy import retry_stats
+from llm.cache import paragraph_cache, refinement_cache
 
 # Initialize Firebase Admin SDK
 db = None
@@ -61,6 +75,9 @@ def _initialize_firebase() -> None:
 
 _initialize_firebase()
 
+if AUDIENCE_RULES_FIRESTORE_DOC:
+    watch_firestore_rules(db, AUDIENCE_RULES_FIRESTORE_DOC)
+
 app = FastAPI(
     title="LINKod Admin AI Service",
     description="AI text refinement and rule-based audience recommendation. "
@@ -84,7 +101,9 @@ app.add_middleware(
 class RefineRequest(BaseModel):
     """Raw announcement text to refine. AI only clarifies; does not add info or choose audience."""
 
-    raw_text: str = Field(..., min_length=1, description="Raw announcement text")
+    raw_text: str = Field(
+        ..., min_length=1, max_length=MAX_INPUT_CHARS, description="Raw announcement text"
+    )
     signer_name: Optional[str] = Field(
         default=None,
         description="Preferred signer name for announcement signature behavior",
@@ -93,6 +112,20 @@ class RefineRequest(BaseModel):
         default=None,
         description="Preferred signer title for official default signature",
     )
+    previous_raw_text: Optional[str] = Field(
+        default=None,
+        max_length=MAX_INPUT_CHARS,
+        description="Raw text sent in the previous refine round (enables paragraph-level re-refinement)",
+    )
+    previous_refined_text: Optional[str] = Field(
+        default=None,
+        max_length=MAX_INPUT_CHARS,
+        description="Refined text returned in the previous refine round",
+    )
+    mode: Literal["sync", "fallback_first"] = Field(
+        default="sync",
+        description="fallback_first returns the deterministic draft at once plus a job_id for the model result",
+    )
 
 
 class RefineResponse(BaseModel):
@@ -101,12 +134,94 @@ class RefineResponse(BaseModel):
     original_text: str
     refined_text: str
     suggested_title: Optional[str] = None
+    status: Literal["final", "draft"] = Field(
+        default="final",
+        description="draft: refined_text is the fallback draft; poll job_id for the model result",
+    )
+    job_id: Optional[str] = None
+
+
+class RefineJobResponse(BaseModel):
+    """State of a fallback-first refinement job."""
+
+    job_id: str
+    status: Literal["pending", "running", "done", "failed"]
+    original_text: str
+    draft_text: str
+    refined_text: Optional[str] = None
+    suggested_title: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PrefetchRequest(BaseModel):
+    """Latest draft to refine speculatively in the background while the admin types."""
+
+    raw_text: str = Field(..., min_length=1, max_length=MAX_INPUT_CHARS, description="Current draft text")
+    signer_name: Optional[str] = Field(default=None, description="Signer name the real /refine will use")
+    signer_title: Optional[str] = Field(default=None, description="Signer title the real /refine will use")
+    session_id: str = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Composer session; a newer draft supersedes older queued prefetches of the same session",
+    )
+
+
+class PrefetchResponse(BaseModel):
+    """Prefetch status: queued, pending, cached or skipped."""
+
+    status: str
+
+
+class BatchRefineItem(BaseModel):
+    """One non-urgent announcement to refine in the deferred batch queue."""
+
+    raw_text: str = Field(..., min_length=1, max_length=MAX_INPUT_CHARS, description="Announcement text")
+    signer_name: Optional[str] = Field(default=None, description="Signer name the real /refine will use")
+    signer_title: Optional[str] = Field(default=None, description="Signer title the real /refine will use")
+    not_before: Optional[datetime] = Field(
+        default=None,
+        description="Do not start before this time (naive times are server-local)",
+    )
+    deadline: Optional[datetime] = Field(
+        default=None,
+        description="Refined text is wanted by this time; close deadlines skip the quiet-traffic wait",
+    )
+
+
+class BatchRefineRequest(BaseModel):
+    """Non-urgent refinements, drained in the background when interactive traffic is low."""
+
+    items: list[BatchRefineItem] = Field(..., min_length=1, max_length=100)
+
+
+class BatchJobResponse(BaseModel):
+    """State of one deferred refinement; rejected items carry the validation error and no job_id."""
+
+    job_id: Optional[str] = None
+    status: Literal["queued", "running", "done", "failed", "rejected"]
+    refined_text: Optional[str] = None
+    source: Optional[str] = None
+    error: Optional[str] = None
+    not_before: Optional[datetime] = None
+    deadline: Optional[datetime] = None
+
+
+class BatchRefineResponse(BaseModel):
+    """One entry per submitted item, in request order."""
+
+    jobs: list[BatchJobResponse]
 
 
 class RecommendAudiencesRequest(BaseModel):
     """Text to run through rule-based audience recommendation (typically refined announcement)."""
 
-    text: str = Field(..., min_length=1, description="Announcement text to match against rules")
+    text: str = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_INPUT_CHARS,
+        description="Announcement text to match against rules",
+    )
 
 
 class MatchedRule(BaseModel):
@@ -128,6 +243,96 @@ class RecommendAudiencesResponse(BaseModel):
         default=False,
         description="True if no rule matched and default_audience was returned",
     )
+    rules_version: Optional[str] = Field(
+        default=None,
+        description="Content hash of the rules file that produced this answer; null if no valid rules are loaded",
+    )
+    rules_compiled_at: Optional[datetime] = None
+
+
+class LiveAudiencesRequest(BaseModel):
+    """Current composer draft; sent on every keystroke."""
+
+    session_id: str = Field(..., min_length=1, max_length=200, description="Composer session")
+    text: str = Field(default="", max_length=MAX_INPUT_CHARS, description="Whole current draft")
+
+
+class LiveAudiencesResponse(RecommendAudiencesResponse):
+    """Same answer as /recommend-audiences, plus how much of the draft was rescanned."""
+
+    paragraphs: int = 0
+    rescanned_paragraphs: int = Field(default=0, description="Paragraphs changed since the session's previous call")
+
+
+class ComposeRequest(BaseModel):
+    """Raw draft to refine, title and target in one round trip."""
+
+    raw_text: str = Field(..., min_length=1, max_length=MAX_INPUT_CHARS, description="Raw announcement text")
+    signer_name: Optional[str] = Field(default=None, description="Preferred signer name, as for /refine")
+    signer_title: Optional[str] = Field(default=None, description="Preferred signer title, as for /refine")
+    previous_raw_text: Optional[str] = Field(
+        default=None,
+        max_length=MAX_INPUT_CHARS,
+        description="Raw text sent in the previous round (enables paragraph-level re-refinement)",
+    )
+    previous_refined_text: Optional[str] = Field(
+        default=None,
+        max_length=MAX_INPUT_CHARS,
+        description="Refined text returned in the previous round",
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        max_length=200,
+        description="Composer session; keeps audience hits of unchanged paragraphs between rounds",
+    )
+
+
+class ComposeResponse(RecommendAudiencesResponse):
+    """Refined text, suggested title and audiences for the refined text (the raw draft if refinement failed)."""
+
+    original_text: str
+    refined_text: Optional[str] = Field(
+        default=None,
+        description="None if refinement failed; the title and audiences are then for the raw draft",
+    )
+    suggested_title: Optional[str] = None
+    paragraphs: int = 0
+    rescanned_paragraphs: int = Field(
+        default=0,
+        description="Paragraphs scanned for keywords; the others reused hits from the raw draft or the previous round",
+    )
+
+
+class BulkAudienceItem(BaseModel):
+    """One past announcement to re-tag."""
+
+    id: Optional[str] = Field(default=None, description="Caller's document ID, echoed in the result line")
+    text: str = Field(..., max_length=MAX_INPUT_CHARS)
+
+
+class BulkAudienceRequest(BaseModel):
+    """Announcements to re-run through the active audience rules."""
+
+    items: list[BulkAudienceItem] = Field(..., min_length=1, max_length=5000)
+
+
+class AudienceRulesStatusResponse(BaseModel):
+    """Active audience rules and the outcome of the latest file check or Firestore sync."""
+
+    source: Literal["file", "firestore"] = "file"
+    document: Optional[str] = Field(default=None, description="Firestore rules document, when configured")
+    synced_at: Optional[datetime] = Field(default=None, description="Last Firestore snapshot applied")
+    path: str
+    version: Optional[str] = Field(default=None, description="Content hash of the active rules; null if none loaded")
+    compiled_at: Optional[datetime] = None
+    rule_count: int
+    keyword_count: int
+    checked_at: Optional[datetime] = None
+    error: Optional[str] = Field(
+        default=None,
+        description="Why the file on disk was not loaded; the previous version stays active",
+    )
+    error_at: Optional[datetime] = None
 
 
 # --- Push Notification Models ---
@@ -163,11 +368,34 @@ def post_refine(request: RefineRequest) -> RefineResponse:
     signer_name = (request.signer_name or "").strip() or None
     signer_title = (request.signer_title or "").strip() or None
 
+    if request.mode == "fallback_first":
+        try:
+            job = start_refine_job(
+                raw,
+                signature_name=signer_name,
+                signature_title=signer_title,
+                previous_raw_text=request.previous_raw_text,
+                previous_refined_text=request.previous_refined_text,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        text = job.refined_text if job.finished and job.refined_text else job.draft_text
+        return RefineResponse(
+            original_text=raw,
+            refined_text=text,
+            suggested_title=suggest_announcement_title(text),
+            status="final" if job.finished and job.refined_text else "draft",
+            job_id=None if job.finished else job.job_id,
+        )
+
     try:
         refined = refine_text(
             raw,
             signature_name=signer_name,
             signature_title=signer_title,
+            previous_raw_text=request.previous_raw_text,
+            previous_refined_text=request.previous_refined_text,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -187,6 +415,153 @@ def post_refine(request: RefineRequest) -> RefineResponse:
     )
 
 
+def _refine_job_response(job: RefineJob) -> RefineJobResponse:
+    return RefineJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        original_text=job.original_text,
+        draft_text=job.draft_text,
+        refined_text=job.refined_text,
+        suggested_title=suggest_announcement_title(job.refined_text) if job.refined_text else None,
+        error=job.error,
+    )
+
+
+def _require_refine_job(job_id: str) -> RefineJob:
+    job = get_refine_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Refine job not found or expired")
+    return job
+
+
+@app.get("/refine/jobs/{job_id}", response_model=RefineJobResponse)
+def get_refine_job_status(job_id: str) -> RefineJobResponse:
+    """Poll a fallback-first refinement job."""
+    return _refine_job_response(_require_refine_job(job_id))
+
+
+@app.get("/refine/jobs/{job_id}/events")
+def get_refine_job_events(job_id: str) -> StreamingResponse:
+    """
+    Server-sent events for a fallback-first refinement job.
+    Sends keep-alive comments until the job finishes, then one `result` event and closes.
+    """
+    job = _require_refine_job(job_id)
+
+    def event_stream():
+        while not job.wait(timeout=15):
+            yield ": keep-alive\n\n"
+        payload = _refine_job_response(job).model_dump()
+        yield f"event: result\ndata: {json.dumps(payload)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/refine/prefetch", response_model=PrefetchResponse)
+def post_refine_prefetch(request: PrefetchRequest) -> PrefetchResponse:
+    """
+    Speculatively refine the latest draft in a low-priority background lane.
+    Returns immediately; a later /refine with the same text and signer is served from cache.
+    """
+    status = prefetch_refinement(
+        request.raw_text.strip(),
+        signature_name=(request.signer_name or "").strip() or None,
+        signature_title=(request.signer_title or "").strip() or None,
+        session_id=request.session_id,
+    )
+    return PrefetchResponse(status=status)
+
+
+def _batch_job_response(job: BatchJob) -> BatchJobResponse:
+    return BatchJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        refined_text=job.refined_text,
+        source=job.source,
+        error=job.error,
+        not_before=datetime.fromtimestamp(job.not_before).astimezone(),
+        deadline=datetime.fromtimestamp(job.deadline).astimezone() if job.deadline else None,
+    )
+
+
+@app.post("/refine/batch", response_model=BatchRefineResponse)
+def post_refine_batch(request: BatchRefineRequest) -> BatchRefineResponse:
+    """
+    Queue non-urgent refinements (scheduled posts, archive clean-ups).
+    Returns at once; poll GET /refine/batch/{job_id}, or call /refine later and get a cache hit.
+    """
+    jobs = []
+    for item in request.items:
+        try:
+            job = submit_batch_job(
+                item.raw_text.strip(),
+                signature_name=(item.signer_name or "").strip() or None,
+                signature_title=(item.signer_title or "").strip() or None,
+                not_before=item.not_before.timestamp() if item.not_before else None,
+                deadline=item.deadline.timestamp() if item.deadline else None,
+            )
+        except ValueError as exc:
+            jobs.append(BatchJobResponse(status="rejected", error=str(exc)))
+            continue
+        jobs.append(_batch_job_response(job))
+    return BatchRefineResponse(jobs=jobs)
+
+
+@app.get("/refine/batch/{job_id}", response_model=BatchJobResponse)
+def get_refine_batch_job(job_id: str) -> BatchJobResponse:
+    """Poll a deferred refinement."""
+    job = get_batch_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found or expired")
+    return _batch_job_response(job)
+
+
+@app.post("/recommend-audiences/live", response_model=LiveAudiencesResponse)
+def post_recommend_audiences_live(request: LiveAudiencesRequest) -> LiveAudiencesResponse:
+    """
+    Live audience chips while the admin types.
+    Keyword hits are cached per paragraph for the session, so only edited paragraphs are rescanned.
+    """
+    rule_set = rule_source().rule_set
+    audiences, matched_rules, paragraphs, rescanned = recommend_live(request.session_id, request.text, rule_set)
+    return LiveAudiencesResponse(
+        audiences=audiences,
+        matched_rules=[MatchedRule(keywords=r["keywords"], audiences=r["audiences"]) for r in matched_rules],
+        default_used=audiences == [DEFAULT_AUDIENCE] and not matched_rules,
+        rules_version=rule_set.version,
+        rules_compiled_at=_timestamp(rule_set.compiled_at if rule_set.version else None),
+        paragraphs=paragraphs,
+        rescanned_paragraphs=rescanned,
+    )
+
+
+# Documents scored per NumPy pass; each shard's lines are streamed before the next is scored.
+_BULK_SHARD_SIZE = 500
+
+
+@app.post("/recommend-audiences/bulk")
+def post_recommend_audiences_bulk(request: BulkAudienceRequest) -> StreamingResponse:
+    """
+    Re-tag many announcements with the active audience rules, e.g. after a rules change.
+    Streams one JSON line per item, in request order:
+    {"id", "audiences", "matched_rules" (rule positions in the rules file), "default_used", "rules_version"}.
+    For larger corpora use the CLI: python -m services.audience_bulk.
+    """
+    rule_set = rule_source().rule_set
+    items = [(item.id, item.text) for item in request.items]
+
+    def lines():
+        for start in range(0, len(items), _BULK_SHARD_SIZE):
+            for line in score_shard(items[start:start + _BULK_SHARD_SIZE], rule_set):
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _timestamp(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value).astimezone() if value is not None else None
+
+
 @app.post("/recommend-audiences", response_model=RecommendAudiencesResponse)
 def post_recommend_audiences(request: RecommendAudiencesRequest) -> RecommendAudiencesResponse:
     """
@@ -199,15 +574,68 @@ def post_recommend_audiences(request: RecommendAudiencesRequest) -> RecommendAud
     if not text:
         raise HTTPException(status_code=400, detail="text cannot be empty")
 
-    audiences, matched_rules = recommend_audiences(text)
+    # One snapshot, so the reported version is the one that produced the answer.
+    rule_set = rule_source().rule_set
+    audiences, matched_rules = recommend_audiences(text, rules=rule_set)
 
     return RecommendAudiencesResponse(
         audiences=audiences,
         matched_rules=[MatchedRule(keywords=r["keywords"], audiences=r["audiences"]) for r in matched_rules],
         default_used=audiences == [DEFAULT_AUDIENCE] and not matched_rules,
+        rules_version=rule_set.version,
+        rules_compiled_at=_timestamp(rule_set.compiled_at if rule_set.version else None),
     )
 
 
+@app.post("/compose", response_model=ComposeResponse)
+def post_compose(request: ComposeRequest) -> ComposeResponse:
+    """
+    /refine and /recommend-audiences on the refined text in one call, plus the suggested title.
+    Audience matching on the raw draft runs while the model refines it and is
+    returned, with refined_text null, when refinement fails.
+    """
+    rule_set = rule_source().rule_set
+    try:
+        composition = compose_announcement(
+            request.raw_text,
+            signature_name=(request.signer_name or "").strip() or None,
+            signature_title=(request.signer_title or "").strip() or None,
+            previous_raw_text=request.previous_raw_text,
+            previous_refined_text=request.previous_refined_text,
+            session_id=request.session_id,
+            rule_set=rule_set,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return ComposeResponse(
+        original_text=composition.original_text,
+        refined_text=composition.refined_text,
+        suggested_title=composition.suggested_title,
+        audiences=composition.audiences,
+        matched_rules=[MatchedRule(keywords=r["keywords"], audiences=r["audiences"]) for r in composition.matched_rules],
+        default_used=composition.audiences == [DEFAULT_AUDIENCE] and not composition.matched_rules,
+        rules_version=rule_set.version,
+        rules_compiled_at=_timestamp(rule_set.compiled_at if rule_set.version else None),
+        paragraphs=composition.paragraphs,
+        rescanned_paragraphs=composition.rescanned_paragraphs,
+    )
+
+
+@app.get("/admin/audience-rules", response_model=AudienceRulesStatusResponse)
+def get_audience_rules_status() -> AudienceRulesStatusResponse:
+    """
+    Active audience rules version, compile time and source (local file or Firestore).
+    Checks the rules file first, so an edit shows up (or its validation error does) right away.
+    """
+    source = rule_source()
+    source.refresh()
+    status = source.status()
+    for key in ("compiled_at", "checked_at", "error_at", "synced_at"):
+        status[key] = _timestamp(status.get(key))
+    return AudienceRulesStatusResponse(**status)
+
+
 @app.post("/send-account-approval", response_model=SendAccountApprovalResponse)
 def post_send_account_approval(request: SendAccountApprovalRequest) -> SendAccountApprovalResponse:
     """
@@ -299,6 +727,21 @@ def health() -> dict:
     return {"status": "ok", "service": "linkod-admin-ai-service"}
 
 
+@app.get("/metrics")
+def metrics() -> dict:
+    """In-memory pipeline counters (reset on restart)."""
+    return {
+        "pipeline": pipeline_metrics.snapshot(),
+        "refinement_cache": refinement_cache.stats(),
+        "paragraph_cache": paragraph_cache.stats(),
+        "prefetch": prefetch_stats(),
+        "audience_cache": audience_result_cache.stats(),
+        "audience_live_sessions": live_session_count(),
+        "retry_outcomes": retry_stats.snapshot(),
+        "batch_queue": batch_queue_stats(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
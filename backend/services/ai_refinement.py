@@ -6,82 +6,53 @@ internal LLM pipeline which contains classification, validation, and retries.
 
 Public API:
     refine_text(raw_text: str) -> Optional[str]
+    prefetch_refinement(raw_text: str, session_id: str) -> str
+    normalize_and_validate_raw_text(raw_text: str) -> str
 
 For internal use, import directly from llm.pipeline:
     from llm.pipeline import generate_announcement
 """
 
-import re
 from typing import Optional
 
 # Import the pipeline entrypoint
+from config.ai_settings import AI_TIMEOUT_SECONDS, MAX_INPUT_CHARS
+from llm.analysis import AnalyzedText, analyze_text
 from llm.pipeline import generate_announcement, is_official_announcement
+from services.prefetch import submit_prefetch, wait_for_running_prefetch
+from services.text_quality import is_gibberish
+from services.title_categories import get_title_categories
+from services.traffic import interactive_gate
 
 
-def suggest_announcement_title(text: str) -> Optional[str]:
+def suggest_announcement_title(
+    text: str,
+    analysis: Optional[AnalyzedText] = None,
+) -> Optional[str]:
     """Suggest a concise title from announcement content."""
-    stripped = (text or "").strip()
+    analysis = analysis or analyze_text(text)
+    stripped = analysis.stripped
     if not stripped:
         return None
 
-    lower = stripped.lower()
-
-    def contains_any(keywords: list[str]) -> bool:
-        for keyword in keywords:
-            if re.search(rf"\b{re.escape(keyword)}\b", lower):
-                return True
-        return False
-
-    meeting_terms = ["meeting", "miting"]
-
-    # Prioritize specific topics first to avoid generic titles.
-    if contains_any(["general assembly", "barangay assembly"]):
-        return "Pahibalo: Barangay General Assembly"
-
-    if contains_any(["sports fest", "sportsfest", "basketball", "volleyball", "tournament", "liga", "sports"]):
-        if contains_any(meeting_terms):
-            return "Pahibalo: Miting Alang sa Sports Fest"
-        return "Pahibalo: Sports Fest sa Barangay"
-
-    if contains_any(["public hearing", "hearing"]):
-        return "Pahibalo: Public Hearing"
-
-    if contains_any(["putol sa tubig", "water interruption", "water service", "walay tubig"]):
-        return "Pahibalo: Pagputol sa Tubig"
-
-    if contains_any(["vaccination", "bakuna", "immunization"]):
-        return "Pahibalo: Bakuna"
-
-    if contains_any(["cleanup", "clean-up", "brigada", "limpyo", "hinlo"]):
-        return "Pahibalo: Brigada Limpyo"
-
-    if contains_any(["garbage", "collection", "basura", "kalot", "residuo", "waste", "trash", "garbage collection"]):
-        return "Pahibalo: Koleksyon sa Basura"
-
-    if contains_any(["registration", "rehistro", "civil registrar"]):
-        return "Pahibalo: Rehistro"
+    categories = get_title_categories()
+    title = categories.match(analysis.lower)
+    if title:
+        return title
 
-    if contains_any(["seminar", "orientation", "training"]):
-        return "Pahibalo: Seminar sa Komunidad"
+    if is_official_announcement(stripped, analysis):
+        return categories.official_title
 
-    if contains_any(["relief", "assistance", "tabang"]):
-        return "Pahibalo: Relief Assistance"
+    return categories.default_title
 
-    if contains_any(["curfew"]):
-        return "Pahibalo: Curfew"
-
-    # Generic meeting title only after all specific categories are checked.
-    if contains_any(meeting_terms):
-        return "Pahibalo: Miting sa Komunidad"
-
-    if is_official_announcement(stripped):
-        return "Pahibalo: Opisyal nga Anunsyo sa Barangay"
-
-    return "Pahibalo: Anunsyo sa Komunidad"
 
+def normalize_and_validate_raw_text(raw_text: str) -> str:
+    """
+    Trim input and enforce the minimum and maximum announcement length.
 
-def _normalize_and_validate_raw_text(raw_text: str) -> str:
-    """Trim input and enforce the minimum announcement length."""
+    Raises:
+        ValueError: With the message to show the admin.
+    """
     stripped = (raw_text or "").strip()
     if not stripped:
         raise ValueError("Announcement content cannot be empty.")
@@ -89,48 +60,13 @@ def _normalize_and_validate_raw_text(raw_text: str) -> str:
     if len(stripped) < 10:
         raise ValueError("Announcement must be at least 10 characters.")
 
-    # Reject obvious gibberish like random letter strings without real words.
-    words = re.findall(r"[A-Za-zÀ-ÿ']+", stripped)
-    unique_words = {word.lower() for word in words}
-    vowel_counts = [len(re.findall(r"[aeiouAEIOU]", word)) for word in words]
-    has_prompt_hint = bool(
-        re.search(
-            r"\b(create|make|write|generate|draft|himo|buhat|sulat|paghimo|announcement|anunsyo|pahibalo|advisory|notice)\b",
-            stripped,
-            re.IGNORECASE,
-        )
-    )
-    has_announcement_signal = bool(
-        re.search(
-            r"\b(meeting|miting|assembly|barangay|court|hall|schedule|schedule|date|oras|petsa|lugar)\b",
-            stripped,
-            re.IGNORECASE,
-        )
-    )
-
-    if len(words) == 1 and not has_prompt_hint and not has_announcement_signal:
-        raise ValueError("Please enter valid content.")
+    if len(stripped) > MAX_INPUT_CHARS:
+        raise ValueError(f"Announcement must be at most {MAX_INPUT_CHARS} characters.")
 
-    if len(words) == 0:
+    # Reject keyboard mashes and random letter strings before any LLM call.
+    if not any(ch.isalpha() for ch in stripped) or is_gibberish(stripped):
         raise ValueError("Please enter valid content.")
 
-    # Heuristic: inputs with many repeated characters and very few distinct words are likely gibberish.
-    if len(stripped) >= 12 and len(words) <= 2:
-        repeated_runs = re.search(r"(.)\1{4,}", stripped)
-        low_variety = len(unique_words) <= 1
-        vowel_count = len(re.findall(r"[aeiouAEIOU]", stripped))
-        if repeated_runs and low_variety:
-            raise ValueError("Please enter valid content.")
-        if vowel_count <= 2 and low_variety and not has_prompt_hint and not has_announcement_signal:
-            raise ValueError("Please enter valid content.")
-
-    # Stronger rejection for pseudo-word strings like 'afkhk asdflaksdfl adf'.
-    if not has_prompt_hint and not has_announcement_signal:
-        has_real_word = any(count >= 2 for count in vowel_counts) or any(len(word) >= 5 for word in words)
-        average_vowels = (sum(vowel_counts) / len(vowel_counts)) if vowel_counts else 0
-        if not has_real_word or average_vowels < 1.2:
-            raise ValueError("Please enter valid content.")
-
     return stripped
 
 
@@ -138,6 +74,8 @@ def refine_text(
     raw_text: str,
     signature_name: str | None = None,
     signature_title: str | None = None,
+    previous_raw_text: str | None = None,
+    previous_refined_text: str | None = None,
 ) -> Optional[str]:
     """
     Refine announcement text using the LLM pipeline.
@@ -150,21 +88,65 @@ def refine_text(
         raw_text: The raw announcement text to refine.
         signature_name: Optional preferred signer name for refine output.
         signature_title: Optional preferred signer title for official output.
+        previous_raw_text: Raw text of the previous refine round, if any.
+        previous_refined_text: Refined text returned in the previous round.
+            With both previous texts, only changed paragraphs are re-sent.
 
     Returns:
         Refined text string if successful.
 
     Raises:
-        ValueError: If the announcement is empty or shorter than 10 characters.
+        ValueError: If the announcement is empty, shorter than 10 characters or longer than MAX_INPUT_CHARS.
+    """
+    stripped = normalize_and_validate_raw_text(raw_text)
+
+    with interactive_gate.interactive():
+        # A prefetch already calling the model for this draft finishes sooner than a new call.
+        refined = wait_for_running_prefetch(
+            stripped,
+            signature_name=signature_name,
+            signature_title=signature_title,
+            timeout=AI_TIMEOUT_SECONDS,
+        )
+        if refined is None:
+            refined = generate_announcement(
+                stripped,
+                signature_name=signature_name,
+                signature_title=signature_title,
+                previous_raw_text=(previous_raw_text or "").strip() or None,
+                previous_refined_text=(previous_refined_text or "").strip() or None,
+            )
+
+    refined = refined.strip()
+    return refined or None
+
+
+def prefetch_refinement(
+    raw_text: str,
+    session_id: str,
+    signature_name: str | None = None,
+    signature_title: str | None = None,
+) -> str:
     """
-    stripped = _normalize_and_validate_raw_text(raw_text)
+    Start a low-priority background refinement for the latest draft.
+
+    The result is parked in the refinement cache, so a later refine_text call
+    with the same text and signer returns immediately. Drafts that would be
+    rejected by refine_text are skipped.
 
-    refined = generate_announcement(
+    Returns:
+        "queued", "pending", "cached" or "skipped".
+    """
+    try:
+        stripped = normalize_and_validate_raw_text(raw_text)
+    except ValueError:
+        return "skipped"
+
+    return submit_prefetch(
         stripped,
+        session_id,
         signature_name=signature_name,
         signature_title=signature_title,
     )
-    refined = refined.strip()
-    return refined or None
 
 
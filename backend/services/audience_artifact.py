@@ -0,0 +1,120 @@
+"""
+Build the precompiled audience rules artifact.
+
+Compiles config/audience_rules.json into config/audience_rules.bin: the
+weighted rule table, keyword postings and keyword trie, stored so the backend
+memory-maps and unmarshals them instead of parsing and compiling the rules on
+first use. The backend loads the artifact only if it was built from the exact
+bytes of the current rules file by the same Python version; an edited rules
+file is compiled from JSON as before until the artifact is rebuilt.
+
+The build is stricter than the runtime loader and fails on rules that load
+but can never behave as intended:
+
+- the same keyword listed twice in one rule (it would count twice);
+- a rule whose audiences are all blank;
+- a min_score above what all of the rule's keywords together score;
+- require_strong_keyword with no strong keyword among the rule's keywords;
+- a rule whose only keyword is too weak to match on its own.
+
+    python -m services.audience_artifact            # build next to the rules file
+    python -m services.audience_artifact --check    # validate only
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from services.audience_rules import (
+    DEFAULT_RULES_PATH,
+    SINGLE_MATCH_MIN_WEIGHT,
+    CompiledRule,
+    RuleSet,
+    artifact_path,
+    load_artifact,
+    parse_rules,
+)
+
+
+def check_rules(rules: List[dict]) -> List[str]:
+    """Problems that should fail a release build; empty if the rules are sound."""
+    problems: List[str] = []
+    for number, rule in enumerate(rules, start=1):
+        where = f"rule {number}"
+        compiled = CompiledRule(rule)
+        keywords = [keyword for keyword, _, _ in compiled.terms]
+        duplicates = sorted({keyword for keyword in keywords if keywords.count(keyword) > 1})
+        if duplicates:
+            problems.append(f"{where}: duplicate keywords {', '.join(map(repr, duplicates))}")
+        if not compiled.output_audiences:
+            problems.append(f"{where}: no audiences")
+        best = sum(weight for _, weight, _ in compiled.terms)
+        if best < compiled.min_score:
+            problems.append(
+                f"{where}: min_score {compiled.min_score:g} is unreachable (all keywords together score {best:g})"
+            )
+        if rule.get("require_strong_keyword") and not any(strong for _, _, strong in compiled.terms):
+            problems.append(f"{where}: require_strong_keyword is set but no strong_keywords entry is a keyword")
+        if len(compiled.terms) == 1 and compiled.terms[0][1] < SINGLE_MATCH_MIN_WEIGHT:
+            problems.append(f"{where}: its only keyword {keywords[0]!r} is too weak to match on its own")
+    return problems
+
+
+def build_artifact(rules_path: Path, output: Optional[Path] = None) -> Path:
+    """
+    Validate rules_path and write its artifact (default: next to it).
+
+    Raises:
+        ValueError: If the rules fail parse_rules or check_rules.
+    """
+    raw = rules_path.read_bytes()
+    rules = parse_rules(raw)
+    problems = check_rules(rules)
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    digest = hashlib.sha256(raw).hexdigest()
+    rule_set = RuleSet(rules, version=digest[:12])
+    try:
+        data = rule_set.to_artifact(digest)
+    except ValueError as exc:  # marshal refuses very deep tries (keywords of thousands of characters)
+        raise ValueError(f"cannot serialize rules: {exc}") from None
+
+    output = output or artifact_path(rules_path)
+    tmp = output.with_name(output.name + ".tmp")
+    tmp.write_bytes(data)
+    # Written whole, then renamed, so a running backend never maps a half-written file.
+    os.replace(tmp, output)
+
+    loaded = load_artifact(output, digest)
+    if loaded is None or len(loaded.rules) != len(rule_set.rules):
+        raise ValueError(f"{output} does not load back")
+    return output
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Validate audience rules and build their precompiled artifact.")
+    parser.add_argument("--rules", type=Path, default=DEFAULT_RULES_PATH, help="Audience rules JSON")
+    parser.add_argument("--output", type=Path, help="Artifact path (default: rules path with .bin)")
+    parser.add_argument("--check", action="store_true", help="Validate only; do not write the artifact")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.check:
+            problems = check_rules(parse_rules(args.rules.read_bytes()))
+            if problems:
+                raise ValueError("; ".join(problems))
+            print(f"{args.rules}: ok")
+            return
+        output = build_artifact(args.rules, args.output)
+    except (OSError, ValueError) as exc:
+        print(f"{args.rules}: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+    print(f"{output}: {output.stat().st_size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Bulk audience scoring for re-tagging past announcements after a rules change.
+
+Each shard of documents is scanned with RuleSet.scan into a sparse list of
+(document, keyword) hits. The hits are expanded through the
+keyword -> (rule, term) postings and summed per (document, rule) with
+np.bincount, which is the sparse hit matrix times the per-rule weight
+vectors. min_score, require_strong_keyword and the single-weak-keyword rule
+are then applied as boolean masks over the whole shard. Results are the same
+as RuleSet.recommend per document; without NumPy that is what runs.
+
+Large corpora are split into shards and scored on a process pool, and results
+stream out as JSON Lines in input order:
+
+    python -m services.audience_bulk history.jsonl --workers 4 > retagged.jsonl
+
+Input lines are objects with "text" and an optional "id", or bare JSON strings.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+from services.audience_rules import (
+    DEFAULT_AUDIENCE,
+    DEFAULT_RULES_PATH,
+    SINGLE_MATCH_MIN_WEIGHT,
+    RuleSet,
+    parse_rules,
+)
+
+try:
+    import numpy as np
+except ImportError:  # Optional: documents are then scored one by one.
+    np = None
+
+DEFAULT_SHARD_SIZE = 2000
+
+
+class _ScoringPlan:
+    """Term arrays of one RuleSet, grouped by keyword for expanding hits."""
+
+    __slots__ = (
+        "keyword_ids", "post_start", "post_count", "term_rule", "term_order",
+        "term_weight", "term_strong", "min_score", "require_strong",
+    )
+
+    def __init__(self, rule_set: RuleSet) -> None:
+        keywords = rule_set.index.keywords
+        self.keyword_ids = {keyword: i for i, keyword in enumerate(keywords)}
+        # Global (rule, term) position, so sorting by it sums weights in file order.
+        order = {}
+        for rule_index, rule in enumerate(rule_set.rules):
+            for term_index in range(len(rule.terms)):
+                order[(rule_index, term_index)] = len(order)
+
+        starts, counts, rules, orders, weights, strong = [], [], [], [], [], []
+        for keyword in keywords:
+            postings = rule_set.postings[keyword]
+            starts.append(len(rules))
+            counts.append(len(postings))
+            for rule_index, term_index in postings:
+                _, weight, is_strong = rule_set.rules[rule_index].terms[term_index]
+                rules.append(rule_index)
+                orders.append(order[(rule_index, term_index)])
+                weights.append(weight)
+                strong.append(is_strong)
+        self.post_start = np.array(starts, dtype=np.int64)
+        self.post_count = np.array(counts, dtype=np.int64)
+        self.term_rule = np.array(rules, dtype=np.int64)
+        self.term_order = np.array(orders, dtype=np.int64)
+        self.term_weight = np.array(weights, dtype=np.float64)
+        self.term_strong = np.array(strong, dtype=np.float64)
+        self.min_score = np.array([rule.min_score for rule in rule_set.rules], dtype=np.float64)
+        self.require_strong = np.array([rule.require_strong for rule in rule_set.rules], dtype=bool)
+
+
+def _accepted_matrix(texts_lower: Sequence[str], rule_set: RuleSet, plan: _ScoringPlan) -> "np.ndarray":
+    """Boolean documents x rules matrix of accepted rules."""
+    doc_count, rule_count = len(texts_lower), len(rule_set.rules)
+    hit_docs: list[int] = []
+    hit_keywords: list[int] = []
+    keyword_ids = plan.keyword_ids
+    for doc, text_lower in enumerate(texts_lower):
+        if text_lower:
+            for keyword in rule_set.scan(text_lower):
+                hit_docs.append(doc)
+                hit_keywords.append(keyword_ids[keyword])
+    if not hit_docs or not rule_count:
+        return np.zeros((doc_count, rule_count), dtype=bool)
+
+    docs = np.array(hit_docs, dtype=np.int64)
+    keywords = np.array(hit_keywords, dtype=np.int64)
+    # Expand each (document, keyword) hit into one row per (rule, term) it belongs to.
+    counts = plan.post_count[keywords]
+    docs = np.repeat(docs, counts)
+    offsets = np.arange(len(docs)) - np.repeat(np.cumsum(counts) - counts, counts)
+    terms = np.repeat(plan.post_start[keywords], counts) + offsets
+    order = np.argsort(docs * len(plan.term_order) + plan.term_order[terms], kind="stable")
+    docs, terms = docs[order], terms[order]
+
+    cells = docs * rule_count + plan.term_rule[terms]
+    size = doc_count * rule_count
+    score = np.bincount(cells, weights=plan.term_weight[terms], minlength=size).reshape(doc_count, rule_count)
+    matched = np.bincount(cells, minlength=size).reshape(doc_count, rule_count)
+    strong = np.bincount(cells, weights=plan.term_strong[terms], minlength=size).reshape(doc_count, rule_count)
+
+    return (
+        (matched > 0)
+        & (score >= plan.min_score)
+        & (~plan.require_strong | (strong > 0))
+        & ~((matched == 1) & (score < SINGLE_MATCH_MIN_WEIGHT))
+    )
+
+
+def _accepted_one(rule_set: RuleSet, text_lower: str) -> list[int]:
+    if not text_lower:
+        return []
+    matched = rule_set.matched_terms(text_lower)
+    return [i for i in sorted(matched) if rule_set.rules[i].accepts(matched[i])]
+
+
+def score_documents(texts: Sequence[str], rule_set: RuleSet) -> List[tuple[list[str], list[int]]]:
+    """
+    Audiences and accepted rule indexes for each text, same as RuleSet.recommend.
+
+    Rule indexes point into rule_set.rules (the order of the rules file).
+    """
+    texts_lower = [(text or "").strip().lower() for text in texts]
+    if np is None:
+        accepted_rows: Iterable[list[int]] = (_accepted_one(rule_set, text_lower) for text_lower in texts_lower)
+    else:
+        matrix = _accepted_matrix(texts_lower, rule_set, _ScoringPlan(rule_set))
+        accepted_rows = (np.flatnonzero(row).tolist() for row in matrix)
+
+    results = []
+    for accepted in accepted_rows:
+        audiences = rule_set.audiences_for(accepted)
+        results.append((audiences, accepted) if audiences else ([DEFAULT_AUDIENCE], []))
+    return results
+
+
+def _result_line(doc_id: Any, audiences: list[str], accepted: list[int], version: Optional[str]) -> dict:
+    return {
+        "id": doc_id,
+        "audiences": audiences,
+        "matched_rules": accepted,
+        "default_used": not accepted,
+        "rules_version": version,
+    }
+
+
+def score_shard(items: Sequence[tuple[Any, str]], rule_set: RuleSet) -> List[dict]:
+    """Result lines for (id, text) pairs."""
+    scored = score_documents([text for _, text in items], rule_set)
+    return [
+        _result_line(doc_id, audiences, accepted, rule_set.version)
+        for (doc_id, _), (audiences, accepted) in zip(items, scored)
+    ]
+
+
+_worker_rule_set: Optional[RuleSet] = None
+
+
+def _init_worker(rules: list, version: Optional[str]) -> None:
+    global _worker_rule_set
+    _worker_rule_set = RuleSet(rules, version=version)
+
+
+def _score_in_worker(items: Sequence[tuple[Any, str]]) -> List[dict]:
+    return score_shard(items, _worker_rule_set)
+
+
+def _shards(items: Iterable[tuple[Any, str]], shard_size: int) -> Iterator[list[tuple[Any, str]]]:
+    iterator = iter(items)
+    while shard := list(islice(iterator, shard_size)):
+        yield shard
+
+
+def score_stream(
+    items: Iterable[tuple[Any, str]],
+    rules: list,
+    version: Optional[str] = None,
+    workers: int = 1,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> Iterator[dict]:
+    """
+    Result lines for a stream of (id, text) pairs, in input order.
+
+    With workers > 1 the shards are scored on a process pool; at most two
+    shards per worker are in flight, so the input is never read far ahead.
+    """
+    if workers <= 1:
+        rule_set = RuleSet(rules, version=version)
+        for shard in _shards(items, shard_size):
+            yield from score_shard(shard, rule_set)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules, version)) as pool:
+        pending: list[Future] = []
+        for shard in _shards(items, shard_size):
+            pending.append(pool.submit(_score_in_worker, shard))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+
+def _read_items(lines: Iterable[str]) -> Iterator[tuple[Any, str]]:
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise SystemExit(f"line {number}: invalid JSON: {exc}")
+        if isinstance(item, str):
+            yield number, item
+        elif isinstance(item, dict) and isinstance(item.get("text"), str):
+            yield item.get("id", number), item["text"]
+        else:
+            raise SystemExit(f'line {number}: expected a string or an object with "text"')
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-run audience recommendation over a JSON Lines corpus.")
+    parser.add_argument("input", nargs="?", default="-", help="JSON Lines file, or - for stdin")
+    parser.add_argument("--rules", type=Path, default=DEFAULT_RULES_PATH, help="Audience rules JSON")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Scoring processes")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="Documents per shard")
+    args = parser.parse_args(argv)
+
+    raw = args.rules.read_bytes()
+    try:
+        rules = parse_rules(raw)
+    except ValueError as exc:
+        raise SystemExit(f"{args.rules}: {exc}")
+    version = hashlib.sha256(raw).hexdigest()[:12]
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    with source:
+        for line in score_stream(_read_items(source), rules, version, args.workers, max(1, args.shard_size)):
+            sys.stdout.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
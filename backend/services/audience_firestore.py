@@ -0,0 +1,218 @@
+"""
+Audience rules kept in a Firestore document.
+
+With AUDIENCE_RULES_FIRESTORE_DOC set (e.g. adminSettings/audienceRules),
+admins edit the rules from the admin app instead of redeploying
+config/audience_rules.json. The document holds a "rules" array with the same
+shape as the JSON file.
+
+A snapshot listener receives every change on Firestore's own background
+thread. Each change is validated with parse_rules and written to a local cache
+file (data/audience_rules.firestore.json), and that file's RuleSource compiles
+and swaps it in. Requests only ever read the compiled copy in memory, so no
+request waits on Firestore:
+
+- synced or cached Firestore rules are used when there are any;
+- before the first sync on a new workstation, or with no valid Firestore
+  rules at all, the local JSON file is used;
+- an invalid or deleted document leaves the last good rules in place.
+
+Against the Firestore emulator, set FIRESTORE_EMULATOR_HOST and
+GOOGLE_CLOUD_PROJECT, then seed the document from the JSON file with:
+
+    python -m services.audience_firestore push --document adminSettings/audienceRules
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from llm import metrics
+from services.audience_rules import (
+    DEFAULT_RULES_PATH,
+    RuleSet,
+    RuleSource,
+    parse_rules,
+    rule_source,
+    set_primary_source,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _default_cache_path() -> Path:
+    """Writable data path: dev = backend/data; PyInstaller = data/ next to the exe."""
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().parent / "data" / "audience_rules.firestore.json"
+    return Path(__file__).resolve().parent.parent / "data" / "audience_rules.firestore.json"
+
+
+def _rules_bytes(rules: Any) -> bytes:
+    # Stable bytes for the same rules, so the version hash only changes with the content.
+    return json.dumps({"rules": rules}, ensure_ascii=False, indent=1, sort_keys=True).encode("utf-8")
+
+
+class FirestoreRuleSource:
+    """Firestore-synced rules in front of the local rules file; same interface as RuleSource."""
+
+    def __init__(self, document_path: str, cache_path: Optional[Path] = None) -> None:
+        self.document_path = document_path
+        self.cache_path = Path(cache_path or _default_cache_path())
+        # Created on the first sync when there is no cached copy yet.
+        self.cache: Optional[RuleSource] = rule_source(self.cache_path) if self.cache_path.exists() else None
+        self.fallback = rule_source(DEFAULT_RULES_PATH)
+        self.synced_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.error_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._watch = None
+
+    def _active(self) -> RuleSource:
+        cache = self.cache
+        return cache if cache is not None and cache.rule_set.version else self.fallback
+
+    @property
+    def rule_set(self) -> RuleSet:
+        return self._active().rule_set
+
+    def refresh(self) -> bool:
+        """Re-check the local files; Firestore changes arrive through the listener."""
+        cache = self.cache
+        return (cache.refresh() if cache is not None else False) | self.fallback.refresh()
+
+    def status(self) -> dict[str, Any]:
+        active = self._active()
+        from_firestore = active is not self.fallback
+        status = active.status()
+        status["source"] = "firestore" if from_firestore else "file"
+        status["document"] = self.document_path
+        status["synced_at"] = self.synced_at
+        if self.error is not None:
+            status["error"], status["error_at"] = self.error, self.error_at
+        return status
+
+    def start(self, client) -> None:
+        """Attach the snapshot listener; the first snapshot arrives in the background."""
+        self._watch = client.document(self.document_path).on_snapshot(self._on_snapshot)
+
+    def stop(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _on_snapshot(self, snapshots, changes, read_time) -> None:
+        snapshot = snapshots[0] if snapshots else None
+        if snapshot is None or not snapshot.exists:
+            self._reject(f"document {self.document_path} does not exist")
+            return
+        raw = _rules_bytes((snapshot.to_dict() or {}).get("rules"))
+        try:
+            parse_rules(raw)
+        except ValueError as exc:
+            self._reject(str(exc))
+            return
+
+        with self._lock:
+            path = self.cache_path
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(path.name + ".tmp")
+                tmp.write_bytes(raw)
+                os.replace(tmp, path)
+            except OSError as exc:
+                self._reject(f"cannot write {path}: {exc.strerror}")
+                return
+            if self.cache is None:
+                self.cache = rule_source(path)
+            else:
+                self.cache.refresh()
+            self.synced_at = time.time()
+            self.error = self.error_at = None
+        metrics.increment("audience_rules.firestore_synced")
+
+    def _reject(self, error: str) -> None:
+        if error != self.error:
+            metrics.increment("audience_rules.rejected")
+            logger.warning(
+                "Audience rules from Firestore not loaded, keeping version %s: %s", self.rule_set.version, error
+            )
+            self.error_at = time.time()
+        self.error = error
+
+
+def emulator_client():
+    """
+    Firestore client for the emulator when FIRESTORE_EMULATOR_HOST is set, else None.
+
+    firebase_admin always wants real credentials; the plain google-cloud-firestore
+    client talks to the emulator without any.
+    """
+    if not os.getenv("FIRESTORE_EMULATOR_HOST"):
+        return None
+    from google.cloud import firestore
+
+    return firestore.Client(project=os.getenv("GOOGLE_CLOUD_PROJECT") or "demo-linkod")
+
+
+def watch_firestore_rules(client, document_path: str, cache_path: Optional[Path] = None) -> FirestoreRuleSource:
+    """
+    Serve audience rules from a Firestore document from now on.
+
+    client is the app's Firestore client (the emulator's when configured); with
+    none, or if the listener cannot start, the cached copy or the local JSON serves.
+    """
+    source = FirestoreRuleSource(document_path, cache_path)
+    set_primary_source(source)
+    client = emulator_client() or client
+    if client is None:
+        logger.warning("Audience rules listener for %s not started: Firestore is not configured", document_path)
+        return source
+    try:
+        source.start(client)
+    except Exception as exc:
+        logger.warning("Audience rules listener for %s not started: %s", document_path, exc)
+    return source
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    parser = argparse.ArgumentParser(description="Upload audience rules JSON to the Firestore rules document.")
+    parser.add_argument("command", choices=["push"])
+    parser.add_argument("--rules", type=Path, default=DEFAULT_RULES_PATH, help="Audience rules JSON")
+    parser.add_argument(
+        "--document",
+        default=os.getenv("AUDIENCE_RULES_FIRESTORE_DOC") or "adminSettings/audienceRules",
+        help="Firestore document path",
+    )
+    parser.add_argument(
+        "--service-account",
+        default=os.getenv("GOOGLE_APPLICATION_CREDENTIALS", ""),
+        help="Service account JSON; optional with the emulator or application default credentials",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        rules = parse_rules(args.rules.read_bytes())
+    except (OSError, ValueError) as exc:
+        raise SystemExit(f"{args.rules}: {exc}")
+    client = emulator_client()
+    if client is None:
+        if args.service_account:
+            firebase_admin.initialize_app(credentials.Certificate(args.service_account))
+        else:
+            firebase_admin.initialize_app()
+        client = firestore.client()
+    client.document(args.document).set({"rules": rules, "updatedAt": firestore.SERVER_TIMESTAMP})
+    print(f"{args.document}: {len(rules)} rules")
+
+
+if __name__ == "__main__":
+    main()
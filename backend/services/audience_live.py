@@ -0,0 +1,108 @@
+"""
+Live audience recommendation while the admin types.
+
+The composer sends the whole draft on every keystroke. Keyword hits are
+kept per paragraph, keyed by a hash of the paragraph, for each composer
+session, so a call rescans only the paragraphs that changed since the
+session's previous call and then re-runs the rule scoring on the merged hits.
+That scoring is cheap, and the result is the same as /recommend-audiences on
+the full text.
+
+Paragraphs are split on blank lines; a keyword never contains a blank line,
+so no keyword can straddle two paragraphs. A session whose rules were
+reloaded starts over with the new RuleSet.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from llm import metrics
+from services.audience_rules import DEFAULT_AUDIENCE, RuleSet, get_rule_set
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+# Composer sessions kept at once, least recently used dropped first.
+_MAX_SESSIONS = 256
+# A session idle this long is dropped at the next call that touches the store.
+_SESSION_TTL_SECONDS = 30 * 60
+
+
+class _Session:
+    __slots__ = ("rule_set", "paragraphs", "used_at")
+
+    def __init__(self, rule_set: RuleSet) -> None:
+        self.rule_set = rule_set
+        # Paragraph hash -> keywords found in it.
+        self.paragraphs: dict[bytes, frozenset[str]] = {}
+        self.used_at = time.monotonic()
+
+
+_lock = threading.Lock()
+_sessions: "OrderedDict[str, _Session]" = OrderedDict()
+
+
+def _session(session_id: str, rule_set: RuleSet) -> _Session:
+    now = time.monotonic()
+    with _lock:
+        session = _sessions.pop(session_id, None)
+        if session is None or session.rule_set is not rule_set:
+            session = _Session(rule_set)
+        session.used_at = now
+        _sessions[session_id] = session
+        while _sessions:
+            oldest_id, oldest = next(iter(_sessions.items()))
+            if len(_sessions) <= _MAX_SESSIONS and now - oldest.used_at < _SESSION_TTL_SECONDS:
+                break
+            del _sessions[oldest_id]
+    return session
+
+
+def recommend_live(session_id: str, text: str, rule_set: Optional[RuleSet] = None) -> tuple:
+    """
+    recommend_audiences() for the latest draft of a composer session.
+
+    Returns:
+        (audiences, matched_rules, paragraphs, rescanned): the same audiences and
+        matched_rules as recommend_audiences, plus how many paragraphs the
+        draft has and how many of them had to be scanned on this call.
+    """
+    rule_set = rule_set or get_rule_set()
+    text_lower = (text or "").strip().lower()
+    paragraphs = [p.strip() for p in _PARAGRAPH_BREAK.split(text_lower)] if text_lower else []
+
+    session = _session(session_id or "default", rule_set)
+    previous = session.paragraphs
+    current: dict[bytes, frozenset[str]] = {}
+    keywords: set[str] = set()
+    rescanned = 0
+    for paragraph in paragraphs:
+        key = hashlib.blake2b(paragraph.encode("utf-8"), digest_size=16).digest()
+        found = current.get(key)
+        if found is None:
+            found = previous.get(key)
+        if found is None:
+            found = frozenset(rule_set.scan(paragraph))
+            rescanned += 1
+        current[key] = found
+        keywords |= found
+    session.paragraphs = current
+
+    metrics.increment("audience_live.calls")
+    metrics.increment("audience_live.paragraphs_rescanned", rescanned)
+    if not paragraphs:
+        return [DEFAULT_AUDIENCE], [], 0, 0
+    audiences, matched_rules = rule_set.recommend_hits(keywords)
+    return audiences, matched_rules, len(paragraphs), rescanned
+
+
+def drop_live_session(session_id: str) -> None:
+    with _lock:
+        _sessions.pop(session_id, None)
+
+
+def live_session_count() -> int:
+    with _lock:
+        return len(_sessions)
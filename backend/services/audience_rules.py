@@ -3,13 +3,41 @@ Rule-Based Audience Recommendation module.
 
 Audience targeting is rule-based only (no AI). Rules map keywords to audience groups.
 Transparent and explainable: returns which rules matched and why.
+
+The rules file is compiled once into a RuleSet (normalized keywords,
+precomputed weights and thresholds) and recompiled only when the file's
+content changes. A background watcher re-checks the file every
+AUDIENCE_RULES_POLL_SECONDS, validates and compiles a changed file off the
+request path and swaps the active RuleSet in one step; a file that fails
+validation is reported and the last good RuleSet keeps serving.
+
+A RuleSet also builds one KeywordIndex over the keywords of every rule, so a
+recommendation reads the text once instead of once per keyword.
+Before the scan, inflected Cebuano/Surigaonon forms of the keywords are
+reduced to the keyword itself (services.cebuano_morphology), so "gibakunahan"
+counts as "bakuna" without listing every inflection in the rules file.
 """
 
+import hashlib
 import json
+import logging
+import marshal
+import mmap
+import os
 import re
+import struct
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
+
+from config.ai_settings import AUDIENCE_CACHE_MAX_ENTRIES, AUDIENCE_RULES_POLL_SECONDS
+from llm import metrics
+from llm.cache import LRUCache
+from services.cebuano_morphology import Normalizer
+
+logger = logging.getLogger(__name__)
 
 
 def _to_float(value: Any, default: float) -> float:
@@ -19,18 +47,39 @@ def _to_float(value: Any, default: float) -> float:
         return default
 
 
-def _build_keyword_pattern(keyword: str) -> str:
-    """Build a safe boundary-aware regex; plurals are only expanded for simple alpha tokens."""
-    kw = (keyword or "").strip().lower()
-    if not kw:
-        return ""
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
 
-    escaped = re.escape(kw)
-    is_simple_alpha_word = bool(re.fullmatch(r"[a-z]{3,}", kw))
-    suffix = r"(?:s|es)?" if is_simple_alpha_word else ""
 
-    # Use non-word boundaries so keywords with apostrophes/hyphens still match safely.
-    return rf"(?<!\w){escaped}{suffix}(?!\w)"
+def _keyword_occurs(keyword: str, text_lower: str) -> bool:
+    r"""
+    Boundary-aware keyword search; plurals (s/es) are only expanded for simple alpha tokens.
+
+    Same matches as the regex (?<!\w)keyword(?:s|es)?(?!\w), but found with
+    str.find plus constant-time boundary checks instead of a regex per keyword.
+    """
+    kw_len = len(keyword)
+    if not kw_len:
+        return False
+
+    # Non-word boundaries let keywords with apostrophes/hyphens still match safely.
+    allow_plural = kw_len >= 3 and keyword.isascii() and keyword.isalpha()
+    text_len = len(text_lower)
+    start = text_lower.find(keyword)
+    while start != -1:
+        end = start + kw_len
+        if start == 0 or not _is_word_char(text_lower[start - 1]):
+            if end == text_len or not _is_word_char(text_lower[end]):
+                return True
+            if allow_plural:
+                for suffix in ("s", "es"):
+                    after = end + len(suffix)
+                    if text_lower.startswith(suffix, end) and (
+                        after == text_len or not _is_word_char(text_lower[after])
+                    ):
+                        return True
+        start = text_lower.find(keyword, start + 1)
+    return False
 
 
 def _keyword_weight(
@@ -80,6 +129,9 @@ DEFAULT_RULES_PATH = _default_rules_path()
 # When no rule matches, return this default audience
 DEFAULT_AUDIENCE = "General Residents"
 
+# A rule matched by one keyword lighter than this never applies on its own.
+SINGLE_MATCH_MIN_WEIGHT = 0.7
+
 
 def load_rules(rules_path: Optional[Path] = None) -> List[dict]:
     """
@@ -98,98 +150,504 @@ def load_rules(rules_path: Optional[Path] = None) -> List[dict]:
         return []
 
 
-def recommend_audiences(
-    text: str,
-    rules: Optional[List[dict]] = None,
-    rules_path: Optional[Path] = None,
-) -> tuple:
-    """
-    Rule-based audience recommendation from text (e.g. refined announcement).
+def _string_list(rule: dict, keys: tuple[str, ...], where: str, required: bool) -> None:
+    value = next((rule[key] for key in keys if rule.get(key)), None)
+    if value is None:
+        if required:
+            raise ValueError(f"{where}: missing {keys[0]!r}")
+        return
+    values = value if isinstance(value, list) else [value]
+    if not all(isinstance(v, str) for v in values):
+        raise ValueError(f"{where}: {keys[0]!r} must be a list of strings")
+    if required and not any(v.strip() for v in values):
+        raise ValueError(f"{where}: {keys[0]!r} is empty")
 
-    - text: the announcement text to check (refined or original).
-    - rules: optional in-memory list; if None, loaded from rules_path.
-    - rules_path: optional path to JSON; used if rules is None.
 
-    Returns:
-        (audiences, matched_rules)
-        - audiences: list of audience group names (no duplicates, order preserved).
-        - matched_rules: list of {"keywords": [...], "audiences": [...]} that matched (for transparency).
-    If no rule matches, audiences = [DEFAULT_AUDIENCE], matched_rules = [].
+def parse_rules(raw: bytes) -> List[dict]:
     """
-    if rules is None:
-        rules = load_rules(rules_path)
+    Parse and validate a rules file.
 
-    text_lower = (text or "").strip().lower()
-    if not text_lower:
-        return [DEFAULT_AUDIENCE], []
+    Unlike load_rules, problems are reported instead of turning into an empty
+    rule list: a rule without keywords or audiences, or with a misspelled key,
+    would otherwise silently never match.
 
-    seen_audiences: set[str] = set()
-    audiences_ordered: list[str] = []
-    matched_rules: list[dict[str, Any]] = []
-
-    for rule in rules:
+    Raises:
+        ValueError: If the file is not valid JSON or a rule is malformed.
+    """
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except ValueError as exc:
+        raise ValueError(f"invalid JSON: {exc}") from None
+    rules = data.get("rules") if isinstance(data, dict) else data
+    if not isinstance(rules, list):
+        raise ValueError('expected a list of rules or an object with a "rules" list')
+    for number, rule in enumerate(rules, start=1):
+        where = f"rule {number}"
+        if not isinstance(rule, dict):
+            raise ValueError(f"{where}: expected an object")
+        _string_list(rule, ("keywords", "keyword_list"), where, required=True)
+        _string_list(rule, ("audiences", "audience_groups"), where, required=True)
+        _string_list(rule, ("weak_keywords",), where, required=False)
+        _string_list(rule, ("strong_keywords",), where, required=False)
+        min_score = rule.get("min_score")
+        if min_score is not None and (isinstance(min_score, bool) or not isinstance(min_score, (int, float))):
+            raise ValueError(f"{where}: 'min_score' must be a number")
+    return rules
+
+
+class CompiledRule:
+    """One audience rule with its keywords normalized and weighted ahead of time."""
+
+    __slots__ = ("keywords", "audiences", "terms", "min_score", "require_strong", "output_audiences")
+
+    def __init__(self, rule: dict) -> None:
         keywords = rule.get("keywords") or rule.get("keyword_list") or []
         audiences = rule.get("audiences") or rule.get("audience_groups") or []
-        require_strong_keyword = bool(rule.get("require_strong_keyword", False))
+        if not isinstance(keywords, list):
+            keywords = [keywords]
+        if not isinstance(audiences, list):
+            audiences = [audiences]
         weak_keywords = {
-            (k or "").strip().lower()
-            for k in (rule.get("weak_keywords") or [])
-            if (k or "").strip()
+            (k or "").strip().lower() for k in (rule.get("weak_keywords") or []) if (k or "").strip()
         }
         strong_keywords = {
-            (k or "").strip().lower()
-            for k in (rule.get("strong_keywords") or [])
-            if (k or "").strip()
+            (k or "").strip().lower() for k in (rule.get("strong_keywords") or []) if (k or "").strip()
         }
-        min_score = _to_float(rule.get("min_score"), 1.0)
 
-        if not keywords or not audiences:
-            continue
-        if not isinstance(keywords, list):
-            keywords = [keywords]
-        if not isinstance(audiences, list):
-            audiences = [audiences]
+        # As written in the rule file; returned in matched_rules.
+        self.keywords = keywords
+        self.audiences = audiences
+        # (keyword, weight, is_strong) in file order; duplicates count twice, as before.
+        self.terms: tuple[tuple[str, float, bool], ...] = tuple(
+            (kw, _keyword_weight(kw, weak_keywords, strong_keywords), kw in strong_keywords)
+            for kw in ((k or "").strip().lower() for k in keywords if isinstance(k, str) or not k)
+            if kw
+        )
+        self.min_score = _to_float(rule.get("min_score"), 1.0)
+        self.require_strong = bool(rule.get("require_strong_keyword", False)) and bool(strong_keywords)
+        output: list[str] = []
+        for a in audiences:
+            a_str = (a or "").strip()
+            if a_str:
+                output.append(a_str)
+        self.output_audiences = tuple(output)
+
+    def to_record(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def from_record(cls, record: tuple) -> "CompiledRule":
+        rule = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, record):
+            setattr(rule, name, value)
+        return rule
+
+    def matches(self, text_lower: str) -> bool:
+        """Per-keyword scan; RuleSet.recommend uses the shared KeywordIndex instead."""
+        return self.accepts([term for term in self.terms if _keyword_occurs(term[0], text_lower)])
+
+    def accepts(self, matched: list) -> bool:
+        """Whether the matched terms (in file order) are enough for this rule."""
+        if not matched or sum(weight for _, weight, _ in matched) < self.min_score:
+            return False
+        if self.require_strong and not any(strong for _, _, strong in matched):
+            return False
+        # Prevent generic one-word matches like "kita" from deciding a demographic.
+        if len(matched) == 1 and matched[0][1] < SINGLE_MATCH_MIN_WEIGHT:
+            return False
+        return True
 
-        matched_keywords: list[str] = []
-        score = 0.0
-        matched_strong_keyword = False
 
-        # Score all matched keywords; ignore very weak single-word accidental matches.
-        for kw in keywords:
-            kw_clean = (kw or "").strip().lower()
-            if not kw_clean:
-                continue
+def _surface_forms(keyword: str) -> tuple[str, ...]:
+    # The spellings _keyword_occurs accepts between its two boundaries.
+    if len(keyword) >= 3 and keyword.isascii() and keyword.isalpha():
+        return keyword, keyword + "s", keyword + "es"
+    return (keyword,)
 
-            pattern = _build_keyword_pattern(kw_clean)
-            if not pattern:
-                continue
-            if re.search(pattern, text_lower):
-                matched_keywords.append(kw_clean)
-                if kw_clean in strong_keywords:
-                    matched_strong_keyword = True
-                score += _keyword_weight(kw_clean, weak_keywords, strong_keywords)
 
-        if not matched_keywords or score < min_score:
-            continue
+def _start_pattern(root: dict) -> Optional[re.Pattern]:
+    # Positions after a non-word character where some keyword's first character is.
+    first_chars = "".join(sorted(ch for ch in root if ch))
+    if not first_chars:
+        return None
+    return re.compile(rf"(?<!\w)[{''.join(re.escape(ch) for ch in first_chars)}]")
 
-        if require_strong_keyword and strong_keywords and not matched_strong_keyword:
-            continue
 
-        # Prevent generic one-word matches like "kita" from deciding a demographic.
-        if len(matched_keywords) == 1:
-            only_kw = matched_keywords[0]
-            only_weight = _keyword_weight(only_kw, weak_keywords, strong_keywords)
-            if only_weight < 0.7:
-                continue
+class KeywordIndex:
+    r"""
+    Trie over every keyword (and its s/es plurals) of a set of rules.
 
-        matched_rules.append({"keywords": keywords, "audiences": audiences})
-        for a in audiences:
-            a_str = (a or "").strip()
-            if a_str and a_str not in seen_audiences:
-                seen_audiences.add(a_str)
-                audiences_ordered.append(a_str)
+    Every match of (?<!\w)keyword(?:s|es)?(?!\w) starts right after a non-word
+    character, so the trie is only walked from those positions (found by one C
+    regex scan) and no Aho-Corasick failure links are needed. Each walk stops at
+    the first character with no trie edge, so a scan costs at most the text
+    length times the longest keyword, however many keywords there are.
+    """
+
+    __slots__ = ("keywords", "_root", "_starts")
+
+    def __init__(self, keywords) -> None:
+        self.keywords: tuple[str, ...] = tuple(dict.fromkeys(k for k in keywords if k))
+        # Nested dicts keyed by character; "" holds the keywords a node completes.
+        self._root: dict = {}
+        for keyword in self.keywords:
+            for form in _surface_forms(keyword):
+                node = self._root
+                for ch in form:
+                    node = node.setdefault(ch, {})
+                node[""] = node.get("", ()) + (keyword,)
+        self._starts = _start_pattern(self._root)
+
+    @classmethod
+    def from_trie(cls, keywords: tuple[str, ...], root: dict) -> "KeywordIndex":
+        """An index over a trie built earlier, e.g. loaded from the rules artifact."""
+        index = cls.__new__(cls)
+        index.keywords = keywords
+        index._root = root
+        index._starts = _start_pattern(root)
+        return index
+
+    def scan(self, text_lower: str) -> set[str]:
+        """Keywords occurring in text_lower with the same boundaries as _keyword_occurs."""
+        found: set[str] = set()
+        if self._starts is None:
+            return found
+        root = self._root
+        text_len = len(text_lower)
+        for match in self._starts.finditer(text_lower):
+            node = root
+            for position in range(match.start(), text_len):
+                node = node.get(text_lower[position])
+                if node is None:
+                    break
+                completed = node.get("")
+                if completed and (
+                    position + 1 == text_len or not _is_word_char(text_lower[position + 1])
+                ):
+                    found.update(completed)
+        return found
+
+
+# Precompiled rules (python -m services.audience_artifact): header, then the
+# marshalled RuleSet. Marshal data is only valid for the Python that wrote it,
+# so the header pins the interpreter as well as the source file's hash.
+ARTIFACT_MAGIC = b"LKAR"
+ARTIFACT_FORMAT = 3
+_ARTIFACT_HEADER = struct.Struct("<4sHH16s32s")
+_CACHE_TAG = (sys.implementation.cache_tag or "").encode("ascii")[:16].ljust(16, b"\0")
+
+
+class RuleSet:
+    """Audience rules compiled once; recommending is then pure matching."""
+
+    __slots__ = ("rules", "version", "compiled_at", "index", "postings", "normalizer")
+
+    def __init__(self, rules: List[dict], version: Optional[str] = None) -> None:
+        compiled = (CompiledRule(rule) for rule in rules if isinstance(rule, dict))
+        # Rules without keywords or audiences never match.
+        self.rules = tuple(rule for rule in compiled if rule.keywords and rule.audiences)
+        self.version = version
+        # keyword -> ((rule index, term index), ...) over every rule.
+        postings: dict[str, list[tuple[int, int]]] = {}
+        for rule_index, rule in enumerate(self.rules):
+            for term_index, (keyword, _, _) in enumerate(rule.terms):
+                postings.setdefault(keyword, []).append((rule_index, term_index))
+        self.postings = {keyword: tuple(hits) for keyword, hits in postings.items()}
+        self.index = KeywordIndex(self.postings)
+        self.normalizer = Normalizer(self.index.keywords)
+        self.compiled_at = time.time()
+
+    def to_artifact(self, source_digest: str) -> bytes:
+        """Serialize the compiled set for load_artifact; source_digest is the rules file's sha256."""
+        header = _ARTIFACT_HEADER.pack(
+            ARTIFACT_MAGIC, ARTIFACT_FORMAT, marshal.version, _CACHE_TAG, bytes.fromhex(source_digest)
+        )
+        payload = (
+            self.version,
+            self.compiled_at,
+            tuple(rule.to_record() for rule in self.rules),
+            self.postings,
+            self.index.keywords,
+            self.index._root,
+            self.normalizer.state(),
+        )
+        return header + marshal.dumps(payload)
+
+    @classmethod
+    def from_artifact(cls, data, source_digest: str) -> Optional["RuleSet"]:
+        """The RuleSet in an artifact, or None if it was built from other rules or by another Python."""
+        if len(data) < _ARTIFACT_HEADER.size:
+            return None
+        magic, fmt, marshal_version, cache_tag, digest = _ARTIFACT_HEADER.unpack_from(data)
+        if (magic, fmt, marshal_version, cache_tag) != (ARTIFACT_MAGIC, ARTIFACT_FORMAT, marshal.version, _CACHE_TAG):
+            return None
+        if digest.hex() != source_digest:
+            return None
+        version, compiled_at, records, postings, keywords, root, normalizer = marshal.loads(
+            data[_ARTIFACT_HEADER.size:]
+        )
+        rule_set = cls.__new__(cls)
+        rule_set.rules = tuple(CompiledRule.from_record(record) for record in records)
+        rule_set.version = version
+        rule_set.postings = postings
+        rule_set.index = KeywordIndex.from_trie(keywords, root)
+        rule_set.normalizer = Normalizer.from_state(normalizer)
+        rule_set.compiled_at = compiled_at
+        return rule_set
+
+    def scan(self, text_lower: str) -> set[str]:
+        """Keywords in text_lower, counting inflected forms of a keyword as the keyword."""
+        return self.index.scan(self.normalizer.normalize(text_lower))
+
+    def matched_terms(self, text_lower: str) -> dict[int, list]:
+        """Rule index -> matched (keyword, weight, is_strong) terms in file order, from one scan."""
+        return self.terms_for_hits(self.scan(text_lower))
+
+    def terms_for_hits(self, keywords) -> dict[int, list]:
+        """matched_terms() for keywords already found by scan."""
+        hits: dict[int, list[int]] = {}
+        for keyword in keywords:
+            for rule_index, term_index in self.postings[keyword]:
+                hits.setdefault(rule_index, []).append(term_index)
+        return {
+            rule_index: [self.rules[rule_index].terms[i] for i in sorted(term_indexes)]
+            for rule_index, term_indexes in hits.items()
+        }
+
+    def recommend(self, text: str) -> tuple:
+        text_lower = (text or "").strip().lower()
+        if not text_lower:
+            return [DEFAULT_AUDIENCE], []
+        return self.recommend_hits(self.scan(text_lower))
+
+    def recommend_hits(self, keywords) -> tuple:
+        """recommend() for keywords already found by scan, e.g. merged from several paragraphs."""
+        matched_terms = self.terms_for_hits(keywords)
+        accepted = [i for i in sorted(matched_terms) if self.rules[i].accepts(matched_terms[i])]
+        audiences_ordered = self.audiences_for(accepted)
+        if not audiences_ordered:
+            return [DEFAULT_AUDIENCE], []
+        matched_rules = [{"keywords": self.rules[i].keywords, "audiences": self.rules[i].audiences} for i in accepted]
+        return audiences_ordered, matched_rules
+
+    def audiences_for(self, rule_indexes) -> list[str]:
+        """Audiences of the given accepted rules, first occurrence first."""
+        seen_audiences: set[str] = set()
+        audiences_ordered: list[str] = []
+        for rule_index in rule_indexes:
+            for a_str in self.rules[rule_index].output_audiences:
+                if a_str not in seen_audiences:
+                    seen_audiences.add(a_str)
+                    audiences_ordered.append(a_str)
+        return audiences_ordered
+
+
+def artifact_path(rules_path: Path) -> Path:
+    """Where the precompiled artifact of a rules file lives: next to it, with a .bin suffix."""
+    return Path(rules_path).with_suffix(".bin")
+
+
+def load_artifact(path: Path, source_digest: str) -> Optional[RuleSet]:
+    """Memory-map a rules artifact; None if missing, unreadable or not built from this source."""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return RuleSet.from_artifact(view, source_digest)
+    except (OSError, ValueError, EOFError, TypeError, BufferError) as exc:
+        logger.warning("Audience rules artifact %s ignored: %s", path, exc)
+        return None
+
+
+class RuleSource:
+    """
+    The active RuleSet of one rules file.
+
+    refresh() compiles the file again only when its size or modification time
+    changed and its content hash differs, and replaces rule_set in a single
+    assignment, so a request sees either the old or the new set. A file that
+    is missing or fails parse_rules leaves the last good RuleSet in place.
+    A precompiled artifact next to the file is used instead of compiling when
+    it was built from exactly this content.
+    """
 
-    if not audiences_ordered:
-        return [DEFAULT_AUDIENCE], []
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rule_set = RuleSet([])
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.error_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stat: Optional[tuple[int, int]] = None
+        self._digest: Optional[str] = None
+
+    def refresh(self) -> bool:
+        """Check the file once; True if a new RuleSet was swapped in."""
+        with self._lock:
+            self.checked_at = time.time()
+            try:
+                stat = os.stat(self.path)
+            except OSError as exc:
+                self._stat = None
+                return self._reject(f"cannot read {self.path}: {exc.strerror}")
+            if (stat.st_mtime_ns, stat.st_size) == self._stat:
+                return False
+            self._stat = (stat.st_mtime_ns, stat.st_size)
+
+            try:
+                raw = self.path.read_bytes()
+            except OSError as exc:
+                return self._reject(f"cannot read {self.path}: {exc.strerror}")
+            digest = hashlib.sha256(raw).hexdigest()
+            if digest == self._digest:
+                # Saved or copied without edits.
+                self.error = self.error_at = None
+                return False
+            rule_set = load_artifact(artifact_path(self.path), digest) if artifact_path(self.path).exists() else None
+            if rule_set is None:
+                try:
+                    rule_set = RuleSet(parse_rules(raw), version=digest[:12])
+                except ValueError as exc:
+                    return self._reject(str(exc))
+
+            self.rule_set = rule_set
+            self._digest = digest
+            self.error = self.error_at = None
+        metrics.increment("audience_rules.reloaded")
+        logger.info(
+            "Audience rules %s loaded: version %s, %d rules", self.path, rule_set.version, len(rule_set.rules)
+        )
+        return True
+
+    def _reject(self, error: str) -> bool:
+        if error != self.error:
+            metrics.increment("audience_rules.rejected")
+            logger.warning(
+                "Audience rules %s not loaded, keeping version %s: %s", self.path, self.rule_set.version, error
+            )
+            self.error_at = time.time()
+        self.error = error
+        return False
+
+    def status(self) -> dict[str, Any]:
+        rule_set = self.rule_set
+        return {
+            "source": "file",
+            "path": str(self.path),
+            "version": rule_set.version,
+            "compiled_at": rule_set.compiled_at if rule_set.version else None,
+            "rule_count": len(rule_set.rules),
+            "keyword_count": len(rule_set.index.keywords),
+            "checked_at": self.checked_at,
+            "error": self.error,
+            "error_at": self.error_at,
+        }
+
+
+_sources_lock = threading.Lock()
+_sources: dict[Path, RuleSource] = {}
+_watcher: Optional[threading.Thread] = None
+# Replaces the default rules file as the source of rule_source() when set
+# (services.audience_firestore). Same interface: rule_set, refresh(), status().
+_primary_source: Optional[Any] = None
+
+
+def set_primary_source(source: Any) -> None:
+    global _primary_source
+    _primary_source = source
+
+
+def _watch_forever() -> None:
+    while True:
+        time.sleep(AUDIENCE_RULES_POLL_SECONDS)
+        with _sources_lock:
+            sources = list(_sources.values())
+        for source in sources:
+            try:
+                source.refresh()
+            except Exception:
+                logger.exception("Audience rules watcher error for %s", source.path)
+
+
+def rule_source(rules_path: Optional[Path] = None) -> RuleSource:
+    """The watched source of a rules file, loaded synchronously on first use."""
+    global _watcher
+    if rules_path is None and _primary_source is not None:
+        return _primary_source
+    path = Path(rules_path or DEFAULT_RULES_PATH)
+    with _sources_lock:
+        source = _sources.get(path)
+        if source is None:
+            source = RuleSource(path)
+            source.refresh()
+            _sources[path] = source
+        if AUDIENCE_RULES_POLL_SECONDS > 0 and _watcher is None:
+            _watcher = threading.Thread(target=_watch_forever, name="audience-rules", daemon=True)
+            _watcher.start()
+    return source
+
+
+def get_rule_set(rules_path: Optional[Path] = None) -> RuleSet:
+    """
+    The active compiled rules for a rules file.
+
+    With AUDIENCE_RULES_POLL_SECONDS > 0 the watcher thread picks up changes;
+    with 0 the file is checked on every call.
+    """
+    source = rule_source(rules_path)
+    if AUDIENCE_RULES_POLL_SECONDS <= 0:
+        source.refresh()
+    return source.rule_set
+
+
+# (rules version, text hash) -> (audiences, matched_rules) of recommend_audiences, as tuples.
+# A reloaded rules file has a new version, so its old entries are never read again.
+audience_result_cache = LRUCache(AUDIENCE_CACHE_MAX_ENTRIES)
 
-    return audiences_ordered, matched_rules
+
+def _recommend_cached(rule_set: RuleSet, text: str) -> tuple:
+    if rule_set.version is None or AUDIENCE_CACHE_MAX_ENTRIES <= 0:
+        return rule_set.recommend(text)
+    text_lower = (text or "").strip().lower()
+    key = f"{rule_set.version}:{hashlib.blake2b(text_lower.encode('utf-8'), digest_size=16).hexdigest()}"
+    cached = audience_result_cache.get(key)
+    if cached is None:
+        audiences, matched_rules = rule_set.recommend(text_lower)
+        # Stored as tuples, so no caller can edit the cached answer in place.
+        cached = (
+            tuple(audiences),
+            tuple((tuple(rule["keywords"]), tuple(rule["audiences"])) for rule in matched_rules),
+        )
+        audience_result_cache.put(key, cached)
+    audiences, matched_rules = cached
+    return list(audiences), [
+        {"keywords": list(keywords), "audiences": list(rule_audiences)} for keywords, rule_audiences in matched_rules
+    ]
+
+
+def recommend_audiences(
+    text: str,
+    rules: Union[List[dict], RuleSet, None] = None,
+    rules_path: Optional[Path] = None,
+) -> tuple:
+    """
+    Rule-based audience recommendation from text (e.g. refined announcement).
+
+    - text: the announcement text to check (refined or original).
+    - rules: optional in-memory list or compiled RuleSet; if None, the active
+      RuleSet of rules_path is used. Results of versioned RuleSets (loaded
+      from a rules file) are cached per text and version.
+    - rules_path: optional path to JSON; used if rules is None.
+
+    Returns:
+        (audiences, matched_rules)
+        - audiences: list of audience group names (no duplicates, order preserved).
+        - matched_rules: list of {"keywords": [...], "audiences": [...]} that matched (for transparency).
+    If no rule matches, audiences = [DEFAULT_AUDIENCE], matched_rules = [].
+    """
+    if rules is None:
+        rule_set = get_rule_set(rules_path)
+    elif isinstance(rules, RuleSet):
+        rule_set = rules
+    else:
+        rule_set = RuleSet(rules)
+    return _recommend_cached(rule_set, text)
@@ -0,0 +1,302 @@
+"""
+Deferred, low-priority refinement queue.
+
+Scheduled announcements and archive clean-ups do not need an answer right
+away. They are queued here with an optional "not before" time and deadline,
+persisted in SQLite (BATCH_QUEUE_PATH) so a restart does not lose them, and
+drained by one background worker:
+
+- only jobs whose not-before time has passed are eligible, earliest deadline first;
+- a job starts only after interactive /refine traffic has been idle for
+  BATCH_QUIET_SECONDS, unless its deadline is close;
+- jobs are spaced at least BATCH_DRAIN_INTERVAL_SECONDS apart.
+
+Jobs go through run_refinement like any other refinement, so model results
+land in the refinement cache and a later /refine of the same text and signer
+is a cache hit. Finished results are also kept in the queue database and put
+back into the cache after a restart.
+"""
+
+import logging
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from config.ai_settings import (
+    BATCH_DRAIN_INTERVAL_SECONDS,
+    BATCH_QUEUE_PATH,
+    BATCH_QUIET_SECONDS,
+    REFINEMENT_CACHE_MAX_ENTRIES,
+)
+from llm import metrics
+from llm.cache import refinement_cache
+from llm.pipeline import refinement_cache_key, run_refinement
+from services.ai_refinement import normalize_and_validate_raw_text
+from services.traffic import interactive_gate
+
+logger = logging.getLogger(__name__)
+
+# A job this close to its deadline no longer waits for interactive traffic to go quiet.
+_URGENT_SECONDS = 5 * 60
+# Finished jobs are kept this long for polling and cache warm-up.
+_RESULT_TTL_SECONDS = 7 * 24 * 60 * 60
+# Longest sleep while nothing is due; submissions wake the worker early.
+_MAX_IDLE_WAIT_SECONDS = 60.0
+
+_COLUMNS = (
+    "job_id, cache_key, raw_text, signer_name, signer_title, not_before, deadline,"
+    " status, refined_text, source, error, created_at, finished_at"
+)
+
+
+def _default_queue_path() -> Path:
+    """Writable data path: dev = backend/data; PyInstaller = data/ next to the exe."""
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().parent / "data" / "batch_queue.sqlite3"
+    return Path(__file__).resolve().parent.parent / "data" / "batch_queue.sqlite3"
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """Snapshot of one queued refinement."""
+
+    job_id: str
+    cache_key: str
+    raw_text: str
+    signer_name: Optional[str]
+    signer_title: Optional[str]
+    not_before: float
+    deadline: Optional[float]
+    status: str  # queued, running, done, failed
+    refined_text: Optional[str]
+    source: Optional[str]  # RefinementResult.source once done
+    error: Optional[str]
+    created_at: float
+    finished_at: Optional[float]
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Batch queue kept in memory only (%s): %s", path, exc)
+        db = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS batch_jobs ("
+        " job_id TEXT PRIMARY KEY,"
+        " cache_key TEXT NOT NULL,"
+        " raw_text TEXT NOT NULL,"
+        " signer_name TEXT,"
+        " signer_title TEXT,"
+        " not_before REAL NOT NULL,"
+        " deadline REAL,"
+        " status TEXT NOT NULL,"
+        " refined_text TEXT,"
+        " source TEXT,"
+        " error TEXT,"
+        " created_at REAL NOT NULL,"
+        " finished_at REAL)"
+    )
+    db.execute("CREATE INDEX IF NOT EXISTS batch_jobs_due ON batch_jobs (status, not_before)")
+    db.execute("CREATE INDEX IF NOT EXISTS batch_jobs_key ON batch_jobs (cache_key)")
+    return db
+
+
+_lock = threading.Lock()
+_db = _connect(Path(BATCH_QUEUE_PATH) if BATCH_QUEUE_PATH else _default_queue_path())
+_wake = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def _row_to_job(row: Optional[tuple]) -> Optional[BatchJob]:
+    return BatchJob(*row) if row is not None else None
+
+
+def submit_batch_job(
+    raw_text: str,
+    signature_name: Optional[str] = None,
+    signature_title: Optional[str] = None,
+    not_before: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> BatchJob:
+    """
+    Queue one deferred refinement (times are Unix timestamps).
+
+    The same text and signer already queued, running or refined by the model
+    returns that job instead of a new one; a job that ended on the fallback
+    draft is queued again.
+
+    Raises:
+        ValueError: If the text fails input validation or the deadline is before not_before.
+    """
+    stripped = normalize_and_validate_raw_text(raw_text)
+    now = time.time()
+    not_before = max(now, not_before or now)
+    if deadline is not None and deadline < not_before:
+        raise ValueError("deadline must not be before not_before.")
+
+    key = refinement_cache_key(stripped, signature_name, signature_title)
+    with _lock:
+        existing = _row_to_job(
+            _db.execute(
+                f"SELECT {_COLUMNS} FROM batch_jobs"
+                " WHERE cache_key = ? AND status != 'failed' AND IFNULL(source, '') != 'fallback'"
+                " ORDER BY created_at DESC LIMIT 1",
+                (key,),
+            ).fetchone()
+        )
+        if existing is not None:
+            return existing
+
+        cached = refinement_cache.get(key)
+        job = BatchJob(
+            job_id=uuid.uuid4().hex,
+            cache_key=key,
+            raw_text=stripped,
+            signer_name=signature_name,
+            signer_title=signature_title,
+            not_before=not_before,
+            deadline=deadline,
+            status="done" if cached is not None else "queued",
+            refined_text=cached,
+            source="cache" if cached is not None else None,
+            error=None,
+            created_at=now,
+            finished_at=now if cached is not None else None,
+        )
+        _db.execute(
+            f"INSERT INTO batch_jobs ({_COLUMNS}) VALUES ({', '.join('?' * 13)})",
+            tuple(job.__dict__.values()),
+        )
+
+    metrics.increment("batch.submitted")
+    if job.status == "queued":
+        _ensure_worker()
+        _wake.set()
+    return job
+
+
+def get_batch_job(job_id: str) -> Optional[BatchJob]:
+    with _lock:
+        return _row_to_job(
+            _db.execute(f"SELECT {_COLUMNS} FROM batch_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        )
+
+
+def batch_queue_stats() -> dict:
+    with _lock:
+        counts = dict(_db.execute("SELECT status, COUNT(*) FROM batch_jobs GROUP BY status"))
+    return {status: counts.get(status, 0) for status in ("queued", "running", "done", "failed")}
+
+
+def _next_due(now: float) -> tuple[Optional[BatchJob], Optional[float]]:
+    """The due job with the earliest deadline, or the time the next job becomes due."""
+    with _lock:
+        job = _row_to_job(
+            _db.execute(
+                f"SELECT {_COLUMNS} FROM batch_jobs"
+                " WHERE status = 'queued' AND not_before <= ?"
+                " ORDER BY deadline IS NULL, deadline, created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+        )
+        if job is not None:
+            return job, None
+        (next_at,) = _db.execute(
+            "SELECT MIN(not_before) FROM batch_jobs WHERE status = 'queued'"
+        ).fetchone()
+    return None, next_at
+
+
+def _finish(job: BatchJob, status: str, refined_text=None, source=None, error=None) -> None:
+    now = time.time()
+    with _lock:
+        _db.execute(
+            "UPDATE batch_jobs SET status = ?, refined_text = ?, source = ?, error = ?, finished_at = ?"
+            " WHERE job_id = ?",
+            (status, refined_text, source, error, now, job.job_id),
+        )
+    metrics.increment(f"batch.{status}")
+    if job.deadline is not None and now > job.deadline:
+        metrics.increment("batch.late")
+
+
+def _run(job: BatchJob) -> None:
+    with _lock:
+        _db.execute("UPDATE batch_jobs SET status = 'running' WHERE job_id = ?", (job.job_id,))
+    try:
+        result = run_refinement(
+            job.raw_text,
+            signature_name=job.signer_name,
+            signature_title=job.signer_title,
+        )
+    except Exception as exc:
+        logger.warning("Batch refinement %s failed: %s", job.job_id, exc)
+        _finish(job, "failed", error=str(exc))
+        return
+    _finish(job, "done", refined_text=result.text, source=result.source)
+
+
+def _drain_forever() -> None:
+    while True:
+        now = time.time()
+        job, next_at = _next_due(now)
+        if job is None:
+            wait = _MAX_IDLE_WAIT_SECONDS if next_at is None else next_at - now
+            _wake.wait(timeout=min(_MAX_IDLE_WAIT_SECONDS, max(0.0, wait)))
+            _wake.clear()
+            continue
+
+        urgent = job.deadline is not None and job.deadline - now <= _URGENT_SECONDS
+        idle = interactive_gate.idle_seconds()
+        if not urgent and idle < BATCH_QUIET_SECONDS:
+            # Interactive traffic has priority; look again once it could have gone quiet.
+            time.sleep(min(1.0, BATCH_QUIET_SECONDS - idle) if idle else 1.0)
+            continue
+
+        try:
+            _run(job)
+        except Exception:
+            logger.exception("Batch queue worker error")
+        time.sleep(BATCH_DRAIN_INTERVAL_SECONDS)
+
+
+def _ensure_worker() -> None:
+    global _worker
+    with _lock:
+        if _worker is not None and _worker.is_alive():
+            return
+        _worker = threading.Thread(target=_drain_forever, name="refine-batch", daemon=True)
+        _worker.start()
+
+
+def _recover() -> None:
+    """Requeue jobs interrupted by a restart, drop old results and re-warm the cache."""
+    now = time.time()
+    with _lock:
+        _db.execute("UPDATE batch_jobs SET status = 'queued' WHERE status = 'running'")
+        _db.execute(
+            "DELETE FROM batch_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+            (now - _RESULT_TTL_SECONDS,),
+        )
+        rows = _db.execute(
+            "SELECT cache_key, refined_text FROM batch_jobs"
+            " WHERE status = 'done' AND source != 'fallback' AND refined_text IS NOT NULL"
+            " ORDER BY finished_at DESC LIMIT ?",
+            (REFINEMENT_CACHE_MAX_ENTRIES,),
+        ).fetchall()
+        (queued,) = _db.execute("SELECT COUNT(*) FROM batch_jobs WHERE status = 'queued'").fetchone()
+    # Oldest first, so the most recent results end up most recently used.
+    for key, refined_text in reversed(rows):
+        refinement_cache.put(key, refined_text)
+    if queued:
+        _ensure_worker()
+
+
+_recover()
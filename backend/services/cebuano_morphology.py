@@ -0,0 +1,137 @@
+"""
+Cebuano/Surigaonon affix normalization for audience keyword matching.
+
+Announcements inflect the words the audience rules list: "gibakunahan",
+"nagtambal", "tinambalan", "gatinda" instead of "bakuna", "tambal", "tinda".
+Rather than listing every inflection in config/audience_rules.json, each
+RuleSet builds a Normalizer from its own keywords. Text is normalized once
+per scan, rewriting every word that is a known prefix + keyword stem +
+suffix (or carries the -in-/-um- infix) to the bare stem, so the KeywordIndex
+keeps one entry per keyword and still reads the text in a single pass.
+
+Only the rules' own single-word keywords of MIN_STEM_LENGTH letters or more
+are stems, and a word that appears in any keyword is never rewritten, so
+every keyword that matched before still matches ("tindahan" stays itself even
+though it is tinda + -han). Infixes apply only to stems of
+INFIX_MIN_STEM_LENGTH letters: on short stems they mostly hit other words
+("binata" is a young man, not b-in-ata). Real words that still look like an
+inflected stem are listed in NEVER_REWRITE.
+"""
+
+import re
+from typing import Iterable
+
+from llm.automaton import trie_alternation
+
+# Compound prefixes are listed whole; order does not matter (they become one trie).
+PREFIXES = (
+    "mag", "nag", "pag", "ga", "gi", "gin", "gina", "ma", "na", "maka", "naka", "ka", "ika",
+    "i", "ipa", "pa", "magpa", "nagpa", "pagpa", "gipa", "ginpa", "pang", "mang", "nang",
+    "gipang", "nagpaka", "magpaka",
+)
+# -in- / -um- go after the first consonant ("t-in-ambal"), or before a vowel ("in-atiman").
+INFIXES = ("in", "um")
+# With the linking h after vowel-final stems: bakuna-han, tambal-an.
+SUFFIXES = ("on", "an", "i", "hon", "han", "hi")
+# Shorter stems ("uma", "ani") would turn unrelated words into keywords.
+MIN_STEM_LENGTH = 4
+# Infixed short stems are mostly other words: "binata" (young man) is not b-in-ata.
+INFIX_MIN_STEM_LENGTH = 5
+# Words that read as prefix + stem + suffix but mean something else; never rewritten.
+NEVER_REWRITE = frozenset({
+    "binata",  # young man, not bata
+    # bata "to endure, suffer" with its verb prefixes, not bata "child"
+    "mabata", "nagbata", "magbata", "pagbata", "gibata", "gabata", "nagabata", "ginabata",
+    "bataan",  # place name, not bata
+    "gipulong",  # said, not pulong (meeting)
+})
+
+_WORD = re.compile(r"\w+")
+_VOWELS = frozenset("aeiou")
+
+
+def _infixed(stem: str) -> Iterable[str]:
+    for infix in INFIXES:
+        if stem[0] in _VOWELS:
+            yield infix + stem
+        else:
+            yield stem[0] + infix + stem[1:]
+
+
+class Normalizer:
+    """Rewrites inflected forms of the given keywords' stems to the stems."""
+
+    __slots__ = ("stems", "cores", "protected", "source", "_pattern")
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        keywords = [k for k in keywords if k]
+        # Words of any keyword, including multi-word ones, are left as written.
+        self.protected = NEVER_REWRITE | frozenset(word for keyword in keywords for word in _WORD.findall(keyword))
+        self.stems = tuple(
+            sorted(k for k in set(keywords) if len(k) >= MIN_STEM_LENGTH and k.isascii() and k.isalpha())
+        )
+        # Stem or infixed stem -> stem.
+        cores: dict[str, str] = {}
+        for stem in self.stems:
+            cores.setdefault(stem, stem)
+            if len(stem) >= INFIX_MIN_STEM_LENGTH:
+                for form in _infixed(stem):
+                    cores.setdefault(form, stem)
+        self.cores = cores
+        self.source = _pattern_source(self.stems)
+        self._pattern = re.compile(self.source) if self.source else None
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "Normalizer":
+        """A Normalizer from state() saved earlier, e.g. in the rules artifact."""
+        normalizer = cls.__new__(cls)
+        normalizer.stems, normalizer.cores, protected, normalizer.source = state
+        # NEVER_REWRITE may have grown since the artifact was built.
+        normalizer.protected = NEVER_REWRITE | protected
+        normalizer._pattern = re.compile(normalizer.source) if normalizer.source else None
+        return normalizer
+
+    def state(self) -> tuple:
+        return self.stems, self.cores, self.protected, self.source
+
+    def normalize(self, text_lower: str) -> str:
+        """text_lower with every inflected stem replaced by the stem; other text is unchanged."""
+        if self._pattern is None:
+            return text_lower
+        return self._pattern.sub(self._replace, text_lower)
+
+    def _replace(self, match: re.Match) -> str:
+        word = match.group()
+        if word in self.protected:
+            return word
+        # Infixed short stems match the pattern but are not in cores.
+        return self.cores.get(match.group("core"), word)
+
+
+def _pattern_source(stems: tuple) -> str:
+    """
+    Regex for prefix? + stem with optional infix + suffix?, "" without stems.
+
+    The infix is an optional group after the first letter of each stem rather
+    than infixed copies of every stem, which keeps the pattern (and its
+    compile time on every rules reload) close to the size of the stem list.
+    It therefore also matches infixed short stems; _replace leaves those
+    words alone because cores has no entry for them.
+    """
+    if not stems:
+        return ""
+    infix = trie_alternation(INFIXES)
+    by_first: dict[str, list[str]] = {}
+    for stem in stems:
+        by_first.setdefault(stem[0], []).append(stem[1:])
+    branches = [
+        re.escape(first) + ("" if first in _VOWELS else f"(?:{infix})?") + f"(?:{trie_alternation(rests)})"
+        for first, rests in sorted(by_first.items())
+    ]
+    vowel_stems = [stem for stem in stems if stem[0] in _VOWELS and len(stem) >= INFIX_MIN_STEM_LENGTH]
+    if vowel_stems:
+        branches.append(f"{infix}(?:{trie_alternation(vowel_stems)})")
+    return (
+        rf"(?<!\w)(?:{trie_alternation(PREFIXES)})?(?P<core>{'|'.join(branches)})"
+        rf"(?:{trie_alternation(SUFFIXES)})?(?!\w)"
+    )
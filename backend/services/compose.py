@@ -0,0 +1,100 @@
+"""
+One round trip per draft: refined text, suggested title and audiences.
+
+The model call (refine_text) is by far the slowest step, so it runs on the
+request thread while a small pool scores the raw draft for audiences through
+the live composer cache (services.audience_live). That raw-draft answer is
+what the caller gets when refinement fails, so a draft still has audiences
+and a title when the model is down.
+
+When refinement succeeds, the refined text is scored through the same
+session. The model rewrites most paragraphs, so most are scanned again; only
+the ones it left as they were (times, lists, signatures) reuse the raw
+draft's hits. Scanning and the title are regex work well under a
+millisecond, which a thread of their own would not make faster.
+"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from services.ai_refinement import normalize_and_validate_raw_text, refine_text, suggest_announcement_title
+from services.audience_live import drop_live_session, recommend_live
+from services.audience_rules import RuleSet, get_rule_set
+
+# Raw-draft scans are short CPU work; two threads keep up with any number of waiting model calls.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="compose-audiences")
+
+
+class Composition:
+    """
+    Result of compose_announcement. refined_text is None if refinement failed;
+    the title and audiences are then those of the raw draft.
+    """
+
+    __slots__ = (
+        "original_text",
+        "refined_text",
+        "suggested_title",
+        "audiences",
+        "matched_rules",
+        "paragraphs",
+        "rescanned_paragraphs",
+    )
+
+    def __init__(self, original_text: str, refined_text: Optional[str]) -> None:
+        self.original_text = original_text
+        self.refined_text = refined_text
+        self.suggested_title: Optional[str] = None
+        self.audiences: list[str] = []
+        self.matched_rules: list[dict] = []
+        self.paragraphs = 0
+        self.rescanned_paragraphs = 0
+
+
+def compose_announcement(
+    raw_text: str,
+    signature_name: Optional[str] = None,
+    signature_title: Optional[str] = None,
+    previous_raw_text: Optional[str] = None,
+    previous_refined_text: Optional[str] = None,
+    session_id: Optional[str] = None,
+    rule_set: Optional[RuleSet] = None,
+) -> Composition:
+    """
+    Refine raw_text and recommend audiences and a title for the result.
+
+    session_id keeps the paragraph hits of earlier rounds of the same draft;
+    without one, the hits are dropped when the call returns. If refinement
+    fails, the result carries the raw draft's audiences and title.
+
+    Raises:
+        ValueError: If the announcement is empty, shorter than 10 characters or longer than MAX_INPUT_CHARS.
+    """
+    stripped = normalize_and_validate_raw_text(raw_text)
+    rule_set = rule_set or get_rule_set()
+    session = f"compose:{session_id or uuid.uuid4().hex}"
+
+    raw_scan = _executor.submit(recommend_live, session, stripped, rule_set)
+    try:
+        try:
+            refined = refine_text(
+                stripped,
+                signature_name=signature_name,
+                signature_title=signature_title,
+                previous_raw_text=previous_raw_text,
+                previous_refined_text=previous_refined_text,
+            )
+        finally:
+            # The refined text is scored against the raw draft's paragraphs.
+            scored = raw_scan.result()
+        if refined is not None:
+            scored = recommend_live(session, refined, rule_set)
+    finally:
+        if session_id is None:
+            drop_live_session(session)
+
+    composition = Composition(stripped, refined)
+    composition.audiences, composition.matched_rules, composition.paragraphs, composition.rescanned_paragraphs = scored
+    composition.suggested_title = suggest_announcement_title(refined if refined is not None else stripped)
+    return composition
@@ -0,0 +1,180 @@
+"""
+Speculative background refinement while the admin is typing.
+
+Prefetch jobs run on a dedicated low-priority worker. A job only starts its
+LLM call when no interactive /refine is in flight, is dropped when a newer
+draft arrives for the same session, and parks its result in the refinement
+cache so the real /refine returns on a cache hit.
+"""
+
+import itertools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional
+
+from config.ai_settings import PREFETCH_MAX_WORKERS
+from llm.cache import refinement_cache
+from llm.pipeline import refinement_cache_key, run_refinement
+from services.traffic import interactive_gate
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting job re-checks whether it has been superseded.
+_IDLE_POLL_SECONDS = 0.5
+
+
+class _PrefetchJob:
+    __slots__ = ("key", "session_id", "generation", "started", "future")
+
+    def __init__(self, key: str, session_id: str, generation: int) -> None:
+        self.key = key
+        self.session_id = session_id
+        self.generation = generation
+        self.started = False
+        self.future: Future = Future()
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=PREFETCH_MAX_WORKERS,
+    thread_name_prefix="refine-prefetch",
+)
+_lock = threading.Lock()
+# Session -> generation of its newest job. Generations are unique across
+# sessions, so an entry can be dropped once its job is done: a missing entry
+# supersedes every older job of the session, like a newer generation does.
+_generations = itertools.count(1)
+_latest_generation: dict[str, int] = {}
+_jobs_by_key: dict[str, _PrefetchJob] = {}
+_stats = {"queued": 0, "cached": 0, "superseded": 0, "completed": 0, "failed": 0}
+
+
+def submit_prefetch(
+    raw_text: str,
+    session_id: str,
+    signature_name: Optional[str] = None,
+    signature_title: Optional[str] = None,
+) -> str:
+    """
+    Queue a background refinement for the latest draft of a session.
+
+    A newer draft of the same session supersedes its queued older drafts, so
+    every composer needs its own session_id.
+
+    Returns "cached" when the draft is already refined, "pending" when the
+    same draft is already queued or running, and "queued" otherwise.
+    """
+    key = refinement_cache_key(raw_text, signature_name, signature_title)
+    session = session_id.strip()
+
+    with _lock:
+        if key in refinement_cache:
+            # Older drafts of the session are superseded; nothing new to track.
+            _latest_generation.pop(session, None)
+            _stats["cached"] += 1
+            return "cached"
+
+        generation = next(_generations)
+        _latest_generation[session] = generation
+
+        existing = _jobs_by_key.get(key)
+        if existing is not None:
+            # Same draft again: keep the existing job alive for this session.
+            if existing.session_id != session:
+                _release_session(existing)
+            existing.session_id = session
+            existing.generation = generation
+            return "pending"
+
+        job = _PrefetchJob(key, session, generation)
+        _jobs_by_key[key] = job
+        _stats["queued"] += 1
+
+    _executor.submit(_run_job, job, raw_text, signature_name, signature_title)
+    return "queued"
+
+
+def _release_session(job: _PrefetchJob) -> None:
+    """Drop the job's session entry if the job is that session's newest; caller holds _lock."""
+    if _latest_generation.get(job.session_id) == job.generation:
+        del _latest_generation[job.session_id]
+
+
+def _is_superseded(job: _PrefetchJob) -> bool:
+    with _lock:
+        return _latest_generation.get(job.session_id) != job.generation
+
+
+def _run_job(
+    job: _PrefetchJob,
+    raw_text: str,
+    signature_name: Optional[str],
+    signature_title: Optional[str],
+) -> None:
+    refined = None
+    try:
+        # Low-priority lane: never start a model call while /refine is busy.
+        while not interactive_gate.wait_until_idle(timeout=_IDLE_POLL_SECONDS):
+            if _is_superseded(job):
+                break
+
+        with _lock:
+            superseded = _latest_generation.get(job.session_id) != job.generation
+            if superseded:
+                _stats["superseded"] += 1
+            else:
+                job.started = True
+
+        if not superseded:
+            result = run_refinement(
+                raw_text,
+                signature_name=signature_name,
+                signature_title=signature_title,
+            )
+            if result.source != "fallback":
+                refined = result.text
+            with _lock:
+                _stats["completed"] += 1
+    except Exception as exc:
+        logger.warning("Prefetch refinement failed: %s", exc)
+        with _lock:
+            _stats["failed"] += 1
+    finally:
+        with _lock:
+            if _jobs_by_key.get(job.key) is job:
+                del _jobs_by_key[job.key]
+            _release_session(job)
+        job.future.set_result(refined)
+
+
+def wait_for_running_prefetch(
+    raw_text: str,
+    signature_name: Optional[str] = None,
+    signature_title: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Join a prefetch that is already calling the model for this exact draft.
+
+    Queued jobs are not joined: they wait for interactive traffic to finish,
+    so joining them from an interactive request would stall it.
+    """
+    key = refinement_cache_key(raw_text, signature_name, signature_title)
+    with _lock:
+        job = _jobs_by_key.get(key)
+        if job is None or not job.started:
+            return None
+
+    try:
+        return job.future.result(timeout=timeout)
+    except FutureTimeoutError:
+        return None
+
+
+def prefetch_stats() -> dict:
+    with _lock:
+        stats = dict(_stats)
+        stats["pending"] = len(_jobs_by_key)
+        stats["sessions"] = len(_latest_generation)
+    return stats
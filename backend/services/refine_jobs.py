@@ -0,0 +1,167 @@
+"""
+Fallback-first refinement jobs.
+
+The caller gets the deterministic fallback draft immediately together with a
+job ID. The model-refined text is produced in the background and delivered
+through polling or server-sent events once refine_with_retry finishes.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from config.ai_settings import REFINE_JOB_MAX_WORKERS
+from llm.cache import refinement_cache
+from llm.pipeline import build_fallback_draft, refinement_cache_key
+from services.ai_refinement import normalize_and_validate_raw_text, refine_text
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs are kept this long so slow clients can still collect them.
+_JOB_TTL_SECONDS = 15 * 60
+_MAX_JOBS = 500
+
+
+class RefineJob:
+    """State of one background refinement."""
+
+    __slots__ = (
+        "job_id",
+        "original_text",
+        "draft_text",
+        "refined_text",
+        "status",
+        "error",
+        "created_at",
+        "finished_at",
+        "_done",
+    )
+
+    def __init__(self, original_text: str, draft_text: str) -> None:
+        self.job_id = uuid.uuid4().hex
+        self.original_text = original_text
+        self.draft_text = draft_text
+        self.refined_text: Optional[str] = None
+        self.status = "pending"  # pending, running, done, failed
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _finish(self, status: str) -> None:
+        self.status = status
+        self.finished_at = time.time()
+        self._done.set()
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=REFINE_JOB_MAX_WORKERS,
+    thread_name_prefix="refine-job",
+)
+_lock = threading.Lock()
+_jobs: "OrderedDict[str, RefineJob]" = OrderedDict()
+
+
+def start_refine_job(
+    raw_text: str,
+    signature_name: Optional[str] = None,
+    signature_title: Optional[str] = None,
+    previous_raw_text: Optional[str] = None,
+    previous_refined_text: Optional[str] = None,
+) -> RefineJob:
+    """
+    Build the fallback draft now and upgrade it with the model in the background.
+
+    A draft already in the refinement cache yields a job that is done at once.
+
+    Raises:
+        ValueError: If the announcement fails input validation.
+    """
+    stripped = normalize_and_validate_raw_text(raw_text)
+
+    cached = refinement_cache.get(
+        refinement_cache_key(stripped, signature_name, signature_title)
+    )
+    if cached is not None:
+        job = RefineJob(stripped, cached)
+        job.refined_text = cached
+        job._finish("done")
+        _register(job)
+        return job
+
+    job = RefineJob(
+        stripped,
+        build_fallback_draft(
+            stripped,
+            signature_name=signature_name,
+            signature_title=signature_title,
+        ),
+    )
+    _register(job)
+    _executor.submit(
+        _run_job,
+        job,
+        signature_name,
+        signature_title,
+        previous_raw_text,
+        previous_refined_text,
+    )
+    return job
+
+
+def get_refine_job(job_id: str) -> Optional[RefineJob]:
+    with _lock:
+        return _jobs.get(job_id)
+
+
+def _register(job: RefineJob) -> None:
+    now = time.time()
+    with _lock:
+        _jobs[job.job_id] = job
+        for job_id in list(_jobs):
+            existing = _jobs[job_id]
+            expired = existing.finished and now - (existing.finished_at or now) > _JOB_TTL_SECONDS
+            if expired or (len(_jobs) > _MAX_JOBS and existing.finished):
+                del _jobs[job_id]
+
+
+def _run_job(
+    job: RefineJob,
+    signature_name: Optional[str],
+    signature_title: Optional[str],
+    previous_raw_text: Optional[str],
+    previous_refined_text: Optional[str],
+) -> None:
+    job.status = "running"
+    try:
+        refined = refine_text(
+            job.original_text,
+            signature_name=signature_name,
+            signature_title=signature_title,
+            previous_raw_text=previous_raw_text,
+            previous_refined_text=previous_refined_text,
+        )
+    except Exception as exc:
+        logger.warning("Refine job %s failed: %s", job.job_id, exc)
+        job.error = str(exc)
+        job._finish("failed")
+        return
+
+    if not refined:
+        job.error = "Text refinement failed."
+        job._finish("failed")
+        return
+
+    job.refined_text = refined
+    job._finish("done")
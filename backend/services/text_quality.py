@@ -0,0 +1,211 @@
+"""
+Character-trigram gibberish scorer for input admission.
+
+Text is folded to 27 symbols (a-z plus one word boundary) and scored as the
+average log-likelihood of each character given the two before it, under a
+model trained on Cebuano announcements and English prompt text. Real posts
+in either language score well above keyboard mashes and repeated characters.
+Numbers, dates and abbreviations score like junk, so a low score rejects
+text only when its content words alone score low too, and short posts made
+mostly of them ("Sched: MWF 8-5, BHS") are never rejected.
+
+The model ships as config/char_trigrams.bin: one unsigned byte per trigram,
+holding -log2 P(c | a, b) in sixteenths of a bit (27**3 = 19683 bytes). It is
+read once at import. Rebuild it after changing the training corpus with:
+
+    python -m services.text_quality
+"""
+
+import logging
+import math
+import re
+import sys
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+ALPHABET_SIZE = 27  # word boundary + a-z
+TABLE_SIZE = ALPHABET_SIZE**3
+_SCALE = 16  # stored values are sixteenths of a bit
+_SMOOTHING = 0.5
+
+# Average bits per character; real text scores above, gibberish below.
+# Calibrated with `python -m benchmarks.gibberish`.
+GIBBERISH_THRESHOLD = -4.5
+
+# Verdicts only need a sample; long inputs are scored on their first characters.
+MAX_SCORED_CHARS = 2000
+
+# Before rejecting, text is rescored on its words of this many letters or more.
+MIN_WORD_LETTERS = 3
+# Capitalized (BHS, NCIP) or vowel-less short words (brgy, mtg) are abbreviations.
+MAX_ABBREVIATION_LETTERS = 4
+# Inputs this short that are mostly numbers and capitalized abbreviations
+# ("4Ps FDS 9AM DSWD") are not scored at all.
+TERSE_INPUT_CHARS = 60
+
+_NON_LETTERS = re.compile(r"[^a-z]+")
+_WORDS = re.compile(r"[^\W\d_]+")
+_TOKENS = re.compile(r"[^\W_]+")
+_DIGIT = re.compile(r"\d")
+_VOWELS = re.compile(r"[aeiou]", re.IGNORECASE)
+
+
+def _fold_table() -> dict[int, str]:
+    """Accented Latin letters (ñ, é, ...) fold to their base letter."""
+    table = {}
+    for cp in range(0xC0, 0x250):
+        base = unicodedata.normalize("NFKD", chr(cp))[0]
+        if base.isascii() and base.isalpha():
+            table[cp] = base.lower()
+    return table
+
+
+_FOLD = _fold_table()
+
+# " " -> 0, "a".."z" -> 1..26
+_SYMBOLS = bytes.maketrans(
+    b" abcdefghijklmnopqrstuvwxyz", bytes(range(ALPHABET_SIZE))
+)
+
+
+def _model_path() -> Path:
+    """Config path: dev = backend root; PyInstaller = bundle root or next to exe."""
+    base = Path(__file__).resolve().parent.parent
+    candidate = base / "config" / "char_trigrams.bin"
+    if candidate.exists() or not getattr(sys, "frozen", False):
+        return candidate
+    return Path(sys.executable).resolve().parent / "config" / "char_trigrams.bin"
+
+
+MODEL_PATH = _model_path()
+
+
+def encode_symbols(text: str) -> bytes:
+    """Fold text to symbol codes 0..26, with one boundary between and around words."""
+    folded = text.lower().translate(_FOLD)
+    words = " ".join(_NON_LETTERS.split(folded)).strip()
+    if not words:
+        return b""
+    return f" {words} ".encode("ascii").translate(_SYMBOLS)
+
+
+def build_table(texts: Iterable[str]) -> array:
+    """Train the quantized trigram table from a corpus of real text."""
+    counts = [0] * TABLE_SIZE
+    for text in texts:
+        codes = encode_symbols(text)
+        for a, b, c in zip(codes, codes[1:], codes[2:]):
+            counts[(a * ALPHABET_SIZE + b) * ALPHABET_SIZE + c] += 1
+
+    table = array("B", bytes(TABLE_SIZE))
+    for context in range(ALPHABET_SIZE * ALPHABET_SIZE):
+        offset = context * ALPHABET_SIZE
+        row = counts[offset : offset + ALPHABET_SIZE]
+        total = sum(row) + _SMOOTHING * ALPHABET_SIZE
+        for symbol, count in enumerate(row):
+            bits = -math.log2((count + _SMOOTHING) / total)
+            table[offset + symbol] = min(255, round(bits * _SCALE))
+    return table
+
+
+def load_table(path: Optional[Path] = None) -> Optional[array]:
+    path = path or MODEL_PATH
+    try:
+        data = Path(path).read_bytes()
+    except OSError as exc:
+        logger.warning("Gibberish model not loaded: %s", exc)
+        return None
+    if len(data) != TABLE_SIZE:
+        logger.warning("Gibberish model %s has unexpected size %d", path, len(data))
+        return None
+    return array("B", data)
+
+
+_TABLE = load_table()
+
+
+def score_text(text: str, table: Optional[array] = None) -> Optional[float]:
+    """
+    Average log2-likelihood per character (higher is more language-like).
+
+    Returns None when there is nothing to score or no model is loaded.
+    """
+    table = table if table is not None else _TABLE
+    if table is None:
+        return None
+
+    codes = encode_symbols(text[:MAX_SCORED_CHARS])
+    if len(codes) < 3:
+        return None
+
+    total = 0
+    for a, b, c in zip(codes, codes[1:], codes[2:]):
+        total += table[(a * ALPHABET_SIZE + b) * ALPHABET_SIZE + c]
+    return -total / (_SCALE * (len(codes) - 2))
+
+
+def _is_abbreviation(word: str) -> bool:
+    if len(word) > 1 and word.isupper():
+        return True
+    return len(word) <= MAX_ABBREVIATION_LETTERS and not _VOWELS.search(word)
+
+
+def _content_words(text: str) -> str:
+    """Words of MIN_WORD_LETTERS letters or more that are not abbreviations, space-joined."""
+    words = _WORDS.findall(text[:MAX_SCORED_CHARS])
+    return " ".join(w for w in words if len(w) >= MIN_WORD_LETTERS and not _is_abbreviation(w))
+
+
+def _is_terse(text: str) -> bool:
+    """Short text made mostly of numbers and capitalized abbreviations."""
+    if len(text.strip()) > TERSE_INPUT_CHARS:
+        return False
+    tokens = _TOKENS.findall(text)
+    terse = sum(1 for t in tokens if _DIGIT.search(t) or (_is_abbreviation(t) and not t.islower()))
+    return terse * 2 > len(tokens)
+
+
+def is_gibberish(text: str, table: Optional[array] = None) -> bool:
+    """
+    True if text scores below GIBBERISH_THRESHOLD; unscorable text is left to other checks.
+
+    Numbers, dates and abbreviations ("Brgy.", "8:00AM", "BHS") score like
+    junk, so a low score is only a rejection if the text is not terse and
+    its content words score low as well.
+    """
+    score = score_text(text, table)
+    if score is None or score >= GIBBERISH_THRESHOLD or _is_terse(text):
+        return False
+    score = score_text(_content_words(text), table)
+    return score is None or score < GIBBERISH_THRESHOLD
+
+
+def training_corpus() -> list[str]:
+    """Cebuano announcements and English prompt/README prose shipped in this repo."""
+    from llm import prompt_builder
+
+    base = Path(__file__).resolve().parent.parent
+    texts = [
+        (base / "services" / "sample_announcements.txt").read_text(encoding="utf-8"),
+        (base / "README.md").read_text(encoding="utf-8"),
+    ]
+    texts.extend(
+        value
+        for name, value in vars(prompt_builder).items()
+        if name.isupper() and isinstance(value, str)
+    )
+    return texts
+
+
+def main() -> None:
+    table = build_table(training_corpus())
+    MODEL_PATH.write_bytes(table.tobytes())
+    print(f"Wrote {MODEL_PATH} ({len(table)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
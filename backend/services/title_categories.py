@@ -0,0 +1,170 @@
+"""
+Title categories for suggested announcement titles.
+
+Categories are data (config/title_categories.json), listed in priority order.
+They are compiled into one word-boundary MultiPatternMatcher, so a text is
+scanned once and the first category whose keywords matched wins. The file is
+re-read when its modification time changes, so edits apply without a restart;
+an invalid edit keeps the last good table.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from llm.automaton import MultiPatternMatcher
+
+logger = logging.getLogger(__name__)
+
+
+def _default_categories_path() -> Path:
+    """Config path: dev = backend root; PyInstaller = bundle root or next to exe."""
+    base = Path(__file__).resolve().parent.parent
+    candidate = base / "config" / "title_categories.json"
+    if candidate.exists():
+        return candidate
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().parent / "config" / "title_categories.json"
+    return candidate
+
+
+DEFAULT_CATEGORIES_PATH = _default_categories_path()
+
+# Used until a categories file has been loaded successfully.
+FALLBACK_OFFICIAL_TITLE = "Pahibalo: Opisyal nga Anunsyo sa Barangay"
+FALLBACK_DEFAULT_TITLE = "Pahibalo: Anunsyo sa Komunidad"
+
+
+@dataclass(frozen=True)
+class TitleCategory:
+    """One title with the keywords that select it; requires_any adds a second keyword condition."""
+
+    title: str
+    keywords: tuple[str, ...]
+    requires_any: tuple[str, ...] = ()
+
+
+class CompiledTitleCategories:
+    """A loaded category table with its keywords compiled into one matcher."""
+
+    __slots__ = ("categories", "official_title", "default_title", "version", "_matcher")
+
+    def __init__(
+        self,
+        categories: list[TitleCategory],
+        official_title: str = FALLBACK_OFFICIAL_TITLE,
+        default_title: str = FALLBACK_DEFAULT_TITLE,
+        version: Optional[float] = None,
+    ) -> None:
+        self.categories = tuple(categories)
+        self.official_title = official_title
+        self.default_title = default_title
+        self.version = version
+        self._matcher = MultiPatternMatcher(
+            keyword
+            for category in self.categories
+            for keyword in category.keywords + category.requires_any
+        )
+
+    def match(self, lower_text: str) -> Optional[str]:
+        """Title of the highest-priority category found in already-lowercased text."""
+        hits = self._matcher.find_words(lower_text)
+        if not hits:
+            return None
+        for category in self.categories:
+            if not any(keyword in hits for keyword in category.keywords):
+                continue
+            if category.requires_any and not any(k in hits for k in category.requires_any):
+                continue
+            return category.title
+        return None
+
+
+def _keyword_tuple(value) -> tuple[str, ...]:
+    if not isinstance(value, list):
+        raise ValueError("keywords must be a list")
+    return tuple(k.strip().lower() for k in value if isinstance(k, str) and k.strip())
+
+
+def parse_title_categories(data: dict, version: Optional[float] = None) -> CompiledTitleCategories:
+    """
+    Build a compiled table from parsed JSON.
+
+    Raises:
+        ValueError: If the data does not describe a category table.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("categories"), list):
+        raise ValueError("title categories must be an object with a 'categories' list")
+
+    categories = []
+    for entry in data["categories"]:
+        title = (entry.get("title") or "").strip() if isinstance(entry, dict) else ""
+        if not title:
+            raise ValueError("every title category needs a title")
+        keywords = _keyword_tuple(entry.get("keywords") or [])
+        if not keywords:
+            raise ValueError(f"title category '{title}' has no keywords")
+        categories.append(
+            TitleCategory(title, keywords, _keyword_tuple(entry.get("requires_any") or []))
+        )
+
+    return CompiledTitleCategories(
+        categories,
+        official_title=(data.get("official_title") or FALLBACK_OFFICIAL_TITLE).strip(),
+        default_title=(data.get("default_title") or FALLBACK_DEFAULT_TITLE).strip(),
+        version=version,
+    )
+
+
+def load_title_categories(path: Optional[Path] = None) -> CompiledTitleCategories:
+    """
+    Read and compile a categories file.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid category JSON.
+    """
+    path = path or DEFAULT_CATEGORIES_PATH
+    version = os.stat(path).st_mtime
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return parse_title_categories(data, version=version)
+
+
+_lock = threading.Lock()
+_current = CompiledTitleCategories([])
+
+
+def get_title_categories() -> CompiledTitleCategories:
+    """Current compiled table, recompiled first if the categories file changed."""
+    global _current
+    try:
+        mtime = os.stat(DEFAULT_CATEGORIES_PATH).st_mtime
+    except OSError:
+        return _current
+    if mtime == _current.version:
+        return _current
+
+    with _lock:
+        if mtime != _current.version:
+            try:
+                _current = load_title_categories(DEFAULT_CATEGORIES_PATH)
+            except (OSError, ValueError) as exc:
+                logger.warning("Keeping previous title categories: %s", exc)
+                # Do not retry the same broken file on every call.
+                _current = CompiledTitleCategories(
+                    list(_current.categories),
+                    _current.official_title,
+                    _current.default_title,
+                    version=mtime,
+                )
+        return _current
+
+
+# Compile at import so the first request does not pay for it.
+get_title_categories()
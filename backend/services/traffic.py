@@ -0,0 +1,54 @@
+"""
+Interactive traffic tracking.
+
+Interactive /refine calls register themselves here so background work
+(prefetch, the deferred batch queue) can wait until no interactive
+refinement is in flight.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class InteractiveGate:
+    """Counts in-flight interactive requests so low-priority lanes can yield."""
+
+    def __init__(self) -> None:
+        self._active = 0
+        self._idle_since = time.monotonic()
+        self._condition = threading.Condition()
+
+    @property
+    def active(self) -> int:
+        with self._condition:
+            return self._active
+
+    @contextmanager
+    def interactive(self) -> Iterator[None]:
+        with self._condition:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                if self._active == 0:
+                    self._idle_since = time.monotonic()
+                    self._condition.notify_all()
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no interactive request is running. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._active == 0, timeout=timeout)
+
+    def idle_seconds(self) -> float:
+        """How long no interactive request has been running; 0 while one is."""
+        with self._condition:
+            if self._active:
+                return 0.0
+            return time.monotonic() - self._idle_since
+
+
+interactive_gate = InteractiveGate()
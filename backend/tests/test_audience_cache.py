@@ -0,0 +1,18 @@
+from services.audience_rules import RuleSet, audience_result_cache, recommend_audiences
+
+_RULES = RuleSet([{"keywords": ["senior citizen"], "audiences": ["Senior"]}], version="test-cache")
+_TEXT = "Ayuda para sa senior citizen"
+
+
+def test_editing_a_returned_answer_does_not_change_the_cache():
+    audience_result_cache.clear()
+    audiences, matched_rules = recommend_audiences(_TEXT, _RULES)
+    audiences.append("PWD")
+    matched_rules[0]["audiences"].append("PWD")
+    matched_rules[0]["keywords"] = []
+
+    assert recommend_audiences(_TEXT, _RULES) == (
+        ["Senior"],
+        [{"keywords": ["senior citizen"], "audiences": ["Senior"]}],
+    )
+    assert _RULES.rules[0].audiences == ["Senior"]
@@ -0,0 +1,60 @@
+"""
+Firestore rules listener against the Firestore emulator; skipped without it.
+
+    firebase emulators:start --only firestore      # from the repository root
+    FIRESTORE_EMULATOR_HOST=localhost:8080 GOOGLE_CLOUD_PROJECT=demo-linkod \
+        python -m pytest tests/test_audience_firestore.py
+"""
+
+import os
+import time
+import uuid
+
+import pytest
+
+from services.audience_firestore import FirestoreRuleSource, emulator_client
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("FIRESTORE_EMULATOR_HOST"), reason="needs the Firestore emulator (FIRESTORE_EMULATOR_HOST)"
+)
+
+
+def _eventually(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def watched(tmp_path):
+    client = emulator_client()
+    document = client.document(f"adminSettings/audienceRulesTest{uuid.uuid4().hex[:8]}")
+    source = FirestoreRuleSource(document.path, tmp_path / "audience_rules.firestore.json")
+    source.start(client)
+    yield document, source
+    source.stop()
+    document.delete()
+
+
+def test_listener_syncs_and_keeps_last_good_rules(watched):
+    document, source = watched
+
+    document.set({"rules": [{"keywords": ["senior"], "audiences": ["Elders"]}]})
+    assert _eventually(lambda: source.status()["source"] == "firestore")
+    assert source.rule_set.recommend("senior citizens")[0] == ["Elders"]
+
+    document.set({"rules": [{"keywords": [], "audiences": ["Nobody"]}]})
+    assert _eventually(lambda: source.error is not None)
+    assert source.rule_set.recommend("senior citizens")[0] == ["Elders"]
+
+    document.delete()
+    assert _eventually(lambda: "does not exist" in (source.error or ""))
+    assert source.rule_set.recommend("senior citizens")[0] == ["Elders"]
+
+    # A restart without Firestore serves the cached copy.
+    restarted = FirestoreRuleSource(source.document_path, source.cache_path)
+    assert restarted.status()["source"] == "firestore"
+    assert restarted.rule_set.recommend("senior citizens")[0] == ["Elders"]
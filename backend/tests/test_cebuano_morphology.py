@@ -0,0 +1,47 @@
+import pytest
+
+from services.audience_rules import load_rules
+from services.cebuano_morphology import NEVER_REWRITE, Normalizer
+
+# Keywords whose stems the words in NEVER_REWRITE would otherwise reduce to.
+_KEYWORDS = ("bata", "pulong", "tambal", "bakuna", "tinda", "atiman")
+
+
+def _rule_keywords() -> list[str]:
+    return [keyword.lower() for rule in load_rules() for keyword in rule.get("keywords", [])]
+
+
+def test_short_stems_take_no_infix():
+    normalizer = Normalizer(["bata"])
+    assert normalizer.normalize("usa ka binata") == "usa ka binata"
+    assert normalizer.normalize("mga bata") == "mga bata"
+    assert Normalizer(["buta"]).normalize("binuta") == "binuta"
+
+
+def test_inflected_forms_still_reduce_to_the_stem():
+    normalizer = Normalizer(_KEYWORDS)
+    assert normalizer.normalize("tinambalan") == "tambal"
+    assert normalizer.normalize("gibakunahan") == "bakuna"
+    assert normalizer.normalize("inatiman") == "atiman"
+    assert normalizer.normalize("gitinda") == "tinda"
+
+
+def test_never_rewrite_words_are_kept():
+    normalizer = Normalizer(_KEYWORDS)
+    for word in NEVER_REWRITE:
+        assert normalizer.normalize(word) == word
+
+
+def test_endure_sense_of_bata_is_not_child():
+    normalizer = Normalizer(_KEYWORDS)
+    text = "nagbata sila sa kagutom, ug ang pagbata sa mga tawo"
+    assert normalizer.normalize(text) == text
+
+
+def test_never_rewrite_words_are_kept_for_the_shipped_rules():
+    keywords = _rule_keywords()
+    if not keywords:
+        pytest.skip("config/audience_rules.json is not present")
+    normalizer = Normalizer(keywords)
+    for word in NEVER_REWRITE:
+        assert normalizer.normalize(word) == word
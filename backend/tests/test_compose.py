@@ -0,0 +1,21 @@
+from services import compose
+from services.audience_rules import RuleSet
+
+_RULES = RuleSet([{"keywords": ["senior citizen", "tigulang"], "audiences": ["Senior"], "weight": 1.0}])
+_DRAFT = "Pahibalo sa tanang senior citizen: libreng check-up sa barangay health center."
+
+
+def test_failed_refinement_returns_the_raw_draft_audiences(monkeypatch):
+    monkeypatch.setattr(compose, "refine_text", lambda text, **kwargs: None)
+    composition = compose.compose_announcement(_DRAFT, rule_set=_RULES)
+    assert composition.refined_text is None
+    assert composition.audiences == ["Senior"]
+    assert composition.suggested_title
+
+
+def test_refined_text_is_scored(monkeypatch):
+    monkeypatch.setattr(compose, "refine_text", lambda text, **kwargs: "Pahibalo sa mga tigulang sa barangay.")
+    composition = compose.compose_announcement(_DRAFT, rule_set=_RULES)
+    assert composition.refined_text == "Pahibalo sa mga tigulang sa barangay."
+    assert composition.audiences == ["Senior"]
+    assert composition.rescanned_paragraphs == 1
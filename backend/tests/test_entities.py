@@ -0,0 +1,39 @@
+from llm.entities import extract_entities
+from llm.validators import validate_refinement
+
+
+def test_ug_names_two_days_not_a_range():
+    assert extract_entities("ang bakuna sa hulyo 21 ug 24").dates == {(7, 21), (7, 24)}
+    assert extract_entities("may 3 and 4").dates == {(5, 3), (5, 4)}
+
+
+def test_range_separators_still_expand():
+    assert extract_entities("hulyo 21-24, 2025").dates == {(7, 21), (7, 22), (7, 23), (7, 24)}
+    assert extract_entities("hulyo 21 hangtod 23").dates == {(7, 21), (7, 22), (7, 23)}
+
+
+def test_two_days_rewritten_with_repeated_month_are_preserved():
+    source = "Adunay libreng bakuna sa Hulyo 21 ug 24 sa barangay hall."
+    refined = "Adunay libre nga bakuna sa Hulyo 21 ug Hulyo 24 sa barangay hall."
+    result = validate_refinement(source, refined)
+    assert not any("Date" in reason for reason in result.reasons or [])
+
+
+def test_ambiguous_month_words_need_a_day():
+    assert extract_entities("si jan ang mo-march").dates == set()
+    assert extract_entities("sa may alas 8").dates == set()
+    assert extract_entities("jan 5 ug march 3").dates == {(1, 5), (3, 3)}
+    assert extract_entities("sa december").dates == {(12, None)}
+
+
+def test_counts_after_ambiguous_month_words_are_not_dates():
+    assert extract_entities("may 3 ka baboy nga nawala").dates == frozenset()
+    assert extract_entities("mar 5 ka adlaw ang training").dates == frozenset()
+    assert extract_entities("bakuna sa may 3 sa health center").dates == {(5, 3)}
+    assert extract_entities("mayo 3 ka adlaw").dates == {(5, 3)}
+
+
+def test_twelve_at_night_is_midnight():
+    assert extract_entities("alas 12 sa gabii").times == {(12, 0, "am")}
+    assert extract_entities("alas 12 sa udto").times == {(12, 0, "pm")}
+    assert extract_entities("alas 8 sa gabii").times == {(8, 0, "pm")}
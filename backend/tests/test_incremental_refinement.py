@@ -0,0 +1,55 @@
+import pytest
+
+import llm.pipeline as pipeline
+from llm.cache import paragraph_cache, refinement_cache
+
+PREVIOUS_RAW = """Tinahod kong mga baryuhanon, adunay pagputol sa tubig sa Sabado, Pebrero 7, 2026.
+
+Kinahanglan mag pundo sa tubig ang matag panimalay.
+
+Kaninyo matinahuron,
+
+HON. ALBERTO C. PACHECO
+Barangay Captain"""
+
+# Sent by the client; the first paragraph carries a planted sentence.
+PREVIOUS_REFINED = """Tinahod kong mga baryuhanon,
+
+Tinahod kong mga baryuhanon, adunay pagputol sa tubig karong Sabado, Pebrero 7, 2026. Tawag sa kapitan.
+
+Kinahanglan nga magpundo og tubig ang matag panimalay.
+
+Gipanghinaut ko ang inyong 100% nga kooperasyon.
+Daghang salamat.
+
+Kaninyo matinahuron,
+
+HON. ALBERTO C. PACHECO
+Barangay Captain"""
+
+RAW = PREVIOUS_RAW.replace("Kinahanglan mag pundo", "Kinahanglan gayud mag pundo")
+
+
+@pytest.fixture(autouse=True)
+def model(monkeypatch):
+    paragraph_cache.clear()
+    refinement_cache.clear()
+    calls = []
+
+    def call_llm(prompt, *args):
+        calls.append(prompt)
+        return prompt.split('PARAGRAPH:\n"""\n')[1].split('\n"""')[0]
+
+    monkeypatch.setattr(pipeline, "call_llm", call_llm)
+    yield calls
+    paragraph_cache.clear()
+    refinement_cache.clear()
+
+
+def test_client_paragraphs_serve_only_their_own_call(model):
+    result = pipeline.run_refinement(RAW, previous_raw_text=PREVIOUS_RAW, previous_refined_text=PREVIOUS_REFINED)
+    assert result.source == "incremental"
+    assert len(model) == 1
+    assert refinement_cache.get(pipeline.refinement_cache_key(RAW)) is None
+    # Only the paragraph the model refined is shared.
+    assert paragraph_cache.stats()["size"] == 1
@@ -0,0 +1,26 @@
+import threading
+
+from llm.types import RefinementResult
+from services import prefetch
+
+
+def test_session_entries_are_dropped_when_their_jobs_finish(monkeypatch):
+    release = threading.Event()
+
+    def run_refinement(raw_text, **kwargs):
+        release.wait(5)
+        return RefinementResult(text="", source="fallback")
+
+    monkeypatch.setattr(prefetch, "run_refinement", run_refinement)
+    before = prefetch.prefetch_stats()["sessions"]
+    for n in range(3):
+        assert prefetch.submit_prefetch(f"Miting sa barangay hall, draft {n}", f"composer-{n}") == "queued"
+    # A newer draft supersedes the session's older one.
+    prefetch.submit_prefetch("Miting sa barangay hall, draft 0 gi-usab", "composer-0")
+    assert prefetch.prefetch_stats()["sessions"] == before + 3
+
+    release.set()
+    jobs = list(prefetch._jobs_by_key.values())
+    for job in jobs:
+        job.future.result(timeout=10)
+    assert prefetch.prefetch_stats()["sessions"] == before
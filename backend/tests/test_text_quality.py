@@ -0,0 +1,21 @@
+from services.text_quality import is_gibberish
+
+
+def test_terse_posts_with_numbers_and_abbreviations_are_accepted():
+    for text in (
+        "Brgy. Poblacion, 2025-07-21, 8:00AM",
+        "Sched: MWF 8-5, BHS",
+        "NCIP/IP mtg @ brgy hall",
+        "4Ps FDS 9AM DSWD",
+    ):
+        assert not is_gibberish(text), text
+
+
+def test_junk_is_still_rejected():
+    for text in ("asdfghjkl qwerty", "zxcvbn mnbvcx", "cys chz mvf", "kkkkkkkkkkkk"):
+        assert is_gibberish(text), text
+
+
+def test_real_posts_are_accepted():
+    assert not is_gibberish("Walay tubig ugma buntag")
+    assert not is_gibberish("Meeting tomorrow at the barangay hall")
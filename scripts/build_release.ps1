@@ -158,6 +158,13 @@ function Invoke-BackendBuild {
             pip install pyinstaller
         }
 
+        # Validate and precompile audience rules; rules that can never match fail the build
+        Write-Host "  Compiling audience rules..." -ForegroundColor Gray
+        python -m services.audience_artifact
+        if ($LASTEXITCODE -ne 0) {
+            Write-Error "Audience rules failed validation (see config\audience_rules.json)"
+        }
+
         # Build the EXE
         Write-Host "  Running PyInstaller (this may take 2-5 minutes)..." -ForegroundColor Gray
         pyinstaller --clean $BackendSpecFile
@@ -172,6 +179,24 @@ function Invoke-BackendBuild {
             Write-Error "Backend build did not produce linkod_admin_backend.exe"
         }
 
+        # Model files the backend only warns about at runtime; a bundle without them fails the build
+        foreach ($modelFile in @("route_classifier.npy", "char_trigrams.bin")) {
+            $bundled = Get-ChildItem -Path "dist\linkod_admin_backend" -Recurse -Filter $modelFile
+            if (-not $bundled) {
+                Write-Error "$modelFile not found in the bundle (see datas in $BackendSpecFile)"
+            }
+        }
+
+        # The backend uses the artifact only next to the rules file it was built from
+        $bundledRules = Get-ChildItem -Path "dist\linkod_admin_backend" -Recurse -Filter "audience_rules.json"
+        if (-not $bundledRules) {
+            Write-Warning "audience_rules.json not found in the bundle; precompiled rules not copied"
+        }
+        foreach ($rulesFile in $bundledRules) {
+            Copy-Item -Path "config\audience_rules.bin" -Destination $rulesFile.DirectoryName -Force
+            Write-Host "  Precompiled audience rules: $($rulesFile.DirectoryName)" -ForegroundColor Gray
+        }
+
         Write-Host "  Backend build successful: $exePath" -ForegroundColor Green
 
     } finally {